@@ -1,5 +1,7 @@
 import numpy as np
 
+from ..recorders import SessionLog
+
 
 def aggregate_current(sim):
     """ Calculate the time series of aggregate current of all EVSEs within a simulation.
@@ -10,7 +12,7 @@ def aggregate_current(sim):
     Returns:
         np.Array: A numpy ndarray of the aggregate current at each time. [A]
     """
-    return sim.charging_rates.sum(axis=0)
+    return _map_charging_rates(sim, lambda rates: rates.sum(axis=0))
 
 
 def aggregate_power(sim):
@@ -22,7 +24,12 @@ def aggregate_power(sim):
     Returns:
         np.Array: A numpy ndarray of the aggregate power at each time. [kW]
     """
-    return sim.network._voltages.T.dot(sim.charging_rates) / 1000
+    def power(rates):
+        # Compute in the dtype of the charging rates, see the dtype argument of Simulator.
+        voltages = sim.network._voltages.astype(rates.dtype, copy=False)
+        return voltages.T.dot(rates) / 1000
+
+    return _map_charging_rates(sim, power)
 
 
 def constraint_currents(sim, return_magnitudes=False, constraint_ids=None):
@@ -41,7 +48,8 @@ def constraint_currents(sim, return_magnitudes=False, constraint_ids=None):
     if constraint_ids is None:
         constraint_ids = sim.network.constraint_index
 
-    currents_list = sim.network.constraint_current(sim.charging_rates, constraints=constraint_ids)
+    currents_list = _map_charging_rates(sim, lambda rates: sim.network.constraint_current(rates,
+                                                                                          constraints=constraint_ids))
 
     if not return_magnitudes:
         currents_list = np.abs(currents_list)
@@ -51,6 +59,26 @@ def constraint_currents(sim, return_magnitudes=False, constraint_ids=None):
     return {constraint_ids[i] : currents_list[i] for i in range(len(constraint_ids))}
 
 
+def _map_charging_rates(sim, fn):
+    """ Apply fn to the charging rates of a simulation one block of periods at a time and join the results.
+
+    Charging rates stored on disk (see the results_dir argument of Simulator) are processed in blocks so that they are
+    never loaded into memory all at once. Charging rates stored in memory are processed as a single block.
+
+    Args:
+        sim (Simulator): A Simulator object which has been run.
+        fn (Callable[np.Array, np.Array]): Function mapping a block of charging rates, with a row per EVSE and a column
+            per period, to an array with a column per period.
+
+    Returns:
+        np.Array: The results of fn for all blocks, joined along their last axis.
+    """
+    results = [fn(rates) for _, rates in sim.iter_charging_rates()]
+    if len(results) == 1:
+        return results[0]
+    return np.concatenate(results, axis=-1)
+
+
 def proportion_of_energy_delivered(sim):
     """ Calculate the percentage of total energy delivered over total energy requested.
 
@@ -60,8 +88,9 @@ def proportion_of_energy_delivered(sim):
     Returns:
         float: Proportion of total energy requested which was delivered during the simulation.
     """
-    total_requested = sum(ev.requested_energy for ev in sim.ev_history.values())
-    total_delivered = sum(ev.energy_delivered for ev in sim.ev_history.values())
+    requested, delivered = _session_energy(sim)
+    total_requested = sum(requested)
+    total_delivered = sum(delivered)
     return total_delivered / total_requested
 
 
@@ -75,8 +104,26 @@ def proportion_of_demands_met(sim, threshold=0.1):
     Returns:
         float: Proportion of sessions where the energy demand was fully met.
     """
-    finished = sum(1 for ev in sim.ev_history.values() if ev.remaining_demand < threshold)
-    return finished / len(sim.ev_history)
+    requested, delivered = _session_energy(sim)
+    finished = sum(1 for r, d in zip(requested, delivered) if r - d < threshold)
+    return finished / len(requested)
+
+
+def _session_energy(sim):
+    """ Return the requested energy and the energy delivered of each session recorded in sim.ev_history.
+
+    Reads from the EVs if ev_history is a dictionary, or from the recorded sessions if it is a SessionLog.
+
+    Args:
+        sim (Simulator): A Simulator object which has been run.
+
+    Returns:
+        Tuple[List[float], List[float]]: Requested energy and energy delivered of each session. [acnsim units]
+    """
+    if isinstance(sim.ev_history, SessionLog):
+        return list(sim.ev_history.column('requested_energy')), list(sim.ev_history.column('energy_delivered'))
+    evs = sim.ev_history.values()
+    return [ev.requested_energy for ev in evs], [ev.energy_delivered for ev in evs]
 
 
 def current_unbalance(sim, phase_ids, type='NEMA'):
@@ -3,8 +3,10 @@ from .event import PluginEvent
 from .event import UnplugEvent
 from .event import RecomputeEvent
 from .event_queue import EventQueue
+from .calendar_event_queue import CalendarEventQueue
 from .acndata_events import *
 
 del event
 del event_queue
+del calendar_event_queue
 
@@ -0,0 +1,131 @@
+import heapq
+
+
+class CalendarEventQueue:
+    """ Queue which stores simulation events in buckets keyed by their integer timestamp.
+
+    Drop-in replacement for EventQueue. Events which occur in the same timestep share a bucket, which is kept sorted by
+    precedence (lowest first, the same order in which EventQueue returns them). Only the distinct timestamps are kept
+    in a heap, so all events for a step are extracted as one slice, and the timestamp of the last event is tracked
+    incrementally rather than by scanning the whole queue.
+
+    Args:
+        events (List[Event]): A list of Event-like objects.
+    """
+
+    def __init__(self, events=None):
+        self._buckets = {}
+        self._timestamps = []
+        self._len = 0
+        self._last_timestamp = None
+        if events is not None:
+            self.add_events(events)
+        self._timestep = 0
+
+    def __len__(self):
+        """ Return the length of this queue.
+
+        Returns:
+            int: Length of the queue.
+        """
+        return self._len
+
+    def empty(self):
+        """ Return if the queue is empty.
+
+        Returns:
+            bool: True if the queue is empty.
+        """
+        return self._len == 0
+
+    def add_event(self, event):
+        """ Add an event to the queue.
+
+        Args:
+            event (Event like): An Event-like object.
+
+        Returns:
+            None
+        """
+        timestamp = event.timestamp
+        bucket = self._buckets.get(timestamp)
+        if bucket is None:
+            self._buckets[timestamp] = [event]
+            heapq.heappush(self._timestamps, timestamp)
+        else:
+            # Insert after all events with equal or lower precedence. Buckets are short, so scan from the end.
+            i = len(bucket)
+            while i > 0 and event < bucket[i - 1]:
+                i -= 1
+            bucket.insert(i, event)
+        self._len += 1
+        if self._last_timestamp is None or timestamp > self._last_timestamp:
+            self._last_timestamp = timestamp
+
+    def add_events(self, events):
+        """ Add multiple events at a time to the queue.
+
+        Args:
+            events (List[Event like]): A list of Event-like objects.
+
+        Returns:
+            None
+        """
+        for e in events:
+            self.add_event(e)
+
+    def get_event(self):
+        """ Return the next event in the queue.
+
+        Returns:
+            Event like: The next event in the queue.
+        """
+        timestamp = self._timestamps[0]
+        bucket = self._buckets[timestamp]
+        event = bucket.pop(0)
+        if not bucket:
+            heapq.heappop(self._timestamps)
+            del self._buckets[timestamp]
+        self._removed(1)
+        return event
+
+    def get_current_events(self, timestep):
+        """ Return all events occurring before or during timestep.
+
+        Args:
+            timestep (int): Time index in periods.
+
+        Returns:
+            List[Event like]: List of all events occurring before or during timestep.
+        """
+        self._timestep = timestep
+        current_events = []
+        while self._timestamps and self._timestamps[0] <= timestep:
+            current_events.extend(self._buckets.pop(heapq.heappop(self._timestamps)))
+        self._removed(len(current_events))
+        return current_events
+
+    def get_next_timestamp(self):
+        """ Return the timestamp of the next event (chronologically) in the event queue
+
+        Returns:
+            int: Timestamp of the next event in the event queue, or None if the
+                event queue is empty.
+        """
+        return self._timestamps[0] if self._timestamps else None
+
+    def get_last_timestamp(self):
+        """ Return the timestamp of the last event (chronologically) in the event queue
+
+        Returns:
+            int: Last timestamp in the event queue, or None if the
+                event queue is empty.
+        """
+        return self._last_timestamp
+
+    def _removed(self, n):
+        """ Update the length of the queue after n events were removed. """
+        self._len -= n
+        # Events are only removed from the front of the queue, so the last timestamp only changes once it is empty.
+        if self._len == 0:
+            self._last_timestamp = None
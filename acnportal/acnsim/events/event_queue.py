@@ -77,6 +77,18 @@ class EventQueue:
             current_events.append(self.get_event())
         return current_events
 
+    def get_next_timestamp(self):
+        """ Return the timestamp of the next event (chronologically) in the event queue
+
+        Returns:
+            int: Timestamp of the next event in the event queue, or None if the
+                event queue is empty.
+        """
+        if not self.empty():
+            return self._queue[0][0]
+        else:
+            return None
+
     def get_last_timestamp(self):
         """ Return the timestamp of the last event (chronologically) in the event queue
 
@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+from acnportal.acnsim.events import CalendarEventQueue, Event, PluginEvent, UnplugEvent, RecomputeEvent
+
+
+class TestCalendarEventQueue(TestCase):
+    def setUp(self):
+        self.events = CalendarEventQueue()
+
+    def test_empty_on_init(self):
+        self.assertTrue(self.events.empty())
+
+    def test_add_event(self):
+        self.events.add_event(Event(5))
+        self.assertFalse(self.events.empty())
+        self.assertEqual(len(self.events), 1)
+
+    def test_add_events(self):
+        events = [Event(i) for i in range(1, 6)]
+        self.events.add_events(events)
+        self.assertFalse(self.events.empty())
+        self.assertEqual(5, len(self.events))
+
+    def test_get_event(self):
+        self.events.add_event(Event(5))
+        e = self.events.get_event()
+        self.assertTrue(self.events.empty())
+        self.assertEqual(5, e.timestamp)
+
+    def test_get_event_in_timestamp_order(self):
+        self.events.add_events([Event(4), Event(2), Event(3)])
+        self.assertEqual([self.events.get_event().timestamp for _ in range(3)], [2, 3, 4])
+
+    def test_get_current_events(self):
+        events = [Event(i) for i in range(1, 6)]
+        self.events.add_events(events)
+        curr_events = self.events.get_current_events(3)
+        self.assertEqual(len(curr_events), 3)
+        self.assertEqual(len(self.events), 2)
+
+    def test_get_current_events_precedence(self):
+        recompute = RecomputeEvent(2)
+        plugin = PluginEvent(2, None)
+        unplug = UnplugEvent(2, 'PS-001', 'A')
+        earlier = RecomputeEvent(1)
+        self.events.add_events([recompute, plugin, unplug, earlier])
+        self.assertEqual(self.events.get_current_events(2), [earlier, unplug, plugin, recompute])
+
+    def test_get_current_events_same_precedence_keeps_insertion_order(self):
+        first = PluginEvent(2, None)
+        second = PluginEvent(2, None)
+        self.events.add_events([first, second])
+        self.assertEqual(self.events.get_current_events(2), [first, second])
+
+    def test_get_last_timestamp(self):
+        events = [Event(i) for i in range(1, 6)]
+        self.events.add_events(events)
+        self.assertEqual(5, self.events.get_last_timestamp())
+        self.events.add_event(Event(8))
+        self.assertEqual(8, self.events.get_last_timestamp())
+        _ = self.events.get_current_events(3)
+        self.assertEqual(8, self.events.get_last_timestamp())
+        _ = self.events.get_current_events(8)
+        self.assertIsNone(self.events.get_last_timestamp())
+
+    def test_get_next_timestamp(self):
+        self.assertIsNone(self.events.get_next_timestamp())
+        self.events.add_events([Event(4), Event(2), Event(3)])
+        self.assertEqual(2, self.events.get_next_timestamp())
+        _ = self.events.get_current_events(2)
+        self.assertEqual(3, self.events.get_next_timestamp())
+
+    def test_get_last_timestamp_no_events(self):
+        self.events.add_events([])
+        self.assertIsNone(self.events.get_last_timestamp())
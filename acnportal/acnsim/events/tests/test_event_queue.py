@@ -48,6 +48,13 @@ class TestEventQueue(TestCase):
         curr_events = self.events.get_current_events(3)
         self.assertEqual(8, self.events.get_last_timestamp())
 
+    def test_get_next_timestamp(self):
+        self.assertIsNone(self.events.get_next_timestamp())
+        self.events.add_events([Event(4), Event(2), Event(3)])
+        self.assertEqual(2, self.events.get_next_timestamp())
+        _ = self.events.get_current_events(2)
+        self.assertEqual(3, self.events.get_next_timestamp())
+
     def test_get_last_timestamp_no_events(self):
         events = []
         self.events.add_events(events)
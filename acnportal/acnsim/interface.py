@@ -5,6 +5,8 @@ import numpy as np
 from datetime import timedelta
 from collections import namedtuple
 
+from .network import FeasibilityOracle
+
 
 class Interface:
     """ Interface between algorithms and the ACN Simulation Environment."""
@@ -18,10 +20,39 @@ class Interface:
         """ Returns a list of active EVs for use by the algorithm.
 
         Returns:
-            List[EV]: List of EVs currently plugged in and not finished charging
+            List[EVView]: List of EVs currently plugged in and not finished charging. These are read-only views
+                unless the algorithm sets deepcopy_evs, in which case they are deep copies of the EVs.
         """
         return self._simulator.get_active_evs()
 
+    @property
+    def active_ev_array(self):
+        """ Returns the state of all active EVs as a structured array, with one record per EV in active_evs.
+
+        The array has fields station_id, session_id, station_index, arrival, departure, estimated_departure,
+        remaining_demand [A*periods], max_pilot [A], min_pilot [A] and voltage [V], so algorithms can work on aligned
+        arrays instead of querying each EV. It is built once per iteration, shared by all callers and read-only. See
+        Simulator.get_active_ev_array.
+
+        Returns:
+            np.ndarray: Structured array with one record per active EV.
+        """
+        return self._simulator.get_active_ev_array()
+
+    def active_ev_positions(self, evs):
+        """ Returns the record in active_ev_array of each of the given EVs, or None if it does not describe them all.
+
+        Only the EVs returned by active_evs during the current period are described by active_ev_array. Copies of
+        them, e.g. when the algorithm sets deepcopy_evs, are not, since their state may have been changed.
+
+        Args:
+            evs (List[EV]): EVs to look up.
+
+        Returns:
+            np.Array: Index of the record of each EV in active_ev_array, or None.
+        """
+        return self._simulator.get_active_ev_positions(evs)
+
     @property
     def last_applied_pilot_signals(self):
         """ Return the pilot signals that were applied in the last _iteration of the simulation for all active EVs.
@@ -33,8 +64,9 @@ class Interface:
         """
         i = self._simulator.iteration - 1
         if i > 0:
-            return {ev.session_id: self._simulator.pilot_signals[self._simulator.index_of_evse(ev.station_id), i] for ev in self.active_evs if
-                ev.arrival <= i}
+            pilot_signals = self._simulator.pilot_signals_at(i)
+            return {ev.session_id: pilot_signals[self._simulator.index_of_evse(ev.station_id)]
+                    for ev in self._simulator.get_active_evs(deepcopy=False) if ev.arrival <= i}
         else:
             return {}
 
@@ -45,7 +77,7 @@ class Interface:
         Returns:
             Dict[str, number]:  A dictionary with the session ID as key and actual charging rate as value.
         """
-        return {ev.session_id: ev.current_charging_rate for ev in self.active_evs}
+        return {ev.session_id: ev.current_charging_rate for ev in self._simulator.get_active_evs(deepcopy=False)}
 
     @property
     def current_time(self):
@@ -99,7 +131,7 @@ class Interface:
         Returns:
             float: the maximum pilot signal supported by this EVSE. [A]
         """
-        return self._simulator.network._EVSEs[station_id].max_rate
+        return self._simulator.network.station_max_pilot_signal(station_id)
 
     def min_pilot_signal(self, station_id):
         """ Returns the minimum allowable pilot signal level for the specified EVSE.
@@ -110,7 +142,7 @@ class Interface:
         Returns:
             float: the minimum pilot signal supported by this EVSE. [A]
         """
-        return self._simulator.network._EVSEs[station_id].min_rate
+        return self._simulator.network.station_min_pilot_signal(station_id)
 
     def evse_voltage(self, station_id):
         """ Returns the voltage of the EVSE.
@@ -121,7 +153,7 @@ class Interface:
         Returns:
             float: voltage of the EVSE. [V]
         """
-        return self._simulator.network.voltages[station_id]
+        return self._simulator.network.station_voltage(station_id)
 
     def evse_phase(self, station_id):
         """ Returns the phase angle of the EVSE.
@@ -132,7 +164,7 @@ class Interface:
         Returns:
             float: phase angle of the EVSE. [degrees]
         """
-        return self._simulator.network.phase_angles[station_id]
+        return self._simulator.network.station_phase_angle(station_id)
 
     def remaining_amp_periods(self, ev):
         """ Return the EV's remaining demand in A*periods.
@@ -151,6 +183,20 @@ class Interface:
         """
         return kwh * 1000 / self.evse_voltage(station_id) * 60 / self.period
 
+    def station_index(self, station_id):
+        """ Return the index of an EVSE, which is its row in schedule matrices returned by BaseAlgorithm.schedule.
+
+        Args:
+            station_id (str): The ID of the station for which the index should be returned.
+
+        Returns:
+            int: Index of the station in get_constraints().evse_index.
+
+        Raises:
+            KeyError: Raised when the station id has not been registered.
+        """
+        return self._simulator.network.station_index(station_id)
+
     def get_constraints(self):
         """ Get the constraint matrix and corresponding EVSE ids for the network.
 
@@ -159,7 +205,8 @@ class Interface:
         """
         Constraint = namedtuple('Constraint', ['constraint_matrix', 'magnitudes', 'constraint_index', 'evse_index'])
         network = self._simulator.network
-        return Constraint(network.constraint_matrix, network.magnitudes, network.constraint_index, network.station_ids)
+        return Constraint(network.constraint_matrix, network.magnitudes, network.constraint_index,
+                          list(network.station_ids))
 
     def is_feasible(self, load_currents, linear=False, violation_tolerance=None, relative_tolerance=None):
         """ Return if a set of current magnitudes for each load are feasible.
@@ -188,16 +235,91 @@ class Interface:
         if len(load_currents) == 0:
             return True
 
+        schedule_matrix, station_ids = self._schedule_matrix(load_currents)
+        return self._simulator.network.is_feasible(schedule_matrix, linear, violation_tolerance, relative_tolerance,
+                                                   station_ids=station_ids)
+
+    def feasibility_report(self, load_currents, linear=False, violation_tolerance=None, relative_tolerance=None):
+        """ Return whether a schedule is feasible along with the slack of every constraint and the largest violation.
+
+        Wraps Network's feasibility_report method.
+
+        Args:
+            load_currents (Dict[str, List[number]]): Dictionary mapping load_ids to schedules of charging rates.
+            linear (bool): See is_feasible.
+            violation_tolerance (float): See is_feasible.
+            relative_tolerance (float): See is_feasible.
+
+        Returns:
+            FeasibilityReport: Named tuple with fields feasible, slack, max_violation, max_violation_constraint and
+                max_violation_time. slack has a row per constraint in get_constraints().constraint_index and a column
+                per time index. See FeasibilityReport.
+        """
+        schedule_matrix, station_ids = self._schedule_matrix(load_currents)
+        return self._simulator.network.feasibility_report(schedule_matrix, linear, violation_tolerance,
+                                                          relative_tolerance, station_ids=station_ids)
+
+    def _schedule_matrix(self, load_currents):
+        """ Convert a schedule into its matrix representation.
+
+        Schedules usually only include stations with an EV plugged in, in which case only those stations are included,
+        so the cost scales with the number of EVs rather than the number of EVSEs.
+
+        Args:
+            load_currents (Dict[str, List[number]]): Dictionary mapping load_ids to schedules of charging rates.
+
+        Returns:
+            Tuple[np.Array, List[str]]: Matrix with a row per station and a column per time index, and the ID of the
+                station of each row.
+
+        Raises:
+            InvalidScheduleError: Raised if the schedules are not all the same length.
+        """
         # Check that all schedules are the same length
         schedule_lengths = set(len(x) for x in load_currents.values())
         if len(schedule_lengths) > 1:
             raise InvalidScheduleError('All schedules should have the same length.')
-        schedule_length = schedule_lengths.pop()
+        schedule_length = schedule_lengths.pop() if schedule_lengths else 1
 
-        # Convert input schedule into its matrix representation
+        network = self._simulator.network
+        station_ids = network.plugged_in_station_ids
+        if not load_currents.keys() <= set(station_ids):
+            station_ids = network.station_ids
+        schedule_matrix = np.array(
+            [load_currents[evse_id] if evse_id in load_currents else [0] * schedule_length for evse_id in station_ids])
+        return schedule_matrix.reshape(len(station_ids), schedule_length), station_ids
+
+    def feasibility_oracle(self, load_currents=None, linear=False, violation_tolerance=None, relative_tolerance=None):
+        """ Return a FeasibilityOracle for incrementally checking the feasibility of a schedule.
+
+        The oracle starts from the given schedule and allows single-station rate changes to be checked and applied
+        at a cost proportional to the number of constraints. See FeasibilityOracle for more details.
+
+        Args:
+            load_currents (Dict[str, List[number]]): Dictionary mapping load_ids to schedules of charging rates. Loads
+                not included are assumed to have a rate of 0. If None or empty, the oracle starts from a schedule of
+                length 1 with all rates equal to 0. Default None.
+            linear (bool): See is_feasible.
+            violation_tolerance (float): See is_feasible.
+            relative_tolerance (float): See is_feasible.
+
+        Returns:
+            FeasibilityOracle: Oracle for the network's constraints initialized with load_currents.
+        """
+        network = self._simulator.network
+        if not load_currents:
+            return FeasibilityOracle(network, linear=linear, violation_tolerance=violation_tolerance,
+                                     relative_tolerance=relative_tolerance)
+
+        schedule_lengths = set(len(x) for x in load_currents.values())
+        if len(schedule_lengths) > 1:
+            raise InvalidScheduleError('All schedules should have the same length.')
+        schedule_length = schedule_lengths.pop()
         schedule_matrix = np.array(
-            [load_currents[evse_id] if evse_id in load_currents else [0] * schedule_length for evse_id in self._simulator.network.station_ids])
-        return self._simulator.network.is_feasible(schedule_matrix, linear, violation_tolerance, relative_tolerance)
+            [load_currents[evse_id] if evse_id in load_currents else [0] * schedule_length
+             for evse_id in network.station_ids])
+        return FeasibilityOracle(network, schedule_matrix, linear=linear, violation_tolerance=violation_tolerance,
+                                 relative_tolerance=relative_tolerance)
 
     def get_prices(self, length, start=None):
         """ Get a vector of prices beginning at time start and continuing for length periods. ($/kWh)
@@ -1,9 +1,12 @@
+from abc import ABCMeta
 from builtins import property
 
 
-class EV:
+class EV(metaclass=ABCMeta):
     """Class to model the behavior of an Electrical Vehicle (ev).
 
+    EVView is registered as a virtual subclass of EV, so isinstance(view, EV) is True for read-only views as well.
+
     Args:
         arrival (int): Arrival time of the ev. [periods]
         departure (int): Departure time of the ev. [periods]
@@ -134,3 +137,111 @@ class EV:
         """
         self._energy_delivered = 0
         self._battery.reset()
+
+
+class EVView:
+    """ Read-only view of an EV for use by scheduling algorithms.
+
+    A view exposes the same read-only properties as EV without allowing its state to be modified. It is either backed
+    by the live EV object, in which case it always reflects the current state of the EV, or by a snapshot of the EV's
+    state taken when the view was created. Neither requires copying the EV or its battery.
+
+    Args:
+        ev (EV): The EV to be viewed.
+        snapshot (bool): If True, capture the current state of the EV instead of reading from the live object.
+            Default False.
+    """
+    __slots__ = ('_ev', '_values')
+
+    _FIELDS = ('arrival', 'departure', 'estimated_departure', 'requested_energy', 'session_id', 'station_id',
+               'energy_delivered', 'current_charging_rate', 'maximum_charging_power')
+
+    def __init__(self, ev, snapshot=False):
+        object.__setattr__(self, '_ev', ev)
+        values = {field: getattr(ev, field) for field in self._FIELDS} if snapshot else None
+        object.__setattr__(self, '_values', values)
+
+    def __setattr__(self, key, value):
+        raise AttributeError('EVView is read-only. Set deepcopy_evs on the algorithm to receive modifiable EVs.')
+
+    def __repr__(self):
+        return 'EVView({0!r}, station_id={1!r})'.format(self.session_id, self.station_id)
+
+    def _get(self, field):
+        if self._values is not None:
+            return self._values[field]
+        return getattr(self._ev, field)
+
+    @property
+    def is_snapshot(self):
+        """ Return True if the view holds a snapshot rather than reading from the live EV. (bool) """
+        return self._values is not None
+
+    @property
+    def arrival(self):
+        """ Return the arrival time of the EV. (int) """
+        return self._get('arrival')
+
+    @property
+    def departure(self):
+        """ Return the departure time of the EV. (int) """
+        return self._get('departure')
+
+    @property
+    def estimated_departure(self):
+        """ Return the estimated departure time of the EV. (int) """
+        return self._get('estimated_departure')
+
+    @property
+    def requested_energy(self):
+        """ Return the energy request of the EV for this session. (float) [acnsim units]. """
+        return self._get('requested_energy')
+
+    @property
+    def session_id(self):
+        """ Return the unique session identifier for this charging session. (str) """
+        return self._get('session_id')
+
+    @property
+    def station_id(self):
+        """ Return the unique identifier for the EVSE used for this charging session. (str) """
+        return self._get('station_id')
+
+    @property
+    def energy_delivered(self):
+        """ Return the total energy delivered so far in this charging session. (float) """
+        return self._get('energy_delivered')
+
+    @property
+    def current_charging_rate(self):
+        """ Return the current charging rate of the EV. (float) """
+        return self._get('current_charging_rate')
+
+    @property
+    def maximum_charging_power(self):
+        """ Return the maximum charging power of the battery. (float) """
+        return self._get('maximum_charging_power')
+
+    @property
+    def remaining_demand(self):
+        """ Return the remaining energy demand of this session. (float) See EV.remaining_demand. """
+        if self._values is None:
+            return self._ev.remaining_demand
+        return self.requested_energy - self.energy_delivered
+
+    @property
+    def fully_charged(self):
+        """ Return True if the EV's demand has been fully met. (bool) See EV.fully_charged. """
+        if self._values is None:
+            return self._ev.fully_charged
+        return not (self.remaining_demand > 1e-3)
+
+    @property
+    def percent_remaining(self):
+        """ Return the percent of demand which still needs to be fulfilled. (float) See EV.percent_remaining. """
+        if self._values is None:
+            return self._ev.percent_remaining
+        return self.remaining_demand / self.requested_energy
+
+
+EV.register(EVView)
@@ -2,7 +2,7 @@ from unittest import TestCase
 from unittest.mock import Mock, create_autospec
 
 from acnportal.acnsim.models import Battery
-from acnportal.acnsim.models import EV
+from acnportal.acnsim.models import EV, EVView
 
 
 class TestEV(TestCase):
@@ -28,3 +28,42 @@ class TestEV(TestCase):
         self.ev.reset()
         self.assertEqual(self.ev.energy_delivered, 0)
         self.ev._battery.reset.assert_called_once()
+
+
+class TestEVView(TestCase):
+    def setUp(self):
+        self.ev = EV(0, 10, 25.0, 'PS-001', '0001', Battery(100, 0, 7.68))
+
+    def test_live_view_reflects_ev(self):
+        view = EVView(self.ev)
+        self.assertFalse(view.is_snapshot)
+        self.ev.charge(16, 240, 5)
+        self.assertEqual(view.station_id, 'PS-001')
+        self.assertEqual(view.departure, 10)
+        self.assertAlmostEqual(view.energy_delivered, 0.32)
+        self.assertAlmostEqual(view.remaining_demand, 24.68)
+        self.assertEqual(view.current_charging_rate, 16)
+        self.assertEqual(view.maximum_charging_power, 7.68)
+
+    def test_snapshot_view_is_frozen(self):
+        view = EVView(self.ev, snapshot=True)
+        self.assertTrue(view.is_snapshot)
+        self.ev.charge(16, 240, 5)
+        self.assertEqual(view.energy_delivered, 0)
+        self.assertEqual(view.remaining_demand, 25.0)
+        self.assertFalse(view.fully_charged)
+        self.assertEqual(view.percent_remaining, 1)
+
+    def test_view_is_instance_of_ev(self):
+        view = EVView(self.ev)
+        self.assertIsInstance(view, EV)
+        self.assertIsInstance(EVView(self.ev, snapshot=True), EV)
+        self.assertTrue(issubclass(EVView, EV))
+
+    def test_view_is_read_only(self):
+        view = EVView(self.ev)
+        with self.assertRaises(AttributeError):
+            view.departure = 5
+        with self.assertRaises(AttributeError):
+            view.new_attribute = 5
+        self.assertEqual(self.ev.departure, 10)
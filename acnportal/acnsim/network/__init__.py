@@ -1,7 +1,15 @@
 from .charging_network import ChargingNetwork
 from .charging_network import StationOccupiedError
+from .charging_network import FeasibilityReport
 from .current import Current
+from .current import SparseCurrent
+from .plant import VectorizedPlant
+from .feasibility import FeasibilityOracle
+from .builder import NetworkBuilder
 from . import sites
 
 del charging_network
 del current
+del plant
+del feasibility
+del builder
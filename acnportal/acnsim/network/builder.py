@@ -0,0 +1,121 @@
+from .charging_network import ChargingNetwork
+from .current import Current, SparseCurrent
+
+
+class NetworkBuilder:
+    """ Collects EVSEs and constraints for a ChargingNetwork and adds them to the network all at once.
+
+    Registering EVSEs and adding constraints one at a time reallocates the network's voltage, phase angle and
+    constraint matrix on every call, which is quadratic in the size of the network. NetworkBuilder instead records
+    each EVSE and constraint and materializes them in a single allocation when build is called. The resulting network
+    is the same as if register_evse and add_constraint had been called on it in the same order.
+
+    NetworkBuilder can also be used as a context manager, in which case build is called on exit:
+
+        with NetworkBuilder(ChargingNetwork()) as builder:
+            builder.register_evse(EVSE('PS-001'), 240, 0)
+            builder.add_constraint(Current('PS-001'), 32, name='PS-001 Line')
+        network = builder.network
+
+    Args:
+        network (ChargingNetwork): Network to which the EVSEs and constraints are added. It may already contain EVSEs
+            and constraints.
+    """
+
+    def __init__(self, network):
+        self._network = network
+        self._clear()
+
+    def _clear(self):
+        """ Forget all recorded EVSEs and constraints. """
+        self._evses = []
+        self._voltages = []
+        self._phase_angles = []
+        self._station_ids = set(self._network.station_ids)
+        self._currents = []
+        self._limits = []
+        self._names = []
+
+    @property
+    def network(self):
+        """ Return the network being built. (ChargingNetwork) """
+        return self._network
+
+    def register_evse(self, evse, voltage, phase_angle):
+        """ Record an EVSE to be registered with the network. See ChargingNetwork.register_evse.
+
+        Args:
+            evse (EVSE): An EVSE object.
+            voltage (float): Voltage feeding the EVSE (V).
+            phase_angle (float): Phase angle of the voltage/current feeding the EVSE (degrees).
+
+        Returns:
+            None
+        """
+        self._evses.append(evse)
+        self._voltages.append(voltage)
+        self._phase_angles.append(phase_angle)
+        self._station_ids.add(evse.station_id)
+
+    def add_constraint(self, current, limit, name=None):
+        """ Record a constraint to be added to the network. See ChargingNetwork.add_constraint.
+
+        Args:
+            current (Current or SparseCurrent): Aggregate current which is constrained. See Current for more info.
+            limit (float): Upper limit on the aggregate current.
+            name (str): Name of this constraint.
+
+        Returns:
+            None
+
+        Raises:
+            KeyError: Raised if current includes a station which has not been registered with the network or the
+                builder.
+        """
+        for station_id in current.index:
+            if station_id not in self._station_ids:
+                raise KeyError('Station {0} not found. Register station {0} to add constraint {1} to network.'.format(
+                    station_id, name))
+        self._currents.append(current)
+        self._limits.append(limit)
+        self._names.append(name)
+
+    def build(self):
+        """ Add all recorded EVSEs and constraints to the network, using its register_evses and add_constraints.
+
+        If the network overrides register_evse or add_constraint, that method is instead called for each recorded EVSE
+        or constraint in turn, so customizations of either are not bypassed. Such an add_constraint is passed each
+        SparseCurrent converted to a Current, which is what it received before the sites were built with SparseCurrent.
+
+        Constraints are named when they are added to the network, so warnings about duplicate names are raised here.
+
+        Returns:
+            ChargingNetwork: The network, now including all recorded EVSEs and constraints.
+        """
+        if self._evses:
+            if self._overrides('register_evse'):
+                for evse, voltage, phase_angle in zip(self._evses, self._voltages, self._phase_angles):
+                    self._network.register_evse(evse, voltage, phase_angle)
+            else:
+                self._network.register_evses(self._evses, self._voltages, self._phase_angles)
+        if self._currents:
+            if self._overrides('add_constraint'):
+                for current, limit, name in zip(self._currents, self._limits, self._names):
+                    if isinstance(current, SparseCurrent):
+                        current = Current(current.loads)
+                    self._network.add_constraint(current, limit, name=name)
+            else:
+                self._network.add_constraints(self._currents, self._limits, self._names)
+        self._clear()
+        return self._network
+
+    def _overrides(self, method):
+        """ Return True if the type of the network overrides the given method of ChargingNetwork. """
+        return getattr(type(self._network), method, None) is not getattr(ChargingNetwork, method)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.build()
@@ -1,9 +1,40 @@
 from .current import Current
+from .plant import VectorizedPlant
 import pandas as pd
 import numpy as np
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 import warnings
 
+try:
+    import scipy.sparse as sparse
+except ImportError:
+    sparse = None
+
+# When sparse_constraints is None, the constraint matrix is stored in CSR format if scipy is installed, it has at least
+# SPARSE_MIN_SIZE entries and at most a fraction SPARSE_MAX_DENSITY of them are nonzero.
+SPARSE_MIN_SIZE = 10000
+SPARSE_MAX_DENSITY = 0.1
+
+# The relative tolerance used to evaluate feasibility is at least DTYPE_TOLERANCE_FACTOR times the machine epsilon of
+# the network's dtype, so that rounding errors of low precision dtypes do not change feasibility decisions.
+DTYPE_TOLERANCE_FACTOR = 100
+
+FeasibilityReport = namedtuple('FeasibilityReport', ['feasible', 'slack', 'max_violation', 'max_violation_constraint',
+                                                     'max_violation_time'])
+FeasibilityReport.__doc__ = """ Result of ChargingNetwork.feasibility_report.
+
+Attributes:
+    feasible (bool): True if the schedule satisfies every constraint at every time index, as in is_feasible.
+    slack (np.Array): Matrix with a row per constraint and a column per time index of the amount by which the
+        magnitude of each aggregate current is below its tolerance-adjusted limit. Negative entries are violations. [A]
+    max_violation (float): Largest violation, i.e. the negative of the smallest slack, or None if the network has no
+        constraints. Negative if the schedule is feasible. [A]
+    max_violation_constraint (str): Name of the constraint with the largest violation, or None if the network has no
+        constraints.
+    max_violation_time (int): Time index of the largest violation, or None if the network has no constraints.
+"""
+
+
 class ChargingNetwork:
     """
     The ChargingNetwork class describes the infrastructure of the charging network with
@@ -14,21 +45,123 @@ class ChargingNetwork:
             charging schedule may violate network constrants (A).
         relative_tolerance (float): Relative amount by which an input
             charging schedule may violate network constrants (A).
+        vectorized_plant (bool): If True, advance all EVs in a single vectorized step using a VectorizedPlant instead
+            of calling set_pilot on each EVSE. Default False.
+        sparse_constraints (bool): If True, store the matrices used to compute aggregate currents in scipy's CSR
+            format. If False, always use dense numpy arrays. If None, use CSR only if scipy is installed and the
+            constraint matrix is large and sparse, see SPARSE_MIN_SIZE and SPARSE_MAX_DENSITY. When CSR is used,
+            constraints added with add_constraint are also stored in CSR format until constraint_matrix is accessed.
+            Default None.
+        dtype (np.dtype): Floating point type used to compute aggregate currents and check feasibility. Aggregate
+            currents are returned as the matching complex type, e.g. complex64 for float32. For dtypes with less
+            precision than float64, the relative tolerance is raised to DTYPE_TOLERANCE_FACTOR times the machine
+            epsilon of the dtype if it is smaller. Default float.
     """
 
-    def __init__(self, violation_tolerance=1e-5, relative_tolerance=1e-7):
+    def __init__(self, violation_tolerance=1e-5, relative_tolerance=1e-7, vectorized_plant=False,
+                 sparse_constraints=None, dtype=float):
         self._EVSEs = OrderedDict()
-        # Matrix of constraints
-        self.constraint_matrix = None
+        # Matrix of constraints, stored as a numpy array or a scipy CSR matrix. See constraint_matrix.
+        self._constraints = None
         # Vector of limiting magnitudes
         self.magnitudes = np.array([])
         # List of constraints in order of addition to network
         self.constraint_index = []
         self._voltages = np.array([])
         self._phase_angles = np.array([])
+        # Cached per-station views, rebuilt only after an EVSE is registered. See _station_views.
+        self._station_cache = None
+        # Cached phase-adjusted constraint matrix and limits. See _constraint_views.
+        self._constraint_cache = None
+        # Cached slice of the constraint matrices for stations with an EV plugged in. See _plugged_in_views.
+        self._plugged_in_cache = None
         self.violation_tolerance = violation_tolerance
         self.relative_tolerance = relative_tolerance
-        pass
+        self._plant = VectorizedPlant(self) if vectorized_plant else None
+        self.sparse_constraints = sparse_constraints
+        self.dtype = dtype
+
+    @property
+    def dtype(self):
+        """ Return the floating point type used to compute aggregate currents. (np.dtype) """
+        return self._dtype
+
+    @dtype.setter
+    def dtype(self, value):
+        """ Set the floating point type used to compute aggregate currents. (np.dtype)
+
+        Raises:
+            ValueError: Raised if value is not a real floating point type.
+        """
+        value = np.dtype(value)
+        if value.kind != 'f':
+            raise ValueError('dtype must be a real floating point type. Got {0}'.format(value))
+        self._dtype = value
+        self._complex_dtype = np.result_type(value, np.complex64)
+
+    @property
+    def constraint_matrix(self):
+        """ Return the matrix with a row per constraint and a column per EVSE in the order of station_ids.
+
+        If the constraints are stored in CSR format, they are converted to a dense array on access, so the returned
+        array is always the one the network uses and may be modified in place.
+
+        Returns:
+            np.Array: Coefficient of each EVSE in the aggregate current of each constraint, or None if no constraint
+                has been added.
+        """
+        if sparse is not None and sparse.issparse(self._constraints):
+            self._constraints = self._constraints.toarray()
+        return self._constraints
+
+    @constraint_matrix.setter
+    def constraint_matrix(self, value):
+        """ Replace the constraint matrix. (np.Array) """
+        self._constraints = value
+
+    def _store_sparse_constraints(self, size, nonzeros):
+        """ Return True if a constraint matrix with the given number of entries and nonzeros should be stored in CSR
+        format, i.e. if sparse_constraints is True, or if it is None and the matrix is large and sparse.
+        """
+        if self.sparse_constraints is not None:
+            return bool(self.sparse_constraints)
+        return self._large_and_sparse(size, nonzeros)
+
+    @staticmethod
+    def _large_and_sparse(size, nonzeros):
+        """ Return True if scipy is installed and a matrix with the given number of entries and nonzeros has at least
+        SPARSE_MIN_SIZE entries of which at most a fraction SPARSE_MAX_DENSITY are nonzero.
+        """
+        return sparse is not None and size >= SPARSE_MIN_SIZE and nonzeros <= SPARSE_MAX_DENSITY * size
+
+    @property
+    def sparse_constraints(self):
+        """ Return whether aggregate currents are computed with CSR matrices: True, False or None for automatic. """
+        return self._sparse_constraints
+
+    @sparse_constraints.setter
+    def sparse_constraints(self, value):
+        """ Set whether aggregate currents are computed with CSR matrices. (bool or None)
+
+        Raises:
+            ImportError: Raised if value is True but scipy is not installed.
+        """
+        if value and sparse is None:
+            raise ImportError('sparse_constraints requires scipy. Install it with pip install scipy.')
+        self._sparse_constraints = value
+
+    @property
+    def vectorized_plant(self):
+        """ Return True if the network advances its EVs using a VectorizedPlant. (bool) """
+        return self._plant is not None
+
+    @vectorized_plant.setter
+    def vectorized_plant(self, value):
+        """ Enable or disable the VectorizedPlant. (bool) """
+        if value and self._plant is None:
+            self._plant = VectorizedPlant(self)
+        elif not value:
+            self._plant = None
 
     @property
     def current_charging_rates(self):
@@ -39,16 +172,37 @@ class ChargingNetwork:
         Returns:
             np.Array: numpy ndarray of actual charging rates of all EVSEs in the network.
         """
+        if self._plant is not None:
+            return self._plant.charging_rates
         return np.array([evse.ev.current_charging_rate if evse.ev is not None else 0 for evse in self._EVSEs.values()])
 
     @property
     def station_ids(self):
         """ Return the IDs of all registered EVSEs.
 
+        The returned list is cached and shared between callers, so it should not be modified.
+
         Returns:
             List[str]: List of all registered EVSE IDs.
         """
-        return list(self._EVSEs.keys())
+        return self._station_views()['ids']
+
+    def station_index(self, station_id):
+        """ Return the index of an EVSE in the order given by station_ids.
+
+        Args:
+            station_id (str): ID of the EVSE.
+
+        Returns:
+            int: Index of the EVSE, which is also its row in schedule matrices and column in the constraint matrix.
+
+        Raises:
+            KeyError: Raised when the station id has not yet been registered.
+        """
+        try:
+            return self._station_views()['index'][station_id]
+        except KeyError:
+            raise KeyError('Station {0} not found.'.format(station_id))
 
     @property
     def active_evs(self):
@@ -68,6 +222,18 @@ class ChargingNetwork:
         """
         return [evse.station_id for evse in self._EVSEs.values() if evse.ev is not None and not evse.ev.fully_charged]
 
+    @property
+    def plugged_in_station_ids(self):
+        """ Return IDs for all stations which have an EV plugged in, whether or not it is fully charged.
+
+        This is a superset of active_station_ids which only changes when an EV is plugged in or unplugged. The
+        returned list is cached and shared between callers, so it should not be modified.
+
+        Returns:
+            List[str]: List of the station_id of all stations which have an EV plugged in, in the order of station_ids.
+        """
+        return self._plugged_in_views()['ids']
+
     @property
     def voltages(self):
         """ Return dictionary of voltages for all EVSEs in the network.
@@ -75,7 +241,7 @@ class ChargingNetwork:
         Returns:
             Dict[str, float]: Dictionary mapping EVSE ids their input voltage. [V]
         """
-        return {self.station_ids[i] : self._voltages[i] for i in range(len(self._voltages))}
+        return dict(self._station_views()['voltages'])
 
     @property
     def phase_angles(self):
@@ -84,7 +250,322 @@ class ChargingNetwork:
         Returns:
             Dict[str, float]: Dictionary mapping EVSE ids their input phase angle. [degrees]
         """
-        return {self.station_ids[i] : self._phase_angles[i] for i in range(len(self._phase_angles))}
+        return dict(self._station_views()['phase_angles'])
+
+    @property
+    def max_pilot_signals(self):
+        """ Return dictionary of maximum pilot signals for all EVSEs in the network.
+
+        Returns:
+            Dict[str, float]: Dictionary mapping EVSE ids to their maximum allowable pilot signal. [A]
+        """
+        return dict(self._station_views()['max_pilot_signals'])
+
+    @property
+    def min_pilot_signals(self):
+        """ Return dictionary of minimum pilot signals for all EVSEs in the network.
+
+        Returns:
+            Dict[str, float]: Dictionary mapping EVSE ids to their minimum allowable pilot signal. [A]
+        """
+        return dict(self._station_views()['min_pilot_signals'])
+
+    @property
+    def max_rates(self):
+        """ Return the maximum pilot signal of each EVSE in the order given by station_ids.
+
+        Returns:
+            np.Array: numpy ndarray of the maximum allowable pilot signal of each EVSE. [A]
+        """
+        return self._station_views()['max_rates']
+
+    @property
+    def min_rates(self):
+        """ Return the minimum pilot signal of each EVSE in the order given by station_ids.
+
+        Returns:
+            np.Array: numpy ndarray of the minimum allowable pilot signal of each EVSE. [A]
+        """
+        return self._station_views()['min_rates']
+
+    def station_voltage(self, station_id):
+        """ Return the voltage of an EVSE without building the dictionary returned by voltages.
+
+        Args:
+            station_id (str): ID of the EVSE.
+
+        Returns:
+            float: Input voltage of the EVSE. [V]
+
+        Raises:
+            KeyError: Raised when the station id has not yet been registered.
+        """
+        return self._station_value('voltages', station_id)
+
+    def station_phase_angle(self, station_id):
+        """ Return the phase angle of an EVSE without building the dictionary returned by phase_angles.
+
+        Args:
+            station_id (str): ID of the EVSE.
+
+        Returns:
+            float: Input phase angle of the EVSE. [degrees]
+
+        Raises:
+            KeyError: Raised when the station id has not yet been registered.
+        """
+        return self._station_value('phase_angles', station_id)
+
+    def station_max_pilot_signal(self, station_id):
+        """ Return the maximum pilot signal of an EVSE without building the dictionary returned by max_pilot_signals.
+
+        Args:
+            station_id (str): ID of the EVSE.
+
+        Returns:
+            float: Maximum allowable pilot signal of the EVSE. [A]
+
+        Raises:
+            KeyError: Raised when the station id has not yet been registered.
+        """
+        return self._station_value('max_pilot_signals', station_id)
+
+    def station_min_pilot_signal(self, station_id):
+        """ Return the minimum pilot signal of an EVSE without building the dictionary returned by min_pilot_signals.
+
+        Args:
+            station_id (str): ID of the EVSE.
+
+        Returns:
+            float: Minimum allowable pilot signal of the EVSE. [A]
+
+        Raises:
+            KeyError: Raised when the station id has not yet been registered.
+        """
+        return self._station_value('min_pilot_signals', station_id)
+
+    def _station_value(self, name, station_id):
+        """ Return the value of an EVSE in one of the cached per-station dicts, raising KeyError if it is unknown. """
+        try:
+            return self._station_views()[name][station_id]
+        except KeyError:
+            raise KeyError('Station {0} not found.'.format(station_id))
+
+    def _station_views(self):
+        """ Return the cached per-station views of the network, building them if an EVSE was registered since.
+
+        Returns:
+            Dict[str, object]: Cached station ids, station index map, and array and dict views of the voltages, phase
+                angles and pilot signal limits of all EVSEs.
+        """
+        if self._station_cache is None:
+            ids = list(self._EVSEs.keys())
+            max_rates = np.array([evse.max_rate for evse in self._EVSEs.values()], dtype=float)
+            min_rates = np.array([evse.min_rate for evse in self._EVSEs.values()], dtype=float)
+            max_rates.setflags(write=False)
+            min_rates.setflags(write=False)
+            self._station_cache = {
+                'ids': ids,
+                'index': {station_id: i for i, station_id in enumerate(ids)},
+                'voltages': dict(zip(ids, self._voltages)),
+                'phase_angles': dict(zip(ids, self._phase_angles)),
+                'max_pilot_signals': dict(zip(ids, max_rates)),
+                'min_pilot_signals': dict(zip(ids, min_rates)),
+                'max_rates': max_rates,
+                'min_rates': min_rates,
+            }
+        return self._station_cache
+
+    def _constraint_views(self):
+        """ Return the cached phase-adjusted constraint matrix and tolerance-adjusted limits of the network.
+
+        The cache is rebuilt whenever the constraint matrix, magnitudes, phase angles or tolerances of the network have
+        been replaced or changed in place since it was built. In-place changes are detected by comparing the arrays
+        with copies taken when the cache was built, which is cheap next to computing aggregate currents with them.
+
+        Returns:
+            Dict[str, object]: Cached views with keys
+                - 'sparse': True if the matrices below are scipy CSR matrices, False if they are numpy arrays.
+                - 'linear_matrix': constraint_matrix, converted to dtype.
+                - 'phasor_matrix': constraint_matrix with each column multiplied by exp(j * phase angle) of its EVSE.
+                - 'real_imag_matrix': Real part of phasor_matrix stacked on top of its imaginary part, so that the
+                    real and imaginary parts of the aggregate currents can be computed with a single real product.
+                - 'limits': magnitudes plus the larger of the absolute and relative violation tolerance.
+                - 'squared_limits': Square of limits.
+        """
+        key = (self._constraints, self.magnitudes, self._phase_angles,
+               self.violation_tolerance, self.relative_tolerance, self.sparse_constraints, self.dtype)
+        cache = self._constraint_cache
+        if cache is None or self._constraints_changed(cache, key):
+            if self._constraints is not None and len(self.magnitudes):
+                linear_matrix = self._constraints.astype(self.dtype, copy=False)
+            else:
+                linear_matrix = np.zeros((0, len(self._EVSEs)), dtype=self.dtype)
+            phase_factors = np.exp(1j * np.deg2rad(self._phase_angles)).astype(self._complex_dtype, copy=False)
+            use_sparse = self._use_sparse_constraints(linear_matrix)
+            if sparse is not None and sparse.issparse(linear_matrix) and not use_sparse:
+                linear_matrix = linear_matrix.toarray()
+            if use_sparse:
+                linear_matrix = sparse.csr_matrix(linear_matrix)
+                phasor_matrix = sparse.csr_matrix(linear_matrix.multiply(phase_factors[np.newaxis, :]))
+                real_imag_matrix = sparse.vstack([phasor_matrix.real, phasor_matrix.imag], format='csr')
+            else:
+                phasor_matrix = linear_matrix * phase_factors
+                real_imag_matrix = np.vstack([phasor_matrix.real, phasor_matrix.imag])
+            limits = self._limits(self.violation_tolerance, self.relative_tolerance)
+            cache = {
+                'key': key,
+                'state': [array.copy() for array in self._constraint_arrays()],
+                'sparse': use_sparse,
+                'linear_matrix': linear_matrix,
+                'phasor_matrix': phasor_matrix,
+                'real_imag_matrix': real_imag_matrix,
+                'limits': limits,
+                'squared_limits': limits ** 2,
+            }
+            self._constraint_cache = cache
+        return cache
+
+    def _constraint_arrays(self):
+        """ Return the arrays holding the constraint matrix, magnitudes and phase angles of the network.
+
+        Returns:
+            List[np.Array]: The constraint matrix, or the data, indices and indptr arrays if it is stored in CSR
+                format, followed by the magnitudes and phase angles.
+        """
+        if self._constraints is None:
+            arrays = []
+        elif sparse is not None and sparse.issparse(self._constraints):
+            arrays = [self._constraints.data, self._constraints.indices, self._constraints.indptr]
+        else:
+            arrays = [np.asarray(self._constraints)]
+        return arrays + [np.asarray(self.magnitudes), self._phase_angles]
+
+    def _constraints_changed(self, cache, key):
+        """ Return True if the arrays or settings the constraint views were built from have changed.
+
+        Args:
+            cache (Dict[str, object]): Cached constraint views. See _constraint_views.
+            key (tuple): Current constraint matrix, magnitudes, phase angles, tolerances, sparse_constraints and dtype.
+
+        Returns:
+            bool: True if the constraint views must be rebuilt.
+        """
+        if any(a is not b for a, b in zip(cache['key'][:3], key[:3])) or cache['key'][3:] != key[3:]:
+            return True
+        return not all(np.array_equal(a, b) for a, b in zip(cache['state'], self._constraint_arrays()))
+
+    def _use_sparse_constraints(self, constraint_matrix):
+        """ Return True if aggregate currents should be computed using constraint_matrix in CSR format.
+
+        Args:
+            constraint_matrix (np.Array or scipy.sparse.csr_matrix): The constraint matrix, in either format.
+
+        Returns:
+            bool: True if CSR format should be used.
+        """
+        if self.sparse_constraints is not None:
+            return self.sparse_constraints
+        size = constraint_matrix.shape[0] * constraint_matrix.shape[1]
+        if sparse is None or size < SPARSE_MIN_SIZE:
+            return False
+        return self._large_and_sparse(size, self._count_nonzero(constraint_matrix))
+
+    @staticmethod
+    def _count_nonzero(constraint_matrix):
+        """ Return the number of nonzero entries of a constraint matrix in either format, or 0 if it is None. """
+        if constraint_matrix is None:
+            return 0
+        if sparse is not None and sparse.issparse(constraint_matrix):
+            return constraint_matrix.count_nonzero()
+        return np.count_nonzero(constraint_matrix)
+
+    def _plugged_in_views(self):
+        """ Return the cached IDs of stations with an EV plugged in and the matching columns of the constraint matrices.
+
+        Schedules usually only include stations with an EV plugged in, so aggregate currents can be computed from these
+        columns alone. The cache is rebuilt after an EV is plugged in or unplugged, an EVSE is registered, or the
+        constraint views are rebuilt.
+
+        Returns:
+            Dict[str, object]: Cached views with keys
+                - 'ids': IDs of the stations with an EV plugged in, in the order of station_ids.
+                - 'index': np.Array of the index of each of these stations in station_ids.
+                - 'linear_matrix', 'phasor_matrix' and 'real_imag_matrix': Columns of the corresponding constraint
+                    views for these stations.
+        """
+        constraint_views = self._constraint_views()
+        cache = self._plugged_in_cache
+        if cache is None or cache['constraint_views'] is not constraint_views:
+            ids = [station_id for station_id, evse in self._EVSEs.items() if evse.ev is not None]
+            index = np.array([self._station_views()['index'][station_id] for station_id in ids], dtype=int)
+            cache = {
+                'constraint_views': constraint_views,
+                'ids': ids,
+                'index': index,
+            }
+            for key in ['linear_matrix', 'phasor_matrix', 'real_imag_matrix']:
+                cache[key] = constraint_views[key][:, index]
+            self._plugged_in_cache = cache
+        return cache
+
+    def _coefficients(self, kind, station_ids=None, constraint_indices=None):
+        """ Return the matrix which maps a schedule of the given stations to the aggregate current of each constraint.
+
+        Args:
+            kind (str): Which constraint view to return, one of 'linear', 'phasor' or 'real_imag'. See
+                _constraint_views.
+            station_ids (List[str]): IDs of the stations which the columns of the returned matrix should correspond to.
+                If None, all stations in the order of station_ids. Default None.
+            constraint_indices (List[int]): Indices of the constraints which the rows of the returned matrix should
+                correspond to. If None, all constraints. For 'real_imag', the rows of both the real and imaginary part
+                of these constraints are returned. Default None.
+
+        Returns:
+            np.Array or scipy.sparse.csr_matrix: Matrix with a row per constraint and a column per station.
+        """
+        key = '{0}_matrix'.format(kind)
+        if station_ids is None or station_ids is self.station_ids:
+            matrix = self._constraint_views()[key]
+        else:
+            plugged_in_views = self._plugged_in_views()
+            if station_ids is plugged_in_views['ids'] or station_ids == plugged_in_views['ids']:
+                matrix = plugged_in_views[key]
+            else:
+                columns = [self.station_index(station_id) for station_id in station_ids]
+                matrix = self._constraint_views()[key][:, columns]
+        if constraint_indices is not None:
+            if kind == 'real_imag':
+                constraint_indices = list(constraint_indices) + [i + len(self.magnitudes) for i in constraint_indices]
+            matrix = matrix[constraint_indices]
+        return matrix
+
+    def _limits(self, violation_tolerance, relative_tolerance):
+        """ Return the magnitude of each constraint plus the larger of the absolute and relative tolerance.
+
+        The relative tolerance is raised to DTYPE_TOLERANCE_FACTOR times the machine epsilon of dtype if it is smaller.
+        """
+        relative_tolerance = max(relative_tolerance, DTYPE_TOLERANCE_FACTOR * np.finfo(self.dtype).eps)
+        return self.magnitudes + np.maximum(violation_tolerance, self.magnitudes * relative_tolerance)
+
+    def _tolerance_limits(self, violation_tolerance=None, relative_tolerance=None):
+        """ Return the limits and squared limits of each constraint for the given tolerances.
+
+        If no tolerances are specified, the cached limits built from the network's tolerances are returned. If only
+        one is specified, the network's value is used for the other.
+
+        Returns:
+            Tuple[np.Array, np.Array]: Tolerance-adjusted limits and their squares.
+        """
+        if violation_tolerance is None and relative_tolerance is None:
+            constraint_views = self._constraint_views()
+            return constraint_views['limits'], constraint_views['squared_limits']
+        if violation_tolerance is None:
+            violation_tolerance = self.violation_tolerance
+        if relative_tolerance is None:
+            relative_tolerance = self.relative_tolerance
+        limits = self._limits(violation_tolerance, relative_tolerance)
+        return limits, limits ** 2
 
     def register_evse(self, evse, voltage, phase_angle):
         """ Register an EVSE with the network so it will be accessible to the rest of the simulation.
@@ -97,9 +578,30 @@ class ChargingNetwork:
         Returns:
             None
         """
-        self._EVSEs[evse.station_id] = evse
-        self._voltages = np.append(self._voltages, voltage)
-        self._phase_angles = np.append(self._phase_angles, phase_angle)
+        self.register_evses([evse], [voltage], [phase_angle])
+
+    def register_evses(self, evses, voltages, phase_angles):
+        """ Register several EVSEs at once, growing the voltage and phase angle vectors in a single allocation.
+
+        register_evse and NetworkBuilder both register EVSEs through this method, so subclasses which customize
+        registration only need to override it.
+
+        Args:
+            evses (List[EVSE]): EVSE objects to register.
+            voltages (List[float]): Voltage feeding each EVSE (V).
+            phase_angles (List[float]): Phase angle of the voltage/current feeding each EVSE (degrees).
+
+        Returns:
+            None
+        """
+        for evse in evses:
+            self._EVSEs[evse.station_id] = evse
+        self._voltages = np.concatenate([self._voltages, voltages])
+        self._phase_angles = np.concatenate([self._phase_angles, phase_angles])
+        self._station_cache = None
+        self._plugged_in_cache = None
+        if self._plant is not None:
+            self._plant.invalidate()
 
     def constraints_as_df(self):
         return pd.DataFrame(self.constraint_matrix, columns=self.station_ids, index=self.constraint_index)
@@ -108,32 +610,98 @@ class ChargingNetwork:
         """ Add an additional constraint to the constraint DataFrame.
 
         Args:
-            current (Current): Aggregate current which is constrained. See Current for more info.
+            current (Current or SparseCurrent): Aggregate current which is constrained. See Current for more info.
             limit (float): Upper limit on the aggregate current.
             name (str): Name of this constraint.
 
         Returns:
             None
         """
+        self.add_constraints([current], [limit], [name])
+
+    def _constraint_name(self, current, name, constraint_index, station_ids):
+        """ Validate a new constraint and return the name it should be added under.
+
+        Args:
+            current (Current or SparseCurrent): Aggregate current which is constrained.
+            name (str): Requested name of the constraint, or None to use a default name.
+            constraint_index (List[str]): Names of all constraints the new constraint will be added after.
+            station_ids (Container[str]): IDs of all stations which the constraint may include.
+
+        Returns:
+            str: name, or a default name if name is None, with '_v2' appended if it is already taken.
+
+        Raises:
+            KeyError: Raised if current includes a station which is not in station_ids.
+        """
         if name is None:
-            name = '_const_{0}'.format(len(self.constraint_index))
-        if name in self.constraint_index:
+            name = '_const_{0}'.format(len(constraint_index))
+        if name in constraint_index:
             warnings.warn(
                 "Constraint {0} already added. Adding input constraint as new constraint. Use network.update_constraint to update constraint {0}".format(name),
                 UserWarning)
             name = name + "_v2"
         for station_id in current.index:
-            if station_id not in self._EVSEs:
+            if station_id not in station_ids:
                 raise KeyError('Station {0} not found. Register station {0} to add constraint {1} to network.'.format(station_id, name))
-        current.name = name
-        self.magnitudes = np.append(self.magnitudes, limit)
-        # Make a dataframe for the constraint matrix for easy addition of the new constraint
-        constraint_frame = self.constraints_as_df()
-        constraint_frame = constraint_frame.append(current).fillna(0)
+        return name
+
+    def add_constraints(self, currents, limits, names=None):
+        """ Add several constraints at once, growing the constraint matrix in a single allocation.
+
+        The constraints are named and validated as if add_constraint had been called for each in turn. add_constraint
+        and NetworkBuilder both add constraints through this method, so subclasses which customize adding constraints
+        only need to override it.
+
+        Args:
+            currents (List[Current or SparseCurrent]): Aggregate currents which are constrained.
+            limits (List[float]): Upper limit on each aggregate current.
+            names (List[str]): Name of each constraint, or None for a default name. If None, all constraints get
+                default names. Default None.
+
+        Returns:
+            None
+
+        Raises:
+            KeyError: Raised if a current includes a station which is not registered. No constraint is added then.
+        """
+        if names is None:
+            names = [None] * len(currents)
+        constraint_index = list(self.constraint_index)
+        for current, name in zip(currents, names):
+            constraint_index.append(self._constraint_name(current, name, constraint_index, self._EVSEs))
+        names = constraint_index[len(self.constraint_index):]
+        index = self._station_views()['index']
+        rows, columns, coefficients = [], [], []
+        for row, (current, name) in enumerate(zip(currents, names)):
+            current.name = name
+            for station_id, coefficient in current.items():
+                rows.append(row)
+                columns.append(index[station_id])
+                coefficients.append(coefficient)
+        # Stations registered after the existing constraints were added have a coefficient of 0 in them.
+        size = (len(self.constraint_index) + len(currents)) * len(index)
+        nonzeros = self._count_nonzero(self._constraints) + np.count_nonzero(coefficients)
+        if self._store_sparse_constraints(size, nonzeros):
+            constraint_matrix = sparse.csr_matrix((coefficients, (rows, columns)), shape=(len(currents), len(index)),
+                                                  dtype=float)
+            if self._constraints is not None:
+                existing = sparse.csr_matrix(self._constraints)
+                existing = sparse.csr_matrix((existing.data, existing.indices, existing.indptr),
+                                             shape=(existing.shape[0], len(index)))
+                constraint_matrix = sparse.vstack([existing, constraint_matrix], format='csr')
+        else:
+            constraint_matrix = np.zeros((len(self.constraint_index) + len(currents), len(index)))
+            if self._constraints is not None:
+                existing = self._constraints
+                if sparse is not None and sparse.issparse(existing):
+                    existing = existing.toarray()
+                constraint_matrix[:len(self.constraint_index), :existing.shape[1]] = existing
+            constraint_matrix[np.array(rows, dtype=int) + len(self.constraint_index), columns] = coefficients
+        self.magnitudes = np.append(self.magnitudes, limits)
         # Maintain a list of constraint ids for use with constraint_current.
-        self.constraint_index = list(constraint_frame.index)
-        # Update the numpy matrix of constraints by reconstructing it from constraint_frame.
-        self.constraint_matrix = constraint_frame.reindex(columns=self.station_ids).to_numpy()
+        self.constraint_index = self.constraint_index + list(names)
+        self.constraint_matrix = constraint_matrix
 
     def remove_constraint(self, name):
         """ Remove a network constraint.
@@ -147,7 +715,10 @@ class ChargingNetwork:
         if name not in self.constraint_index:
             raise KeyError('Cannot remove constraint {0}: not found in network.'.format(name))
         del_index = self.constraint_index.index(name)
-        self.constraint_matrix = np.delete(self.constraint_matrix, (del_index), axis=0)
+        if sparse is not None and sparse.issparse(self._constraints):
+            self.constraint_matrix = self._constraints[np.arange(self._constraints.shape[0]) != del_index]
+        else:
+            self.constraint_matrix = np.delete(self.constraint_matrix, (del_index), axis=0)
         self.magnitudes = np.delete(self.magnitudes, (del_index), axis=0)
         self.constraint_index.remove(name)
 
@@ -156,7 +727,7 @@ class ChargingNetwork:
 
         Args:
             name (str): Name of constriant to update.
-            current (Current): New current to update constraint with
+            current (Current or SparseCurrent): New current to update constraint with
             limit (float): New upper limit to update constraint with
             new_name (str): New name to give constraint
 
@@ -186,6 +757,9 @@ class ChargingNetwork:
         """
         if station_id in self._EVSEs:
             self._EVSEs[station_id].plugin(ev)
+            self._plugged_in_cache = None
+            if self._plant is not None:
+                self._plant.plugin(station_id)
         else:
             raise KeyError('Station {0} not found.'.format(station_id))
 
@@ -203,6 +777,9 @@ class ChargingNetwork:
         """
         if station_id in self._EVSEs:
             self._EVSEs[station_id].unplug()
+            self._plugged_in_cache = None
+            if self._plant is not None:
+                self._plant.unplug(station_id)
         else:
             raise KeyError('Station {0} not found.'.format(station_id))
 
@@ -239,12 +816,15 @@ class ChargingNetwork:
         Returns:
             None
         """
+        if self._plant is not None:
+            self._plant.step(pilots[:, i], self._voltages, period)
+            return
         ids = self.station_ids
         for station_number in range(len(ids)):
             new_rate = pilots[station_number, i]
             self._EVSEs[ids[station_number]].set_pilot(new_rate, self._voltages[station_number], period)
 
-    def constraint_current(self, input_schedule, constraints=None, time_indices=None, linear=False):
+    def constraint_current(self, input_schedule, constraints=None, time_indices=None, linear=False, station_ids=None):
         """ Return the aggregate currents subject to the given constraints. If constraints=None,
         return all aggregate currents.
 
@@ -257,35 +837,37 @@ class ChargingNetwork:
                 calculates aggregate currents for all timesteps.
             linear (bool): If True, linearize all constraints to a more conservative but easier to compute constraint by
                 ignoring the phase angle and taking the absolute value of all load coefficients. Default False.
+            station_ids (List[str]): IDs of the stations corresponding to the rows of input_schedule. Stations not
+                included are assumed to have a rate of 0, so only their columns of the constraint matrix are used. If
+                these are the stations in plugged_in_station_ids, a cached slice of the constraint matrix is used.
+                Default None, in which case input_schedule has a row for every station in station_ids.
 
         Returns:
             np.Array: Aggregate currents subject to the given constraints.
         """
-        schedule_matrix = np.array(input_schedule)
-        # Convert list of constraint id's to list of indices in constraint matrix
-        if constraints is not None:
-            constraint_indices = [i for i in range(len(self.constraint_index)) if self.constraint_index[i] in constraints]
-        else:
-            constraint_indices = list(range(len(self.constraint_index)))
-
+        schedule_matrix = np.array(input_schedule, dtype=self.dtype)
         # If we only want the constraint currents at specific time indices,
         # index schedule_matrix columns using these indices
         if time_indices is not None:
             schedule_matrix = schedule_matrix[:, time_indices]
 
+        # Convert list of constraint id's to list of indices in constraint matrix
+        constraint_indices = None
+        if constraints is not None:
+            constraint_indices = [i for i in range(len(self.constraint_index)) if self.constraint_index[i] in constraints]
+
         if linear:
-            return np.abs(self.constraint_matrix[constraint_indices]@schedule_matrix).astype('complex')
+            coefficients = self._coefficients('linear', station_ids, constraint_indices)
+            return np.abs(coefficients@schedule_matrix).astype(self._complex_dtype)
         else:
-            # build vector of phase angles on EVSE
-            angle_coeffs = np.exp(1j*np.deg2rad(self._phase_angles))
-
-            # multiply schedule by angles matrix element-wise
-            phasor_schedule = (schedule_matrix.T * angle_coeffs).T
-
-            # multiply constraint matrix by current schedule, shifted by the phases
-            return self.constraint_matrix[constraint_indices]@phasor_schedule
-
-    def is_feasible(self, schedule_matrix, linear=False, violation_tolerance=None, relative_tolerance=None):
+            # Each column of the constraint matrix is shifted by the phase of its EVSE. Since the schedule is real, a
+            # real product with the stacked real and imaginary parts is much cheaper than a complex product.
+            real_imag = self._coefficients('real_imag', station_ids, constraint_indices)@schedule_matrix
+            n = real_imag.shape[0] // 2
+            return real_imag[:n] + 1j * real_imag[n:]
+
+    def is_feasible(self, schedule_matrix, linear=False, violation_tolerance=None, relative_tolerance=None,
+                    station_ids=None):
         """ Return if a set of current magnitudes for each load are feasible.
 
         For a given constraint, the larger of the violation_tolerance
@@ -304,27 +886,72 @@ class ChargingNetwork:
                 schedule_matrix may violate network constraints. Default
                 None, in which case the network's relative_tolerance
                 attribute is used.
+            station_ids (List[str]): IDs of the stations corresponding to the rows of schedule_matrix. See
+                constraint_current. Default None, in which case schedule_matrix has a row for every station in
+                station_ids.
 
         Returns:
             bool: If load_currents is feasible at time t according to this set of constraints.
         """
-        # If no violation_tolerance is specified, default to the network's violation_tolerance.
-        if violation_tolerance is None:
-            violation_tolerance = self.violation_tolerance
-        if relative_tolerance is None:
-            relative_tolerance = self.relative_tolerance
-        rel_magnitude_tol = self.magnitudes * relative_tolerance
-
         # If there are no constraints (magnitudes vector is empty) return True
         if not len(self.magnitudes):
             return True
 
-        # Calculate aggregate currents for each constraint
-        aggregate_currents = self.constraint_current(schedule_matrix, linear=linear)
+        limits, squared_limits = self._tolerance_limits(violation_tolerance, relative_tolerance)
+        schedule_matrix = np.asarray(schedule_matrix, dtype=self.dtype)
 
         # Ensure each aggregate current is less than its limit, returning False if not
-        schedule_length = schedule_matrix.shape[1]
-        return np.all(np.tile(self.magnitudes + np.maximum(violation_tolerance, rel_magnitude_tol), (schedule_length, 1)).T >= np.abs(aggregate_currents))
+        if linear:
+            aggregate_currents = self._coefficients('linear', station_ids) @ schedule_matrix
+            return bool(np.all(np.abs(aggregate_currents) <= limits[:, np.newaxis]))
+        else:
+            # Compare squared magnitudes, computed with a real matrix product, to avoid complex arithmetic and square
+            # roots.
+            real_imag = self._coefficients('real_imag', station_ids) @ schedule_matrix
+            real_imag *= real_imag
+            n = len(squared_limits)
+            return bool(np.all(real_imag[:n] + real_imag[n:] <= squared_limits[:, np.newaxis]))
+
+    def feasibility_report(self, schedule_matrix, linear=False, violation_tolerance=None, relative_tolerance=None,
+                           station_ids=None):
+        """ Return whether a schedule is feasible along with the slack of every constraint and the largest violation.
+
+        The aggregate currents are computed once, so this is cheaper than calling is_feasible followed by
+        constraint_current when the details of an infeasible schedule are needed.
+
+        Args:
+            schedule_matrix (np.Array): 2-D matrix with each row corresponding to an EVSE and each
+                column corresponding to a time index in the schedule.
+            linear (bool): See is_feasible.
+            violation_tolerance (float): See is_feasible.
+            relative_tolerance (float): See is_feasible.
+            station_ids (List[str]): See is_feasible.
+
+        Returns:
+            FeasibilityReport: Named tuple with fields feasible, slack, max_violation, max_violation_constraint and
+                max_violation_time. See FeasibilityReport.
+        """
+        schedule_matrix = np.asarray(schedule_matrix, dtype=self.dtype)
+        limits, squared_limits = self._tolerance_limits(violation_tolerance, relative_tolerance)
+
+        # Calculate aggregate currents for each constraint
+        if linear:
+            magnitudes = np.abs(self._coefficients('linear', station_ids) @ schedule_matrix)
+            feasible = bool(np.all(magnitudes <= limits[:, np.newaxis]))
+        else:
+            real_imag = self._coefficients('real_imag', station_ids) @ schedule_matrix
+            real_imag *= real_imag
+            n = len(squared_limits)
+            squared_magnitudes = real_imag[:n] + real_imag[n:]
+            feasible = bool(np.all(squared_magnitudes <= squared_limits[:, np.newaxis]))
+            magnitudes = np.sqrt(squared_magnitudes)
+        slack = limits[:, np.newaxis] - magnitudes
+        # If there are no constraints (magnitudes vector is empty) there is no violation to report
+        if not slack.size:
+            return FeasibilityReport(feasible, slack, None, None, None)
+        constraint_idx, time_idx = np.unravel_index(np.argmin(slack), slack.shape)
+        return FeasibilityReport(feasible, slack, -slack[constraint_idx, time_idx],
+                                 self.constraint_index[constraint_idx], int(time_idx))
 
 
 class StationOccupiedError(Exception):
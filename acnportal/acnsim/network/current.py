@@ -1,5 +1,6 @@
 import cmath
 import math
+import numbers
 from copy import deepcopy
 import numpy as np
 import pandas as pd
@@ -41,6 +42,9 @@ class Current(pd.Series):
         Raises:
             TypeError: Raised if other is not of type Current.
         """
+        if isinstance(other, SparseCurrent):
+            # Let SparseCurrent handle mixed sums, so the result does not depend on the order of the operands.
+            return NotImplemented
         if isinstance(other, Current):
             return Current(self.add(other, fill_value=0))
         else:
@@ -57,4 +61,123 @@ class Current(pd.Series):
         Returns:
             Current: self - other
         """
-        return Current(self.add(-1 * other, fill_value=0))
\ No newline at end of file
+        if isinstance(other, SparseCurrent):
+            return NotImplemented
+        return Current(self.add(-1 * other, fill_value=0))
+
+
+class SparseCurrent:
+    """ A lightweight representation of currents as a sparse linear combination of loads backed by a dict.
+
+    SparseCurrent supports the same constructor forms and operators as Current (addition, subtraction, and
+    multiplication by a scalar), but does not go through pandas index alignment, so building up the aggregate currents
+    of a large network is much faster. ChargingNetwork.add_constraint accepts either type.
+
+    Adding or subtracting a SparseCurrent and a Current in either order returns a SparseCurrent. The number 0 is
+    treated as an empty current, so that 0 - current and sum(currents) work.
+
+    Attributes:
+        loads (Dict[str, number]): Dictionary which maps a load_id to its coefficient in the aggregate current.
+        name (str): Name of the constraint this current was added to the network under, if any.
+
+    Args:
+        loads (Dict[str, number], str, List[str], pd.Series, or SparseCurrent): If dict, a dictionary mapping load_ids
+            to coefficients. If str a load_id. If list, a list of load_ids. If a pd.Series (including Current) or
+            SparseCurrent, its load_ids and coefficients are copied. Default None. If None, loads will begin as an empty
+            dict.
+    """
+    def __init__(self, loads=None):
+        if isinstance(loads, dict):
+            self.loads = dict(loads)
+        elif isinstance(loads, str):
+            self.loads = {loads: 1}
+        elif isinstance(loads, (pd.Series, SparseCurrent)):
+            self.loads = dict(loads.items())
+        elif loads is None:
+            self.loads = {}
+        elif all(isinstance(l, str) for l in loads):
+            self.loads = {load_id: 1 for load_id in loads}
+        else:
+            raise TypeError("Variable loads should be of type dict, str, pd.Series, SparseCurrent, or Lst[str].")
+        self.name = None
+
+    @property
+    def index(self):
+        """ Return the load_ids included in this current. (List[str]) """
+        return list(self.loads)
+
+    def items(self):
+        """ Return an iterable of (load_id, coefficient) pairs, in the same form as pd.Series.items. """
+        return self.loads.items()
+
+    def __getitem__(self, load_id):
+        return self.loads[load_id]
+
+    def __len__(self):
+        return len(self.loads)
+
+    def __repr__(self):
+        return 'SparseCurrent({0})'.format(self.loads)
+
+    def __add__(self, other):
+        """ Return new SparseCurrent which is the sum of self and other.
+
+        Args:
+            other (SparseCurrent, Current or 0): Current to be added to self.
+        Returns:
+            SparseCurrent: self + other
+        Raises:
+            TypeError: Raised if other is not of type SparseCurrent or Current, or 0.
+        """
+        other = self._as_current(other)
+        loads = dict(self.loads)
+        for load_id, coefficient in other.items():
+            loads[load_id] = loads[load_id] + coefficient if load_id in loads else coefficient
+        return SparseCurrent(loads)
+
+    def __radd__(self, other):
+        """ Return new SparseCurrent which is the sum of other and self. See __add__. """
+        other = self._as_current(other)
+        return SparseCurrent(other) + self
+
+    def __sub__(self, other):
+        """ Return SparseCurrent which is self minus other.
+
+        Args:
+            other (SparseCurrent, Current or 0): Current to be subtracted from self.
+        Returns:
+            SparseCurrent: self - other
+        Raises:
+            TypeError: Raised if other is not of type SparseCurrent or Current, or 0.
+        """
+        other = self._as_current(other)
+        return self + -1 * SparseCurrent(other)
+
+    def __rsub__(self, other):
+        """ Return SparseCurrent which is other minus self. See __sub__. """
+        other = self._as_current(other)
+        return SparseCurrent(other) + -1 * self
+
+    @staticmethod
+    def _as_current(other):
+        """ Return other as an operand of addition or subtraction, raising TypeError if it is not a current or 0. """
+        if isinstance(other, (SparseCurrent, Current)):
+            return other
+        if isinstance(other, numbers.Real) and other == 0:
+            return SparseCurrent()
+        raise TypeError("Must be of type SparseCurrent or Current.")
+
+    def __neg__(self):
+        return -1 * self
+
+    def __mul__(self, other):
+        """ Return SparseCurrent which is self with each coefficient multiplied by the scalar other.
+
+        Args:
+            other (number): Scalar to multiply each coefficient by.
+        Returns:
+            SparseCurrent: self * other
+        """
+        return SparseCurrent({load_id: coefficient * other for load_id, coefficient in self.loads.items()})
+
+    __rmul__ = __mul__
@@ -0,0 +1,120 @@
+import numpy as np
+
+
+class FeasibilityOracle:
+    """ Stateful feasibility checker for a charging schedule which is built up one station at a time.
+
+    The oracle keeps the aggregate current of every constraint for the schedule it was created with. Changing the
+    rate of a single station then only updates the aggregate currents by the corresponding column of the constraint
+    matrix, so each query costs O(number of constraints) instead of rebuilding the full schedule and multiplying it by
+    the whole constraint matrix.
+
+    For a given constraint, the larger of the violation_tolerance and relative_tolerance is used to evaluate
+    feasibility, exactly as in ChargingNetwork.is_feasible.
+
+    Args:
+        network (ChargingNetwork): The charging network whose constraints should be enforced.
+        schedule_matrix (np.Array): 2-D matrix with each row corresponding to an EVSE and each column corresponding to
+            a time index in the schedule. If None, the schedule starts with all rates equal to 0. Default None.
+        schedule_length (int): Number of time indices in the schedule if schedule_matrix is None. Default 1.
+        linear (bool): If True, linearize all constraints to a more conservative but easier to compute constraint by
+            ignoring the phase angle and taking the absolute value of all load coefficients. Default False.
+        violation_tolerance (float): Absolute amount by which the schedule may violate network constraints. Default
+            None, in which case the network's violation_tolerance attribute is used.
+        relative_tolerance (float): Relative amount by which the schedule may violate network constraints. Default
+            None, in which case the network's relative_tolerance attribute is used.
+    """
+
+    def __init__(self, network, schedule_matrix=None, schedule_length=1, linear=False, violation_tolerance=None,
+                 relative_tolerance=None):
+        self._index = network._station_views()['index']
+        if schedule_matrix is None:
+            self._rates = np.zeros((len(self._index), schedule_length), dtype=network.dtype)
+        else:
+            self._rates = np.array(schedule_matrix, dtype=network.dtype)
+
+        constraint_views = network._constraint_views()
+        self._coefficients = constraint_views['linear_matrix' if linear else 'phasor_matrix']
+        # Columns of a CSR matrix are slow to extract, so keep a CSC copy for per-station updates.
+        self._columns = self._coefficients.tocsc() if constraint_views['sparse'] else None
+        self._limits = network._tolerance_limits(violation_tolerance, relative_tolerance)[0]
+        self._aggregate = np.asarray(self._coefficients @ self._rates)
+
+    @property
+    def aggregate_currents(self):
+        """ Return the aggregate current of each constraint for the current schedule.
+
+        Returns:
+            np.Array: Matrix with a row per constraint and a column per time index.
+        """
+        return self._aggregate.copy()
+
+    def rate(self, station_id, time=0):
+        """ Return the rate currently assigned to a station.
+
+        Args:
+            station_id (str): ID of the station.
+            time (int): Time index of the rate. Default 0.
+
+        Returns:
+            float: The rate of the station at the given time. [A]
+        """
+        return self._rates[self._index[station_id], time]
+
+    def set_rate(self, station_id, rate, time=0):
+        """ Assign a new rate to a station, updating the aggregate currents of all constraints.
+
+        Args:
+            station_id (str): ID of the station.
+            rate (float): New rate for the station. [A]
+            time (int): Time index of the rate. Default 0.
+
+        Returns:
+            None
+        """
+        i = self._index[station_id]
+        rows, coefficients = self._column(i)
+        self._aggregate[rows, time] += coefficients * (rate - self._rates[i, time])
+        self._rates[i, time] = rate
+
+    def is_feasible(self):
+        """ Return if the current schedule is feasible.
+
+        Returns:
+            bool: True if the aggregate current of every constraint is within its limit at every time index.
+        """
+        return bool(np.all(np.abs(self._aggregate) <= self._limits[:, np.newaxis]))
+
+    def is_feasible_with(self, station_id, rate, time=0):
+        """ Return if the schedule would be feasible if station_id were assigned rate, without changing the schedule.
+
+        Only the given time index is checked, since the rest of the schedule is unaffected by the change.
+
+        Args:
+            station_id (str): ID of the station.
+            rate (float): Proposed rate for the station. [A]
+            time (int): Time index of the rate. Default 0.
+
+        Returns:
+            bool: True if the aggregate current of every constraint would be within its limit at the given time.
+        """
+        i = self._index[station_id]
+        rows, coefficients = self._column(i)
+        aggregate = self._aggregate[:, time].copy()
+        aggregate[rows] += coefficients * (rate - self._rates[i, time])
+        return bool(np.all(np.abs(aggregate) <= self._limits))
+
+    def _column(self, i):
+        """ Return the rows and values of the constraint coefficients of the station with index i.
+
+        Args:
+            i (int): Index of the station in the network.
+
+        Returns:
+            Tuple[slice or np.Array, np.Array]: Index into the rows of the aggregate currents and the coefficients of
+                those rows. For sparse networks only the rows with nonzero coefficients are included.
+        """
+        if self._columns is None:
+            return slice(None), self._coefficients[:, i]
+        start, end = self._columns.indptr[i], self._columns.indptr[i + 1]
+        return self._columns.indices[start:end], self._columns.data[start:end]
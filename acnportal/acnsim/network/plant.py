@@ -0,0 +1,317 @@
+import numpy as np
+
+from ..models.battery import Battery, Linear2StageBattery
+from ..models.ev import EV
+from ..models.evse import EVSE, DeadbandEVSE, FiniteRatesEVSE, InvalidRateError
+
+# Codes describing how the charging of the EV at each station is computed.
+_EMPTY = 0
+_BATTERY = 1
+_TWO_STAGE = 2
+_FALLBACK = 3
+
+# Codes describing how pilots are validated at each station.
+_RANGE = 0
+_DEADBAND = 1
+_FINITE = 2
+_CUSTOM = 3
+
+
+class VectorizedPlant:
+    """ Array-backed engine which advances all EVs attached to a ChargingNetwork in a single vectorized step.
+
+    The state of each attached EV and its battery (charge, capacity, max power, energy delivered and current charging
+    rate) is held in NumPy arrays indexed by station. Each call to step then validates the pilots of every EVSE and
+    charges every Battery and Linear2StageBattery at once, writing the results back to the EV and battery objects so
+    the rest of the simulation sees the same state as with per-object dispatch.
+
+    Stations whose EVSE overrides set_pilot, whose EV overrides charge, or whose battery is not one of the built-in
+    battery models fall back to the usual per-object calls.
+
+    The arrays are loaded from the EV objects when they are plugged in through the network. Changing the state of an
+    attached EV or battery directly (e.g. by calling reset) requires a call to sync to be reflected in the plant.
+
+    Args:
+        network (ChargingNetwork): The charging network whose EVSEs should be advanced by this plant.
+    """
+
+    def __init__(self, network):
+        self._network = network
+        self._stale = True
+
+    def invalidate(self):
+        """ Mark the static arrays of the plant as out of date, e.g. after a new EVSE is registered.
+
+        Returns:
+            None
+        """
+        self._stale = True
+
+    def sync(self):
+        """ Reload the state of all attached EVs and batteries from the underlying objects.
+
+        Returns:
+            None
+        """
+        self._build()
+
+    @property
+    def charging_rates(self):
+        """ Return the actual charging rate of each EVSE in the order of the network's station_ids. [A]
+
+        Returns:
+            np.Array: numpy ndarray of actual charging rates of all EVSEs in the network.
+        """
+        self._ensure_built()
+        return self._rate.copy()
+
+    def plugin(self, station_id):
+        """ Load the state of the EV newly attached to station_id into the plant.
+
+        Args:
+            station_id (str): ID of the EVSE.
+
+        Returns:
+            None
+        """
+        if self._stale:
+            return
+        self._load(self._index[station_id])
+
+    def unplug(self, station_id):
+        """ Clear the state of the EV detached from station_id.
+
+        Args:
+            station_id (str): ID of the EVSE.
+
+        Returns:
+            None
+        """
+        if self._stale:
+            return
+        i = self._index[station_id]
+        self._load(i)
+        self._last_pilot[i] = 0
+
+    def step(self, pilots, voltages, period):
+        """ Apply new pilot signals to every EVSE and charge all attached EVs for one period.
+
+        Args:
+            pilots (np.Array): Pilot signal for each EVSE in the order of the network's station_ids. [A]
+            voltages (np.Array): Voltage feeding each EVSE. [V]
+            period (float): Length of the charging period. [minutes]
+
+        Returns:
+            None
+
+        Raises:
+            InvalidRateError: Exception raised when a pilot is not allowed by its EVSE.
+            ValueError: Raised if the voltage of an occupied EVSE or the period is <= 0.
+        """
+        self._ensure_built()
+        pilots = np.asarray(pilots, dtype=float)
+        self._validate(pilots)
+
+        # Record the new pilots on the EVSE objects. Only stations whose pilot changed need to be touched.
+        changed = np.flatnonzero((pilots != self._last_pilot) & self._vector_evse)
+        evses = self._evses
+        for i in changed:
+            evses[i]._current_pilot = pilots[i]
+        self._last_pilot[changed] = pilots[changed]
+
+        battery_idx = np.flatnonzero(self._kind == _BATTERY)
+        two_stage_idx = np.flatnonzero(self._kind == _TWO_STAGE)
+        if len(battery_idx) or len(two_stage_idx):
+            occupied = np.concatenate((battery_idx, two_stage_idx))
+            if np.any(voltages[occupied] <= 0):
+                raise ValueError('Voltage must be greater than 0. Got {0}'.format(
+                    voltages[occupied][voltages[occupied] <= 0][0]))
+            if period <= 0:
+                raise ValueError('period must be greater than 0. Got {0}'.format(period))
+            if len(battery_idx):
+                self._charge_battery(battery_idx, pilots, voltages, period)
+            if len(two_stage_idx):
+                self._charge_two_stage(two_stage_idx, pilots, voltages, period)
+            self._write_back(occupied)
+
+        for i in self._fallback:
+            evse = evses[i]
+            if self._vector_evse[i]:
+                if evse.ev is not None:
+                    evse.ev.charge(pilots[i], voltages[i], period)
+            else:
+                evse.set_pilot(pilots[i], voltages[i], period)
+            self._rate[i] = evse.ev.current_charging_rate if evse.ev is not None else 0
+
+    def _charge_battery(self, idx, pilots, voltages, period):
+        """ Vectorized equivalent of Battery.charge followed by the bookkeeping of EV.charge. """
+        rate_to_full = (self._capacity[idx] - self._charge[idx]) / (period / 60)
+        pilot_power = pilots[idx] * voltages[idx] / 1000
+        charge_power = np.minimum(np.minimum(pilot_power, self._max_power[idx]), rate_to_full)
+        self._apply_power(idx, charge_power, voltages, period)
+
+    def _charge_two_stage(self, idx, pilots, voltages, period):
+        """ Vectorized equivalent of Linear2StageBattery.charge followed by the bookkeeping of EV.charge. """
+        capacity = self._capacity[idx]
+        charge = self._charge[idx]
+        max_power = self._max_power[idx]
+        transition_soc = self._transition_soc[idx]
+        noise_level = self._noise_level[idx]
+
+        rate_to_full = (capacity - charge) / (period / 60)
+        pilot_power = pilots[idx] * voltages[idx] / 1000
+        soc = charge / capacity
+        bulk = soc < transition_soc
+        with np.errstate(divide='ignore', invalid='ignore'):
+            absorption_power = (1 - soc) / (1 - transition_soc) * max_power
+        charge_power = np.minimum(np.minimum(pilot_power, np.where(bulk, max_power, absorption_power)), rate_to_full)
+
+        noisy = noise_level > 0
+        if np.any(noisy):
+            # Draw noise in station order, the same order in which per-object dispatch would draw it.
+            noise = np.random.normal(0, noise_level[noisy])
+            noisy_power = charge_power[noisy]
+            noisy_bulk = bulk[noisy]
+            noisy_power = np.where(noisy_bulk, noisy_power - np.abs(noise), noisy_power + noise)
+            clamped = np.minimum(np.minimum(np.minimum(noisy_power, pilot_power[noisy]), max_power[noisy]),
+                                 rate_to_full[noisy])
+            charge_power[noisy] = np.where(noisy_bulk, noisy_power, clamped)
+        self._apply_power(idx, charge_power, voltages, period)
+
+    def _apply_power(self, idx, charge_power, voltages, period):
+        """ Update battery and EV state arrays given the charging power of each battery in idx. [kW] """
+        self._charge[idx] += charge_power * (period / 60)
+        self._power[idx] = charge_power
+        rate = charge_power * 1000 / voltages[idx]
+        self._energy[idx] += (rate * voltages[idx]) / 1000 * (period / 60)
+        self._rate[idx] = rate
+
+    def _write_back(self, idx):
+        """ Copy the state of the plant back into the EV and battery objects attached to the stations in idx. """
+        evs = self._evs
+        batteries = self._batteries
+        charge = self._charge
+        power = self._power
+        energy = self._energy
+        rate = self._rate
+        for i in idx:
+            battery = batteries[i]
+            battery._current_charge = charge[i]
+            battery._current_charging_power = power[i]
+            ev = evs[i]
+            ev._energy_delivered = energy[i]
+            ev._current_charging_rate = rate[i]
+
+    def _validate(self, pilots):
+        """ Raise InvalidRateError for the first station (in network order) whose pilot is not allowed. """
+        valid = np.ones(len(pilots), dtype=bool)
+        kinds = self._validator
+        rng = kinds == _RANGE
+        valid[rng] = (self._min_rate[rng] <= pilots[rng]) & (pilots[rng] <= self._max_rate[rng])
+        deadband = kinds == _DEADBAND
+        # Mirrors DeadbandEVSE._valid_rate, which passes its tolerance to np.isclose positionally.
+        valid[deadband] = np.isclose(pilots[deadband], 0, 1e-3) | (pilots[deadband] > self._deadband_end[deadband])
+        if len(self._finite_idx):
+            finite_pilots = pilots[self._finite_idx][:, np.newaxis]
+            valid[self._finite_idx] = np.any(np.isclose(finite_pilots, self._finite_rates, atol=1e-3), axis=1)
+        for i in self._custom_validator:
+            valid[i] = self._evses[i]._valid_rate(pilots[i])
+        if not np.all(valid):
+            i = np.flatnonzero(~valid)[0]
+            raise InvalidRateError('Pilot {0} A is not valid for for station {1}'.format(pilots[i],
+                                                                                       self._evses[i].station_id))
+
+    def _ensure_built(self):
+        if self._stale:
+            self._build()
+
+    def _build(self):
+        """ Rebuild the static per-station arrays and reload the state of all attached EVs. """
+        evses = list(self._network._EVSEs.values())
+        n = len(evses)
+        self._evses = evses
+        self._index = {evse.station_id: i for i, evse in enumerate(evses)}
+
+        self._vector_evse = np.array([type(evse).set_pilot is EVSE.set_pilot for evse in evses], dtype=bool)
+        self._validator = np.full(n, _CUSTOM)
+        self._min_rate = np.zeros(n)
+        self._max_rate = np.zeros(n)
+        self._deadband_end = np.zeros(n)
+        finite_idx = []
+        finite_rates = []
+        for i, evse in enumerate(evses):
+            if not self._vector_evse[i]:
+                continue
+            validator = type(evse)._valid_rate
+            if validator is EVSE._valid_rate:
+                self._validator[i] = _RANGE
+                self._min_rate[i] = evse.min_rate
+                self._max_rate[i] = evse.max_rate
+            elif validator is DeadbandEVSE._valid_rate:
+                self._validator[i] = _DEADBAND
+                self._deadband_end[i] = evse._deadband_end
+            elif validator is FiniteRatesEVSE._valid_rate:
+                self._validator[i] = _FINITE
+                finite_idx.append(i)
+                finite_rates.append(evse.allowable_rates)
+        self._custom_validator = [i for i in range(n) if self._vector_evse[i] and self._validator[i] == _CUSTOM]
+        self._finite_idx = np.array(finite_idx, dtype=int)
+        # Pad the allowable rate sets with NaN, which is never close to any pilot.
+        width = max((len(rates) for rates in finite_rates), default=0)
+        self._finite_rates = np.full((len(finite_rates), width), np.nan)
+        for row, rates in enumerate(finite_rates):
+            self._finite_rates[row, :len(rates)] = rates
+
+        self._last_pilot = np.array([evse.current_pilot for evse in evses], dtype=float)
+        self._kind = np.full(n, _EMPTY)
+        self._evs = [None] * n
+        self._batteries = [None] * n
+        self._capacity = np.zeros(n)
+        self._charge = np.zeros(n)
+        self._max_power = np.zeros(n)
+        self._power = np.zeros(n)
+        self._transition_soc = np.zeros(n)
+        self._noise_level = np.zeros(n)
+        self._energy = np.zeros(n)
+        self._rate = np.zeros(n)
+        self._fallback = []
+        self._stale = False
+        for i in range(n):
+            self._load(i)
+
+    def _load(self, i):
+        """ Load the state of the EV currently attached to station i (if any) into the plant arrays. """
+        evse = self._evses[i]
+        ev = evse.ev
+        self._evs[i] = ev
+        if i in self._fallback:
+            self._fallback.remove(i)
+        if ev is None:
+            self._kind[i] = _EMPTY
+            self._batteries[i] = None
+            self._rate[i] = 0
+            if not self._vector_evse[i]:
+                self._fallback.append(i)
+                self._fallback.sort()
+            return
+
+        battery = getattr(ev, '_battery', None)
+        battery_charge = type(battery).charge if battery is not None else None
+        if not self._vector_evse[i] or type(ev).charge is not EV.charge or \
+                battery_charge not in (Battery.charge, Linear2StageBattery.charge):
+            self._kind[i] = _FALLBACK
+            self._batteries[i] = None
+            self._fallback.append(i)
+            self._fallback.sort()
+        else:
+            self._kind[i] = _BATTERY if battery_charge is Battery.charge else _TWO_STAGE
+            self._batteries[i] = battery
+            self._capacity[i] = battery._capacity
+            self._charge[i] = battery._current_charge
+            self._max_power[i] = battery._max_power
+            self._power[i] = battery._current_charging_power
+            if self._kind[i] == _TWO_STAGE:
+                self._transition_soc[i] = battery._transition_soc
+                self._noise_level[i] = battery._noise_level
+            self._energy[i] = ev.energy_delivered
+        self._rate[i] = ev.current_charging_rate
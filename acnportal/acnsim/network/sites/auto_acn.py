@@ -1,5 +1,5 @@
-from .. import ChargingNetwork
-from .. current import Current
+from .. import ChargingNetwork, NetworkBuilder
+from .. current import SparseCurrent
 from ...models.evse import get_evse_by_type
 
 
@@ -16,13 +16,13 @@ def simple_acn(station_ids, evse_type='BASIC', voltage=208, aggregate_cap=150, n
     Returns:
         ChargingNetwork: A ChargingNetwork-like object configured with the EVSEs and constraints of the Caltech ACN.
     """
-    network = network_type()
+    builder = NetworkBuilder(network_type())
     for evse_id in station_ids:
-        network.register_evse(get_evse_by_type(evse_id, evse_type), voltage, 0)
-    agg = Current(station_ids)
+        builder.register_evse(get_evse_by_type(evse_id, evse_type), voltage, 0)
+    agg = SparseCurrent(station_ids)
 
     # Build constraint set
     current_cap = (aggregate_cap / voltage) * 1000
-    network.add_constraint(agg, current_cap, name='Aggregate Current')
+    builder.add_constraint(agg, current_cap, name='Aggregate Current')
 
-    return network
+    return builder.build()
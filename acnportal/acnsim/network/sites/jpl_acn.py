@@ -1,23 +1,23 @@
-from .. import ChargingNetwork
-from .. current import Current
+from .. import ChargingNetwork, NetworkBuilder
+from .. current import SparseCurrent
 from ...models.evse import get_evse_by_type
 import numpy as np
 
 
-def _register_evses(network, evse_ids, evse_type, voltage, angle):
+def _register_evses(builder, evse_ids, evse_type, voltage, angle):
     for evse_id in evse_ids:
-        network.register_evse(get_evse_by_type(evse_id, evse_type), voltage, angle)
+        builder.register_evse(get_evse_by_type(evse_id, evse_type), voltage, angle)
 
 
-def _add_line2line_evses(network, ab, bc, ca, voltage, evse_type, phi_ab=30, phi_bc=-90, phi_ca=150):
-    _register_evses(network, ab, evse_type, voltage, phi_ab)
-    _register_evses(network, bc, evse_type, voltage, phi_bc)
-    _register_evses(network, ca, evse_type, voltage, phi_ca)
+def _add_line2line_evses(builder, ab, bc, ca, voltage, evse_type, phi_ab=30, phi_bc=-90, phi_ca=150):
+    _register_evses(builder, ab, evse_type, voltage, phi_ab)
+    _register_evses(builder, bc, evse_type, voltage, phi_bc)
+    _register_evses(builder, ca, evse_type, voltage, phi_ca)
 
     currents = {}
-    currents['ab'] = Current(ab)
-    currents['bc'] = Current(bc)
-    currents['ca'] = Current(ca)
+    currents['ab'] = SparseCurrent(ab)
+    currents['bc'] = SparseCurrent(bc)
+    currents['ca'] = SparseCurrent(ca)
 
     currents['a'] = currents['ab'] - currents['ca']
     currents['b'] = currents['bc'] - currents['ab']
@@ -41,7 +41,7 @@ def jpl_acn(basic_evse=False, voltage=208, first_transformer_cap=45, third_fourt
     Returns:
         ChargingNetwork: A ChargingNetwork-like object configured with the EVSEs and constraints of the JPL ACN.
     """
-    network = network_type()
+    builder = NetworkBuilder(network_type())
 
     if basic_evse:
         evse_type = 'BASIC'
@@ -55,26 +55,26 @@ def jpl_acn(basic_evse=False, voltage=208, first_transformer_cap=45, third_fourt
 
         primary_side_constr = cap * 1000 / 3 / secondary_voltage * np.sqrt(3)
         secondary_side_constr = cap * 1000 / 3 / secondary_voltage
-        network.add_constraint(Isec['a'], secondary_side_constr, name='{0} Secondary A'.format(name))
-        network.add_constraint(Isec['b'], secondary_side_constr, name='{0} Secondary B'.format(name))
-        network.add_constraint(Isec['c'], secondary_side_constr, name='{0} Secondary C'.format(name))
-        network.add_constraint(Ipa, primary_side_constr, name='{0} Primary A'.format(name))
-        network.add_constraint(Ipb, primary_side_constr, name='{0} Primary B'.format(name))
-        network.add_constraint(Ipc, primary_side_constr, name='{0} Primary C'.format(name))
+        builder.add_constraint(Isec['a'], secondary_side_constr, name='{0} Secondary A'.format(name))
+        builder.add_constraint(Isec['b'], secondary_side_constr, name='{0} Secondary B'.format(name))
+        builder.add_constraint(Isec['c'], secondary_side_constr, name='{0} Secondary C'.format(name))
+        builder.add_constraint(Ipa, primary_side_constr, name='{0} Primary A'.format(name))
+        builder.add_constraint(Ipb, primary_side_constr, name='{0} Primary B'.format(name))
+        builder.add_constraint(Ipc, primary_side_constr, name='{0} Primary C'.format(name))
 
     # -------- 1st Floor 45 kW Transformer -----------------
     # Sub-panel 1 (Max 100 A / phase)
-    first_floor_sp1 = _add_line2line_evses(network, ['AG-1F12', 'AG-1F14'],
+    first_floor_sp1 = _add_line2line_evses(builder, ['AG-1F12', 'AG-1F14'],
                                                     [],
                                                     ['AG-1F11', 'AG-1F13'], voltage, evse_type)
 
     # Sub-panel 2 (Max 100 A / phase)
-    first_floor_sp2 = _add_line2line_evses(network, ['AG-1F03', 'AG-1F06'],
+    first_floor_sp2 = _add_line2line_evses(builder, ['AG-1F03', 'AG-1F06'],
                                                     ['AG-1F01', 'AG-1F04'],
                                                     ['AG-1F02', 'AG-1F05'], voltage, evse_type)
 
     # Additional EVSEs on main panel
-    add_first_floor = _add_line2line_evses(network, ['AG-1F10'],
+    add_first_floor = _add_line2line_evses(builder, ['AG-1F10'],
                                                     ['AG-1F07', 'AG-1F09'],
                                                     ['AG-1F08'], voltage, evse_type)
     first_floor_transformer = dict()
@@ -84,14 +84,14 @@ def jpl_acn(basic_evse=False, voltage=208, first_transformer_cap=45, third_fourt
     # -------- 3rd and 4th Floors 150 kW Transformer -----------------
 
     # 3rd Floor (Max 225 A / phase)
-    third_floor_panel = _add_line2line_evses(network,
+    third_floor_panel = _add_line2line_evses(builder,
                              ['AG-3F16', 'AG-3F17', 'AG-3F20', 'AG-3F23', 'AG-3F25', 'AG-3F26', 'AG-3F29', 'AG-3F33'],
                              ['AG-3F18', 'AG-3F21', 'AG-3F27', 'AG-3F30', 'AG-3F31'],
                              ['AG-3F15', 'AG-3F19', 'AG-3F22', 'AG-3F24', 'AG-3F28', 'AG-3F32'],
                              voltage, evse_type)
 
     # 4th Floor (Max 225 A / phase)
-    fourth_floor_panel = _add_line2line_evses(network,
+    fourth_floor_panel = _add_line2line_evses(builder,
                              ['AG-4F35', 'AG-4F36', 'AG-4F39', 'AG-4F42', 'AG-4F44', 'AG-4F45', 'AG-4F48', 'AG-4F52'],
                              ['AG-4F37', 'AG-4F40', 'AG-4F46', 'AG-4F49', 'AG-4F50'],
                              ['AG-4F34', 'AG-4F38', 'AG-4F41', 'AG-4F43', 'AG-4F47', 'AG-4F51'],
@@ -102,13 +102,13 @@ def jpl_acn(basic_evse=False, voltage=208, first_transformer_cap=45, third_fourt
     # ------ Add Constraints -----------------
     # Line Constraints
     for p in 'abc':
-        network.add_constraint(first_floor_sp1[p], 100, name='First Floor SP1 I_{0}'.format(p))
-        network.add_constraint(first_floor_sp2[p], 100, name='First Floor SP2 I_{0}'.format(p))
-        network.add_constraint(third_floor_panel[p], 225, name='Third Floor Panel I_{0}'.format(p))
-        network.add_constraint(fourth_floor_panel[p], 225, name='Fourth Floor Panel I_{0}'.format(p))
+        builder.add_constraint(first_floor_sp1[p], 100, name='First Floor SP1 I_{0}'.format(p))
+        builder.add_constraint(first_floor_sp2[p], 100, name='First Floor SP2 I_{0}'.format(p))
+        builder.add_constraint(third_floor_panel[p], 225, name='Third Floor Panel I_{0}'.format(p))
+        builder.add_constraint(fourth_floor_panel[p], 225, name='Fourth Floor Panel I_{0}'.format(p))
 
     # Transformer Constraints
     _delta_wye_transformer('First Floor Transformer', first_floor_transformer, first_transformer_cap)
     _delta_wye_transformer('Third/Fourth Floor Transformer', third_fourth_transformer, third_fourth_transformer_cap)
         
-    return network
+    return builder.build()
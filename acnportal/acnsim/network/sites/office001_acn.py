@@ -1,5 +1,5 @@
-from .. import ChargingNetwork
-from .. current import Current
+from .. import ChargingNetwork, NetworkBuilder
+from .. current import SparseCurrent
 from ...models.evse import get_evse_by_type
 
 
@@ -16,7 +16,7 @@ def office001_acn(basic_evse=False, voltage=208, transformer_cap=50, network_typ
     Returns:
         ChargingNetwork: A ChargingNetwork-like object configured with the EVSEs and constraints of the Office 1 ACN.
     """
-    network = network_type()
+    builder = NetworkBuilder(network_type())
 
     if basic_evse:
         evse_type = 'BASIC'
@@ -30,16 +30,16 @@ def office001_acn(basic_evse=False, voltage=208, transformer_cap=50, network_typ
 
     # Add EVSEs
     for evse_id in AB_ids:
-        network.register_evse(get_evse_by_type(evse_id, evse_type), voltage, 30)
+        builder.register_evse(get_evse_by_type(evse_id, evse_type), voltage, 30)
     for evse_id in BC_ids:
-        network.register_evse(get_evse_by_type(evse_id, evse_type), voltage, -90)
+        builder.register_evse(get_evse_by_type(evse_id, evse_type), voltage, -90)
     for evse_id in CA_ids:
-        network.register_evse(get_evse_by_type(evse_id, evse_type), voltage, 150)
+        builder.register_evse(get_evse_by_type(evse_id, evse_type), voltage, 150)
 
     # Define currents
-    AB = Current(AB_ids)
-    BC = Current(BC_ids)
-    CA = Current(CA_ids)
+    AB = SparseCurrent(AB_ids)
+    BC = SparseCurrent(BC_ids)
+    CA = SparseCurrent(CA_ids)
 
     # Define intermediate currents
     I3a = AB - CA
@@ -52,11 +52,11 @@ def office001_acn(basic_evse=False, voltage=208, transformer_cap=50, network_typ
     # Build constraint set
     primary_side_constr = transformer_cap * 1000 / 3 / 277
     secondary_side_constr = transformer_cap * 1000 / 3 / 120
-    network.add_constraint(I3a, secondary_side_constr, name='Secondary A')
-    network.add_constraint(I3b, secondary_side_constr, name='Secondary B')
-    network.add_constraint(I3c, secondary_side_constr, name='Secondary C')
-    network.add_constraint(I2a, primary_side_constr, name='Primary A')
-    network.add_constraint(I2b, primary_side_constr, name='Primary B')
-    network.add_constraint(I2c, primary_side_constr, name='Primary C')
-
-    return network
+    builder.add_constraint(I3a, secondary_side_constr, name='Secondary A')
+    builder.add_constraint(I3b, secondary_side_constr, name='Secondary B')
+    builder.add_constraint(I3c, secondary_side_constr, name='Secondary C')
+    builder.add_constraint(I2a, primary_side_constr, name='Primary A')
+    builder.add_constraint(I2b, primary_side_constr, name='Primary B')
+    builder.add_constraint(I2c, primary_side_constr, name='Primary C')
+
+    return builder.build()
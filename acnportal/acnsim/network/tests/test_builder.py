@@ -0,0 +1,112 @@
+from unittest import TestCase
+
+import numpy as np
+
+from acnportal.acnsim import ChargingNetwork, Current, SparseCurrent, NetworkBuilder
+from acnportal.acnsim.network.sites import caltech_acn
+from acnportal.acnsim.models import EVSE
+
+
+class TestNetworkBuilder(TestCase):
+    def _add_all(self, target):
+        target.register_evse(EVSE('PS-001'), 240, 0)
+        target.register_evse(EVSE('PS-002'), 208, 30)
+        target.add_constraint(Current({'PS-001': 0.25, 'PS-002': 0.5}), 50, name='first_constraint')
+        target.register_evse(EVSE('PS-003'), 240, -90)
+        target.add_constraint(Current(['PS-003', 'PS-001']), 10)
+
+    def test_matches_sequential_network(self):
+        expected = ChargingNetwork()
+        self._add_all(expected)
+        builder = NetworkBuilder(ChargingNetwork())
+        self._add_all(builder)
+        network = builder.build()
+        self.assertIs(network, builder.network)
+        self.assertEqual(network.station_ids, expected.station_ids)
+        self.assertEqual(network.constraint_index, ['first_constraint', '_const_1'])
+        np.testing.assert_array_equal(network.constraint_matrix, np.array([[0.25, 0.5, 0], [1, 0, 1]]))
+        np.testing.assert_array_equal(network.constraint_matrix, expected.constraint_matrix)
+        np.testing.assert_array_equal(network.magnitudes, expected.magnitudes)
+        np.testing.assert_array_equal(network.voltages, expected.voltages)
+        np.testing.assert_array_equal(network.phase_angles, expected.phase_angles)
+
+    def test_nothing_added_before_build(self):
+        builder = NetworkBuilder(ChargingNetwork())
+        self._add_all(builder)
+        self.assertEqual(builder.network.station_ids, [])
+        self.assertIsNone(builder.network.constraint_matrix)
+
+    def test_context_manager_builds_on_exit(self):
+        with NetworkBuilder(ChargingNetwork()) as builder:
+            self._add_all(builder)
+        self.assertEqual(builder.network.station_ids, ['PS-001', 'PS-002', 'PS-003'])
+        self.assertEqual(builder.network.constraint_matrix.shape, (2, 3))
+
+    def test_extend_existing_network(self):
+        network = ChargingNetwork()
+        network.register_evse(EVSE('PS-001'), 240, 0)
+        network.add_constraint(Current('PS-001'), 32)
+        builder = NetworkBuilder(network)
+        builder.register_evse(EVSE('PS-002'), 240, 0)
+        builder.add_constraint(Current(['PS-001', 'PS-002']), 40)
+        builder.build()
+        self.assertEqual(network.constraint_index, ['_const_0', '_const_1'])
+        np.testing.assert_array_equal(network.constraint_matrix, np.array([[1, 0], [1, 1]]))
+        np.testing.assert_array_equal(network.magnitudes, np.array([32, 40]))
+
+    def test_add_constraint_unregistered_evse(self):
+        builder = NetworkBuilder(ChargingNetwork())
+        builder.register_evse(EVSE('PS-001'), 240, 0)
+        with self.assertRaises(KeyError):
+            builder.add_constraint(Current(['PS-001', 'PS-002']), 32)
+
+    def test_add_constraint_warning(self):
+        builder = NetworkBuilder(ChargingNetwork())
+        builder.register_evse(EVSE('PS-001'), 240, 0)
+        builder.add_constraint(Current('PS-001'), 32, name='line')
+        builder.add_constraint(Current('PS-001'), 16, name='line')
+        with self.assertWarns(UserWarning):
+            network = builder.build()
+        self.assertEqual(network.constraint_index, ['line', 'line_v2'])
+
+    def test_build_uses_overridable_methods(self):
+        class CountingNetwork(ChargingNetwork):
+            def register_evses(self, evses, voltages, phase_angles):
+                self.registered = getattr(self, 'registered', 0) + len(evses)
+                super().register_evses(evses, voltages, phase_angles)
+
+            def add_constraints(self, currents, limits, names=None):
+                self.added = getattr(self, 'added', 0) + len(currents)
+                super().add_constraints(currents, limits, names)
+
+        builder = NetworkBuilder(CountingNetwork())
+        self._add_all(builder)
+        network = builder.build()
+        self.assertEqual((network.registered, network.added), (3, 2))
+        network.register_evse(EVSE('PS-004'), 240, 0)
+        network.add_constraint(Current('PS-004'), 32)
+        self.assertEqual((network.registered, network.added), (4, 3))
+
+    def test_build_uses_overridden_per_item_methods(self):
+        class PerItemNetwork(ChargingNetwork):
+            def register_evse(self, evse, voltage, phase_angle):
+                self.registered = getattr(self, 'registered', []) + [evse.station_id]
+                super().register_evse(evse, voltage, phase_angle)
+
+            def add_constraint(self, current, limit, name=None):
+                self.current_types = getattr(self, 'current_types', set()) | {type(current)}
+                super().add_constraint(current, limit, name=name)
+
+        builder = NetworkBuilder(PerItemNetwork())
+        self._add_all(builder)
+        builder.add_constraint(SparseCurrent('PS-002'), 20)
+        network = builder.build()
+        self.assertEqual(network.registered, ['PS-001', 'PS-002', 'PS-003'])
+        self.assertEqual(network.current_types, {Current})
+        self.assertEqual(network.constraint_index, ['first_constraint', '_const_1', '_const_2'])
+        np.testing.assert_array_equal(network.constraint_matrix, np.array([[0.25, 0.5, 0], [1, 0, 1], [0, 1, 0]]))
+
+        site = caltech_acn(network_type=PerItemNetwork)
+        self.assertEqual(site.registered, site.station_ids)
+        self.assertEqual(site.current_types, {Current})
+        np.testing.assert_array_equal(site.constraint_matrix, caltech_acn().constraint_matrix)
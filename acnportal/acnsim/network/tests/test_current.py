@@ -3,7 +3,7 @@ from unittest.mock import Mock, create_autospec
 
 from acnportal.acnsim.models import EV
 from acnportal.acnsim.models import EVSE, InvalidRateError
-from acnportal.acnsim import Current
+from acnportal.acnsim import Current, SparseCurrent
 
 import pandas as pd
 import numpy as np
@@ -77,4 +77,82 @@ class TestCurrent(TestCase):
         self.assertIsInstance(self.current, Current)
         pd.testing.assert_series_equal(
             self.current, pd.Series(
-                [0.50, 1.00, -0.5], index=['PS-001', 'PS-002', 'PS-003']))
\ No newline at end of file
+                [0.50, 1.00, -0.5], index=['PS-001', 'PS-002', 'PS-003']))
+
+class TestSparseCurrent(TestCase):
+    def test_init_loads_dict_input(self):
+        curr_dict = {'PS-001' : 0.25, 'PS-002' : 0.50, 'PS-003' : -0.25}
+        self.assertEqual(SparseCurrent(curr_dict).loads, curr_dict)
+
+    def test_init_str_load_input(self):
+        self.assertEqual(SparseCurrent('PS-001').loads, {'PS-001': 1})
+
+    def test_init_none_input(self):
+        self.assertEqual(SparseCurrent().loads, {})
+
+    def test_init_str_lst_input(self):
+        self.assertEqual(SparseCurrent(['PS-001', 'PS-002']).loads, {'PS-001': 1, 'PS-002': 1})
+
+    def test_init_series_input(self):
+        current = Current({'PS-001' : 0.25, 'PS-002' : 0.50})
+        self.assertEqual(SparseCurrent(current).loads, {'PS-001': 0.25, 'PS-002': 0.50})
+
+    def test_init_invalid_input(self):
+        with self.assertRaises(TypeError):
+            SparseCurrent([1, 2])
+
+    def test_add_current_unequal_station_ids(self):
+        current1 = SparseCurrent({'PS-001' : 0.25, 'PS-002' : 0.50, 'PS-003' : -0.25})
+        current2 = SparseCurrent({'PS-006' : 0.30, 'PS-004' : -0.60, 'PS-002' : 0.50})
+        sum_curr = current1 + current2
+        self.assertIsInstance(sum_curr, SparseCurrent)
+        self.assertEqual(sum_curr.loads, {'PS-001': 0.25, 'PS-002': 1.00, 'PS-003': -0.25, 'PS-004': -0.60,
+                                          'PS-006': 0.30})
+
+    def test_sub_current_unequal_station_ids(self):
+        current1 = SparseCurrent({'PS-001' : 0.25, 'PS-002' : 0.50, 'PS-003' : -0.25})
+        current2 = SparseCurrent({'PS-006' : 0.30, 'PS-004' : -0.60, 'PS-002' : 0.50})
+        diff_curr = current1 - current2
+        self.assertIsInstance(diff_curr, SparseCurrent)
+        self.assertEqual(diff_curr.loads, {'PS-001': 0.25, 'PS-002': 0.00, 'PS-003': -0.25, 'PS-004': 0.60,
+                                           'PS-006': -0.30})
+
+    def test_add_invalid_type(self):
+        with self.assertRaises(TypeError):
+            SparseCurrent('PS-001') + 1
+        with self.assertRaises(TypeError):
+            SparseCurrent('PS-001') - 1
+
+    def test_mul_current(self):
+        current = SparseCurrent({'PS-001' : 0.25, 'PS-002' : 0.50, 'PS-003' : -0.25})
+        current *= 2
+        self.assertIsInstance(current, SparseCurrent)
+        self.assertEqual(current.loads, {'PS-001': 0.50, 'PS-002': 1.00, 'PS-003': -0.5})
+        self.assertEqual((0.5 * current).loads, {'PS-001': 0.25, 'PS-002': 0.50, 'PS-003': -0.25})
+
+    def test_matches_current(self):
+        ab, bc, ca = ['PS-001', 'PS-002'], ['PS-003'], ['PS-004', 'PS-001']
+        sparse = (1 / 4) * ((SparseCurrent(ab) - SparseCurrent(ca)) - (SparseCurrent(ca) - SparseCurrent(bc)))
+        dense = (1 / 4) * ((Current(ab) - Current(ca)) - (Current(ca) - Current(bc)))
+        self.assertEqual(sparse.loads, dict(dense.items()))
+
+    def test_mixed_operands(self):
+        sparse = SparseCurrent({'PS-001': 0.25, 'PS-002': 0.50})
+        dense = Current({'PS-002': 1, 'PS-003': 2})
+        for result, expected in [(sparse + dense, {'PS-001': 0.25, 'PS-002': 1.50, 'PS-003': 2}),
+                                 (dense + sparse, {'PS-002': 1.50, 'PS-003': 2, 'PS-001': 0.25}),
+                                 (sparse - dense, {'PS-001': 0.25, 'PS-002': -0.50, 'PS-003': -2}),
+                                 (dense - sparse, {'PS-002': 0.50, 'PS-003': 2, 'PS-001': -0.25})]:
+            self.assertIsInstance(result, SparseCurrent)
+            self.assertEqual(result.loads, expected)
+
+    def test_zero_operand(self):
+        current = SparseCurrent({'PS-001': 0.25, 'PS-002': 0.50})
+        self.assertEqual((0 - current).loads, {'PS-001': -0.25, 'PS-002': -0.50})
+        self.assertEqual((current - 0).loads, current.loads)
+        self.assertEqual((0 + current).loads, current.loads)
+        self.assertEqual(sum([current, SparseCurrent('PS-003')]).loads, {'PS-001': 0.25, 'PS-002': 0.50, 'PS-003': 1})
+        with self.assertRaises(TypeError):
+            1 - current
+        with self.assertRaises(TypeError):
+            1 + current
@@ -0,0 +1,80 @@
+from unittest import TestCase, skipIf
+
+import numpy as np
+
+from acnportal.acnsim import ChargingNetwork, Current
+from acnportal.acnsim.models import EVSE
+from acnportal.acnsim.network import FeasibilityOracle
+from acnportal.acnsim.network.charging_network import sparse
+
+
+class TestFeasibilityOracle(TestCase):
+    def setUp(self):
+        self.network = ChargingNetwork()
+        self.network.register_evse(EVSE('PS-001'), 240, 0)
+        self.network.register_evse(EVSE('PS-002'), 240, 120)
+        self.network.register_evse(EVSE('PS-003'), 240, -120)
+        self.network.add_constraint(Current(['PS-001', 'PS-002']), 50, name='pair')
+        self.network.add_constraint(Current(['PS-001', 'PS-002', 'PS-003']), 60, name='all')
+
+    def test_empty_schedule_feasible(self):
+        oracle = FeasibilityOracle(self.network)
+        self.assertTrue(oracle.is_feasible())
+        np.testing.assert_allclose(oracle.aggregate_currents, np.zeros((2, 1)))
+
+    def test_set_rate_matches_network(self):
+        oracle = FeasibilityOracle(self.network, schedule_length=2)
+        schedule = np.array([[40, 10], [30, 60], [20, 0]])
+        for i, station_id in enumerate(self.network.station_ids):
+            for t in range(2):
+                oracle.set_rate(station_id, schedule[i, t], t)
+        np.testing.assert_allclose(oracle.aggregate_currents, self.network.constraint_current(schedule))
+        self.assertEqual(oracle.is_feasible(), self.network.is_feasible(schedule))
+        self.assertEqual(oracle.rate('PS-002', 1), 60)
+
+    def test_is_feasible_with_does_not_change_schedule(self):
+        oracle = FeasibilityOracle(self.network, np.array([[30], [0], [0]]))
+        self.assertTrue(oracle.is_feasible_with('PS-002', 30))
+        self.assertFalse(oracle.is_feasible_with('PS-002', 70))
+        self.assertEqual(oracle.rate('PS-002'), 0)
+        self.assertTrue(oracle.is_feasible())
+
+    def test_matches_network_is_feasible(self):
+        for rate in [40, 60, 80, 100]:
+            schedule = np.array([[rate], [rate], [rate]])
+            oracle = FeasibilityOracle(self.network, np.array([[rate], [rate], [0]]))
+            self.assertEqual(oracle.is_feasible_with('PS-003', rate), self.network.is_feasible(schedule))
+
+    def test_linear(self):
+        schedule = np.array([[40], [40], [0]])
+        oracle = FeasibilityOracle(self.network, schedule, linear=True)
+        self.assertFalse(oracle.is_feasible())
+        self.assertTrue(FeasibilityOracle(self.network, schedule).is_feasible())
+
+    def test_dtype(self):
+        self.network.dtype = np.float32
+        schedule = np.array([[40], [30], [20]])
+        oracle = FeasibilityOracle(self.network, schedule)
+        self.assertEqual(oracle.aggregate_currents.dtype, np.complex64)
+        np.testing.assert_allclose(oracle.aggregate_currents, self.network.constraint_current(schedule), rtol=1e-6)
+        self.assertEqual(oracle.is_feasible(), self.network.is_feasible(schedule))
+
+    def test_tolerance(self):
+        oracle = FeasibilityOracle(self.network, np.array([[50.0005], [0], [0]]), violation_tolerance=1e-3)
+        self.assertTrue(oracle.is_feasible())
+        oracle = FeasibilityOracle(self.network, np.array([[50.0005], [0], [0]]))
+        self.assertFalse(oracle.is_feasible())
+
+    def test_no_constraints(self):
+        network = ChargingNetwork()
+        network.register_evse(EVSE('PS-001'), 240, 0)
+        oracle = FeasibilityOracle(network)
+        oracle.set_rate('PS-001', 1000)
+        self.assertTrue(oracle.is_feasible())
+
+
+@skipIf(sparse is None, 'scipy is not installed.')
+class TestFeasibilityOracleSparse(TestFeasibilityOracle):
+    def setUp(self):
+        super().setUp()
+        self.network.sparse_constraints = True
@@ -1,4 +1,4 @@
-from unittest import TestCase
+from unittest import TestCase, skipIf
 from unittest.mock import Mock, create_autospec
 
 from collections import OrderedDict
@@ -6,7 +6,8 @@ from collections import OrderedDict
 from acnportal.acnsim.models import EV
 from acnportal.acnsim.models import EVSE, InvalidRateError
 from acnportal.acnsim import ChargingNetwork
-from acnportal.acnsim import Current
+from acnportal.acnsim import Current, SparseCurrent
+from acnportal.acnsim.network.charging_network import sparse
 
 import pandas as pd
 import numpy as np
@@ -126,6 +127,50 @@ class TestChargingNetwork(TestCase):
         self.assertEqual(self.network.phase_angles,
             {'PS-001' : -30, 'PS-003' : 150, 'PS-002' : 90})
 
+    def test_station_index(self):
+        self.network.register_evse(EVSE('PS-001'), 240, -30)
+        self.network.register_evse(EVSE('PS-003'), 100, 150)
+        self.assertEqual(self.network.station_index('PS-003'), 1)
+        self.network.register_evse(EVSE('PS-002'), 140, 90)
+        self.assertEqual(self.network.station_index('PS-002'), 2)
+        with self.assertRaises(KeyError):
+            self.network.station_index('PS-004')
+
+    def test_station_views_rebuilt_on_register(self):
+        self.network.register_evse(EVSE('PS-001', max_rate=32), 240, -30)
+        self.assertEqual(self.network.station_ids, ['PS-001'])
+        self.assertEqual(self.network.voltages, {'PS-001': 240})
+        self.network.register_evse(EVSE('PS-002', max_rate=16, min_rate=6), 140, 90)
+        self.assertEqual(self.network.station_ids, ['PS-001', 'PS-002'])
+        self.assertEqual(self.network.voltages, {'PS-001': 240, 'PS-002': 140})
+        self.assertEqual(self.network.max_pilot_signals, {'PS-001': 32, 'PS-002': 16})
+        self.assertEqual(self.network.min_pilot_signals, {'PS-001': 0, 'PS-002': 6})
+        np.testing.assert_array_equal(self.network.max_rates, np.array([32, 16]))
+        np.testing.assert_array_equal(self.network.min_rates, np.array([0, 6]))
+
+    def test_station_views_cached(self):
+        self.network.register_evse(EVSE('PS-001'), 240, -30)
+        self.assertIs(self.network.station_ids, self.network.station_ids)
+
+    def test_station_dicts_are_copies(self):
+        self.network.register_evse(EVSE('PS-001', max_rate=32), 240, -30)
+        for name in ['voltages', 'phase_angles', 'max_pilot_signals', 'min_pilot_signals']:
+            getattr(self.network, name)['PS-001'] = -1
+        self.assertEqual(self.network.voltages, {'PS-001': 240})
+        self.assertEqual(self.network.phase_angles, {'PS-001': -30})
+        self.assertEqual(self.network.max_pilot_signals, {'PS-001': 32})
+        self.assertEqual(self.network.min_pilot_signals, {'PS-001': 0})
+
+    def test_station_accessors(self):
+        self.network.register_evse(EVSE('PS-001', max_rate=32, min_rate=6), 240, -30)
+        self.assertEqual(self.network.station_voltage('PS-001'), 240)
+        self.assertEqual(self.network.station_phase_angle('PS-001'), -30)
+        self.assertEqual(self.network.station_max_pilot_signal('PS-001'), 32)
+        self.assertEqual(self.network.station_min_pilot_signal('PS-001'), 6)
+        with self.assertRaises(KeyError):
+            self.network.station_voltage('PS-002')
+
+
 class TestChargingNetworkConstraints(TestCase):
     def setUp(self):
         self.network = ChargingNetwork()
@@ -163,6 +208,26 @@ class TestChargingNetworkConstraints(TestCase):
         self.assertEqual(self.network.constraint_index[0], 'first_constraint')
         self.assertEqual(self.network.constraint_index[1], '_const_1')
 
+    def test_add_sparse_constraint(self):
+        current3 = SparseCurrent({'PS-006': 0.5, 'PS-001': -1})
+        self.network.add_constraint(current3, 20)
+        np.testing.assert_allclose(self.network.constraint_matrix[2], np.array([-1, 0, 0, 0, 0.5]))
+        self.assertEqual(self.network.constraint_index[2], '_const_2')
+        self.assertEqual(current3.name, '_const_2')
+
+    def test_add_constraints(self):
+        self.network.add_constraints([SparseCurrent(['PS-001']), Current('PS-006')], [20, 30], ['line', None])
+        self.assertEqual(self.network.constraint_index[2:], ['line', '_const_3'])
+        np.testing.assert_allclose(self.network.magnitudes, np.array([50, 10, 20, 30]))
+        np.testing.assert_allclose(self.network.constraint_matrix[2:], np.array([[1, 0, 0, 0, 0], [0, 0, 0, 0, 1]]))
+        with self.assertRaises(KeyError):
+            self.network.add_constraints([Current('PS-001'), Current('PS-005')], [20, 20])
+        self.assertEqual(len(self.network.constraint_index), 4)
+
+    def test_add_sparse_constraint_unregistered_evse(self):
+        with self.assertRaises(KeyError):
+            self.network.add_constraint(SparseCurrent(['PS-001', 'PS-005']), 20)
+
     def test_add_constraint_warning(self):
         curr_dict3 = {'PS-001' : -0.25, 'PS-002' : -0.50, 'PS-003' : 0.25}
         current3 = Current(curr_dict3)
@@ -261,3 +326,190 @@ class TestChargingNetworkConstraints(TestCase):
             np.array([[50+0j, 50+0j]]))
         np.testing.assert_allclose(self.network.constraint_current(loads, time_indices=[1]),
             np.array([[50+0j], [-9.3+0j]]))
+
+    def test_plugged_in_station_ids(self):
+        self.assertEqual(self.network.plugged_in_station_ids, [])
+        self.network.plugin(EV(0, 10, 10, 'PS-002', 'A', Mock()), 'PS-002')
+        self.network.plugin(EV(0, 10, 10, 'PS-001', 'B', Mock()), 'PS-001')
+        self.assertEqual(self.network.plugged_in_station_ids, ['PS-001', 'PS-002'])
+        self.network.unplug('PS-001')
+        self.assertEqual(self.network.plugged_in_station_ids, ['PS-002'])
+
+    def test_is_feasible_plugged_in_stations(self):
+        self.network.plugin(EV(0, 10, 10, 'PS-001', 'A', Mock()), 'PS-001')
+        self.network.plugin(EV(0, 10, 10, 'PS-002', 'B', Mock()), 'PS-002')
+        station_ids = self.network.plugged_in_station_ids
+        good_loads = np.array([[160, 200.000035], [20.000015, 0]])
+        bad_loads = np.array([[160, 200.000045], [20.000015, 0]])
+        self.assertTrue(self.network.is_feasible(good_loads, station_ids=station_ids))
+        self.assertFalse(self.network.is_feasible(bad_loads, station_ids=station_ids))
+        np.testing.assert_allclose(self.network.constraint_current(good_loads, station_ids=station_ids),
+                                   np.array([[50.0000075+0j, 50.00000875+0j], [10.0000075+0j, 0j]]))
+
+    def test_is_feasible_other_stations(self):
+        loads = np.array([[120], [150], [60]])
+        full_loads = np.array([[0], [120], [0], [150], [60]])
+        station_ids = ['PS-004', 'PS-002', 'PS-006']
+        self.assertEqual(self.network.is_feasible(loads, station_ids=station_ids),
+                         self.network.is_feasible(full_loads))
+        np.testing.assert_allclose(self.network.constraint_current(loads, station_ids=station_ids),
+                                   self.network.constraint_current(full_loads))
+
+    def test_three_phase_matches_complex_currents(self):
+        network = ChargingNetwork(sparse_constraints=self.network.sparse_constraints)
+        for station_id, phase in [('AB', 30), ('BC', -90), ('CA', 150)]:
+            network.register_evse(EVSE(station_id), 208, phase)
+        network.add_constraint(Current(['AB']) - Current(['CA']), 80, name='A')
+        network.add_constraint(Current(['BC']) - Current(['AB']), 75, name='B')
+        loads = np.array([[32, 48, 50], [16, 32, 40], [0, 32, 20]])
+        phasors = network.constraint_matrix * np.exp(1j * np.deg2rad([30, -90, 150]))
+        np.testing.assert_allclose(network.constraint_current(loads), phasors @ loads)
+        np.testing.assert_allclose(network.constraint_current(loads, constraints=['B']), phasors[[1]] @ loads)
+        self.assertTrue(network.is_feasible(loads[:, :2]))
+        self.assertFalse(network.is_feasible(loads[:, 2:]))
+
+    def test_feasibility_report_feasible(self):
+        good_loads = np.array([[0, 0], [150, 120], [100, 40], [150, 120], [60, 9]])
+        report = self.network.feasibility_report(good_loads)
+        self.assertTrue(report.feasible)
+        np.testing.assert_allclose(report.slack, np.array([[1e-5, 1e-5], [7.00001, 0.70001]]))
+        self.assertAlmostEqual(report.max_violation, -1e-5)
+        self.assertEqual(report.max_violation_constraint, 'first_constraint')
+
+    def test_feasibility_report_infeasible(self):
+        bad_loads = np.array([[0, 0], [150, 800], [100, 0], [150, 20], [60, 9]])
+        report = self.network.feasibility_report(bad_loads)
+        self.assertFalse(report.feasible)
+        self.assertAlmostEqual(report.max_violation, 457.29999, places=5)
+        self.assertEqual(report.max_violation_constraint, '_const_1')
+        self.assertEqual(report.max_violation_time, 1)
+        self.assertAlmostEqual(report.slack[1, 1], -457.29999, places=5)
+
+    def test_feasibility_report_matches_is_feasible(self):
+        for loads in [np.array([[160, 200.000035], [0, 0], [0, 0], [20.000015, 0], [0, 0]]),
+                      np.array([[160, 200.000045], [0, 0], [0, 0], [20.000015, 0], [0, 0]])]:
+            self.assertEqual(self.network.feasibility_report(loads).feasible, self.network.is_feasible(loads))
+            self.assertEqual(self.network.feasibility_report(loads, linear=True, violation_tolerance=1e-3).feasible,
+                             self.network.is_feasible(loads, linear=True, violation_tolerance=1e-3))
+
+    def test_feasibility_report_no_constraints(self):
+        network = ChargingNetwork()
+        network.register_evse(EVSE('PS-001'), 240, 0)
+        report = network.feasibility_report(np.array([[100, 200]]))
+        self.assertTrue(report.feasible)
+        self.assertEqual(report.slack.shape, (0, 2))
+        self.assertIsNone(report.max_violation)
+        self.assertIsNone(report.max_violation_constraint)
+
+    def test_constraint_views_rebuilt_on_change(self):
+        loads = np.array([[160], [0], [0], [20], [0]])
+        self.assertTrue(self.network.is_feasible(loads))
+        self.network.update_constraint('first_constraint', Current({'PS-001': 0.25}), 30)
+        self.assertFalse(self.network.is_feasible(loads))
+        self.network.remove_constraint('first_constraint')
+        self.assertTrue(self.network.is_feasible(loads))
+        np.testing.assert_allclose(self.network.constraint_current(loads), np.array([[10+0j]]))
+
+    def test_constraint_views_rebuilt_on_tolerance_change(self):
+        loads = np.array([[160, 200.0035], [0, 0], [0, 0], [20.0015, 0], [0, 0]])
+        self.assertFalse(self.network.is_feasible(loads))
+        self.network.violation_tolerance = 1e-3
+        self.assertTrue(self.network.is_feasible(loads))
+
+    def test_constraint_cache_sees_in_place_changes(self):
+        loads = np.array([[160], [0], [0], [20], [0]])
+        self.assertTrue(self.network.is_feasible(loads))
+        self.network.magnitudes[0] = 30
+        self.assertFalse(self.network.is_feasible(loads))
+        self.network.magnitudes[0] = 1000
+        self.assertTrue(self.network.is_feasible(loads))
+        self.network.magnitudes = np.array([30, 10])
+        self.assertFalse(self.network.is_feasible(loads))
+
+    def test_dtype_float32(self):
+        loads = np.array([[160, 200], [0, 10], [0, 0], [20, 5], [3, 0]])
+        expected = self.network.constraint_current(loads)
+        self.network.dtype = np.float32
+        currents = self.network.constraint_current(loads)
+        self.assertEqual(currents.dtype, np.complex64)
+        np.testing.assert_allclose(currents, expected, rtol=1e-6)
+        self.assertEqual(self.network.constraint_current(loads, linear=True).dtype, np.complex64)
+        self.assertEqual(self.network.feasibility_report(loads).slack.dtype, np.float64)
+
+    def test_dtype_float32_raises_relative_tolerance(self):
+        self.network.dtype = np.float32
+        limits, _ = self.network._tolerance_limits()
+        np.testing.assert_allclose(limits, np.array([50, 10]) * (1 + 100 * np.finfo(np.float32).eps))
+        self.network.relative_tolerance = 1e-3
+        np.testing.assert_allclose(self.network._tolerance_limits()[0], np.array([50.05, 10.01]))
+
+    def test_dtype_float32_feasibility_at_limit(self):
+        self.network.dtype = np.float32
+        self.assertTrue(self.network.is_feasible(np.array([[200.0], [0], [0], [0], [0]])))
+        self.assertFalse(self.network.is_feasible(np.array([[200.1], [0], [0], [0], [0]])))
+
+    def test_invalid_dtype(self):
+        with self.assertRaises(ValueError):
+            self.network.dtype = np.int32
+        with self.assertRaises(ValueError):
+            ChargingNetwork(dtype=complex)
+
+
+@skipIf(sparse is None, 'scipy is not installed.')
+class TestChargingNetworkConstraintsSparse(TestChargingNetworkConstraints):
+    def setUp(self):
+        super().setUp()
+        self.network.sparse_constraints = True
+
+    def test_uses_sparse_matrices(self):
+        views = self.network._constraint_views()
+        self.assertTrue(views['sparse'])
+        self.assertTrue(sparse.issparse(views['phasor_matrix']))
+        self.assertIsInstance(self.network.constraint_matrix, np.ndarray)
+
+    def test_sparse_chosen_automatically(self):
+        self.network.sparse_constraints = None
+        self.assertFalse(self.network._constraint_views()['sparse'])
+        network = ChargingNetwork()
+        for i in range(1000):
+            network.register_evse(EVSE('PS-{0}'.format(i)), 240, 0)
+        for i in range(0, 1000, 10):
+            network.add_constraint(SparseCurrent(['PS-{0}'.format(j) for j in range(i, i + 10)]), 32)
+        self.assertTrue(network._constraint_views()['sparse'])
+        loads = np.ones((1000, 2)) * 3
+        self.assertTrue(network.is_feasible(loads))
+        np.testing.assert_allclose(network.constraint_current(loads), np.ones((100, 2)) * 30)
+        network.sparse_constraints = False
+        self.assertFalse(network._constraint_views()['sparse'])
+
+    def test_constraints_stored_sparse(self):
+        network = ChargingNetwork()
+        for i in range(1000):
+            network.register_evse(EVSE('PS-{0}'.format(i)), 240, 0)
+        for i in range(0, 1000, 10):
+            network.add_constraint(SparseCurrent(['PS-{0}'.format(j) for j in range(i, i + 10)]), 32)
+        network.remove_constraint('_const_0')
+        self.assertTrue(sparse.issparse(network._constraints))
+        self.assertEqual(network._constraints.nnz, 990)
+        self.assertTrue(network.is_feasible(np.ones((1000, 2)) * 3))
+        dense = network.constraint_matrix
+        self.assertEqual(dense.shape, (99, 1000))
+        np.testing.assert_array_equal(dense[0, 8:22], [0, 0] + [1] * 10 + [0, 0])
+        self.assertIs(network._constraints, dense)
+        dense[0, 0] = 100
+        self.assertFalse(network.is_feasible(np.ones((1000, 2)) * 3))
+
+    def test_constraints_stored_dense_if_disabled(self):
+        network = ChargingNetwork(sparse_constraints=False)
+        network.register_evse(EVSE('PS-001'), 240, 0)
+        network.add_constraint(Current('PS-001'), 32)
+        self.assertIsInstance(network._constraints, np.ndarray)
+        self.assertIs(network.constraint_matrix, network._constraints)
+
+    def test_small_constraints_stored_dense_by_default(self):
+        # setUp adds the constraints before enabling sparse_constraints.
+        self.assertIsInstance(self.network._constraints, np.ndarray)
+        loads = np.array([[160], [0], [0], [20], [0]])
+        self.assertTrue(self.network.is_feasible(loads))
+        self.network.constraint_matrix[0, 0] = 1
+        self.assertFalse(self.network.is_feasible(loads))
@@ -0,0 +1,88 @@
+from unittest import TestCase
+
+import numpy as np
+
+from acnportal.acnsim import ChargingNetwork
+from acnportal.acnsim.models import EV, Battery, Linear2StageBattery
+from acnportal.acnsim.models import EVSE, DeadbandEVSE, FiniteRatesEVSE, InvalidRateError
+
+
+class CustomBattery(Battery):
+    def charge(self, pilot, voltage, period):
+        return super().charge(pilot / 2, voltage, period)
+
+
+def _build_network(vectorized_plant):
+    network = ChargingNetwork(vectorized_plant=vectorized_plant)
+    network.register_evse(EVSE('PS-001', max_rate=32), 240, 0)
+    network.register_evse(FiniteRatesEVSE('PS-002', [8, 16, 24, 32]), 208, 30)
+    network.register_evse(DeadbandEVSE('PS-003', max_rate=32), 240, 0)
+    network.register_evse(EVSE('PS-004', max_rate=32), 240, 0)
+    network.register_evse(EVSE('PS-005', max_rate=32), 240, 0)
+    network.plugin(EV(0, 10, 10, 'PS-001', 'A', Battery(10, 9.5, 7)), 'PS-001')
+    network.plugin(EV(0, 10, 10, 'PS-002', 'B', Linear2StageBattery(10, 7.5, 7, noise_level=0.5)), 'PS-002')
+    network.plugin(EV(0, 10, 10, 'PS-003', 'C', Linear2StageBattery(10, 0, 7)), 'PS-003')
+    network.plugin(EV(0, 10, 10, 'PS-004', 'D', CustomBattery(10, 0, 7)), 'PS-004')
+    return network
+
+
+class TestVectorizedPlant(TestCase):
+    def setUp(self):
+        self.pilots = np.array([[32, 32, 0, 16], [16, 24, 32, 8], [8, 32, 0, 32], [32, 16, 8, 0], [0, 4, 0, 0]])
+
+    def test_matches_per_object_dispatch(self):
+        scalar = _build_network(False)
+        vectorized = _build_network(True)
+        for i in range(self.pilots.shape[1]):
+            np.random.seed(i)
+            scalar.update_pilots(self.pilots, i, 5)
+            np.random.seed(i)
+            vectorized.update_pilots(self.pilots, i, 5)
+            np.testing.assert_array_equal(vectorized.current_charging_rates, scalar.current_charging_rates)
+        for station_id in scalar.station_ids:
+            scalar_evse = scalar._EVSEs[station_id]
+            vectorized_evse = vectorized._EVSEs[station_id]
+            self.assertEqual(vectorized_evse.current_pilot, scalar_evse.current_pilot)
+            if scalar_evse.ev is not None:
+                self.assertEqual(vectorized_evse.ev.energy_delivered, scalar_evse.ev.energy_delivered)
+                self.assertEqual(vectorized_evse.ev.current_charging_rate, scalar_evse.ev.current_charging_rate)
+                self.assertEqual(vectorized_evse.ev._battery._current_charge,
+                                 scalar_evse.ev._battery._current_charge)
+
+    def test_unplug_clears_rate(self):
+        network = _build_network(True)
+        network.update_pilots(self.pilots, 0, 5)
+        network.unplug('PS-001')
+        self.assertEqual(network.current_charging_rates[0], 0)
+        self.assertEqual(network._EVSEs['PS-001'].current_pilot, 0)
+
+    def test_plugin_after_update(self):
+        network = _build_network(True)
+        network.update_pilots(self.pilots, 0, 5)
+        network.plugin(EV(0, 10, 10, 'PS-005', 'E', Battery(10, 0, 7)), 'PS-005')
+        network.update_pilots(np.array([[0], [0], [0], [0], [16]]), 0, 5)
+        self.assertEqual(network.current_charging_rates[4], 16)
+        self.assertAlmostEqual(network.get_ev('PS-005').energy_delivered, 16 * 240 / 1000 * 5 / 60)
+
+    def test_invalid_finite_rate(self):
+        network = _build_network(True)
+        with self.assertRaises(InvalidRateError):
+            network.update_pilots(np.array([[0], [12], [0], [0], [0]]), 0, 5)
+
+    def test_invalid_range_rate(self):
+        network = _build_network(True)
+        with self.assertRaises(InvalidRateError):
+            network.update_pilots(np.array([[40], [0], [0], [0], [0]]), 0, 5)
+
+    def test_invalid_deadband_rate(self):
+        network = _build_network(True)
+        with self.assertRaises(InvalidRateError):
+            network.update_pilots(np.array([[0], [0], [3], [0], [0]]), 0, 5)
+
+    def test_disable_plant(self):
+        network = _build_network(True)
+        self.assertTrue(network.vectorized_plant)
+        network.vectorized_plant = False
+        self.assertFalse(network.vectorized_plant)
+        network.update_pilots(self.pilots, 0, 5)
+        self.assertEqual(network.current_charging_rates[0], 25)
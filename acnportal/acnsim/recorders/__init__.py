@@ -0,0 +1,15 @@
+from .time_series import TimeSeriesBuffer
+from .memmap import MemmapTimeSeriesBuffer
+from .session import SessionTimeSeries
+from .schedule_history import ScheduleHistory
+from .columnar_log import ColumnarLog
+from .history import EventLog, SessionLog
+from .profiler import SimulationProfiler
+
+del time_series
+del memmap
+del session
+del schedule_history
+del columnar_log
+del history
+del profiler
@@ -0,0 +1,244 @@
+import copy
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+
+class ColumnarLog:
+    """ Append-only table of records stored column by column, in memory or on disk.
+
+    Each column has a fixed numpy dtype. Columns with dtype object hold categorical values such as station and session
+    ids, which are stored as int32 codes into a table of distinct values, so repeated values cost four bytes each. In a
+    ring buffer they are stored as they are instead, so that the table does not outgrow the retained records.
+
+    Three retention policies are supported:
+        - By default every record is kept in memory.
+        - If max_rows is given, only the last max_rows records are kept, in a ring buffer. With max_rows=0 records
+            are discarded as they are appended.
+        - If path is given, records are streamed to disk in batches of batch_size, with one binary file per column
+            named <column>.bin in the directory path, and the distinct values of each categorical column in
+            <column>.json, one JSON value per line. Only the current batch is kept in memory.
+
+    A log which keeps every record in memory can be forked cheaply: the fork shares the records appended so far with
+    this log, and only stores the records appended to it later.
+
+    Args:
+        columns (List[Tuple[str, np.dtype]]): Name and dtype of each column.
+        max_rows (int): Number of most recent records to keep in memory. If None, all records are kept. Default None.
+        path (str): Directory to which records are streamed. Existing log files in it are overwritten. Cannot be
+            combined with max_rows. Default None.
+        batch_size (int): Number of records written to disk at a time if path is given. Default 4096.
+    """
+
+    # Number of distinct values of each categorical column whose code is remembered when streaming to disk. Values seen
+    # again after being forgotten get a new code, which costs a line in the table but keeps memory use bounded.
+    code_cache_size = 4096
+
+    def __init__(self, columns, max_rows=None, path=None, batch_size=4096):
+        if max_rows is not None and max_rows < 0:
+            raise ValueError('max_rows must not be negative. Got {0}'.format(max_rows))
+        if max_rows is not None and path is not None:
+            raise ValueError('max_rows and path cannot both be given.')
+        self._names = [name for name, _ in columns]
+        self._dtypes = {name: np.dtype(np.int32) if np.dtype(dtype) == object else np.dtype(dtype)
+                        for name, dtype in columns}
+        self._categorical = {name for name, dtype in columns if np.dtype(dtype) == object}
+        if max_rows is not None:
+            self._dtypes.update({name: np.dtype(object) for name in self._categorical})
+            self._categorical = set()
+        self._codes = {name: OrderedDict() for name in self._categorical}
+        # Distinct values of each categorical column in order of their codes. Only kept in memory if path is None.
+        self._values = {name: [] for name in self._categorical}
+        self._value_counts = {name: 0 for name in self._categorical}
+        # Records and distinct values shared with the log this one was forked from, as lists of (columns, rows) and
+        # of (values, count) per categorical column.
+        self._shared = []
+        self._shared_values = {name: [] for name in self._categorical}
+        self._shared_rows = 0
+        self._max_rows = max_rows
+        self._path = path
+        self._batch_size = batch_size
+        # Number of records appended so far, including discarded ones.
+        self._appended = 0
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            for name in self._names:
+                open(self._file(name, 'bin'), 'wb').close()
+                if name in self._categorical:
+                    open(self._file(name, 'json'), 'w').close()
+            self._pending = []
+            self._data = None
+        else:
+            capacity = max_rows if max_rows is not None else 16
+            self._data = {name: np.zeros(capacity, dtype=self._dtypes[name]) for name in self._names}
+
+    @property
+    def names(self):
+        """ Return the names of the columns. (List[str]) """
+        return list(self._names)
+
+    @property
+    def path(self):
+        """ Return the directory to which records are streamed, or None if they are kept in memory. (str) """
+        return self._path
+
+    @property
+    def appended(self):
+        """ Return the number of records appended so far, including any which were not retained. (int) """
+        return self._appended
+
+    def __len__(self):
+        """ Return the number of retained records. """
+        if self._path is not None:
+            return self._appended
+        if self._max_rows is not None:
+            return min(self._appended, self._max_rows)
+        return self._appended
+
+    def append(self, record):
+        """ Append a record to the log.
+
+        Args:
+            record (Tuple): Value of each column, in the order of the columns.
+
+        Returns:
+            None
+        """
+        self._appended += 1
+        record = [self._encode(name, value) for name, value in zip(self._names, record)]
+        if self._path is not None:
+            self._pending.append(record)
+            if len(self._pending) >= self._batch_size:
+                self.flush()
+            return
+        if self._max_rows is not None:
+            if self._max_rows == 0:
+                return
+            position = (self._appended - 1) % self._max_rows
+        else:
+            position = self._appended - 1 - self._shared_rows
+            if position >= len(self._data[self._names[0]]):
+                for name in self._names:
+                    self._data[name] = np.concatenate([self._data[name], np.zeros_like(self._data[name])])
+        for name, value in zip(self._names, record):
+            self._data[name][position] = value
+
+    def column(self, name):
+        """ Return the values of a column for all retained records, oldest first.
+
+        Args:
+            name (str): Name of the column.
+
+        Returns:
+            np.Array: Values of the column. Categorical columns are returned as arrays of dtype object.
+        """
+        if self._path is not None:
+            self.flush()
+            codes = np.fromfile(self._file(name, 'bin'), dtype=self._dtypes[name])
+            if name in self._categorical:
+                with open(self._file(name, 'json')) as f:
+                    table = [json.loads(line) for line in f]
+        else:
+            codes = self._data[name]
+            if self._max_rows and self._appended > self._max_rows:
+                start = self._appended % self._max_rows
+                codes = np.concatenate([codes[start:], codes[:start]])
+            else:
+                codes = codes[:len(self) - self._shared_rows].copy()
+                if self._shared:
+                    codes = np.concatenate([columns[name] for columns, _ in self._shared] + [codes])
+        if name not in self._categorical:
+            return codes
+        if self._path is None:
+            table = [value for values, count in self._shared_values[name] for value in values[:count]] + \
+                self._values[name]
+        values = np.empty(len(table) + 1, dtype=object)
+        values[:-1] = table
+        # Code -1, i.e. the last entry, stands for None.
+        values[-1] = None
+        return values[codes]
+
+    def columns(self):
+        """ Return all columns for all retained records. See column.
+
+        Returns:
+            Dict[str, np.Array]: Map from column name to its values.
+        """
+        return {name: self.column(name) for name in self._names}
+
+    def fork(self):
+        """ Return a log with the same records which shares them with this log.
+
+        If every record is kept in memory, the new log shares the records appended so far and the distinct values of
+        categorical columns, so forking takes constant time per column. Records appended later to either log are not
+        seen by the other. A ring buffer, whose size is bounded, is copied instead.
+
+        Returns:
+            ColumnarLog: The new log.
+
+        Raises:
+            ValueError: Raised if records are streamed to disk, since the new log cannot share the files.
+        """
+        if self._path is not None:
+            raise ValueError('Cannot fork a log which is streamed to disk.')
+        if self._max_rows is not None:
+            return copy.deepcopy(self)
+        log = copy.copy(self)
+        rows = self._appended - self._shared_rows
+        log._shared = list(self._shared)
+        if rows:
+            columns = {name: self._data[name][:rows] for name in self._names}
+            for column in columns.values():
+                column.setflags(write=False)
+            log._shared.append((columns, rows))
+        log._shared_rows = self._appended
+        log._data = {name: np.zeros(16, dtype=self._dtypes[name]) for name in self._names}
+        # The new log assigns codes after those of this log, so it does not need to copy the map from values to codes.
+        # Values which were seen before the fork get a second code when they are appended to the new log.
+        log._shared_values = {name: self._shared_values[name] + [(self._values[name], len(self._values[name]))]
+                              for name in self._categorical}
+        log._codes = {name: OrderedDict() for name in self._categorical}
+        log._values = {name: [] for name in self._categorical}
+        log._value_counts = dict(self._value_counts)
+        return log
+
+    def flush(self):
+        """ Write any pending records to disk if path is given.
+
+        Returns:
+            None
+        """
+        if self._path is None or not self._pending:
+            return
+        for i, name in enumerate(self._names):
+            with open(self._file(name, 'bin'), 'ab') as f:
+                f.write(np.array([record[i] for record in self._pending], dtype=self._dtypes[name]).tobytes())
+        self._pending = []
+
+    def _encode(self, name, value):
+        """ Return the code of a categorical value, assigning a new one if needed, or the value itself otherwise. """
+        if name not in self._categorical:
+            return value
+        if value is None:
+            return -1
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = self._value_counts[name]
+            self._value_counts[name] += 1
+            if self._path is None:
+                self._values[name].append(value)
+            else:
+                with open(self._file(name, 'json'), 'a') as f:
+                    f.write(json.dumps(value) + '\n')
+                if len(codes) > self.code_cache_size:
+                    codes.popitem(last=False)
+        elif self._path is not None:
+            codes.move_to_end(value)
+        return code
+
+    def _file(self, name, extension):
+        """ Return the path of the file with the given extension for a column. """
+        return os.path.join(self._path, '{0}.{1}'.format(name, extension))
@@ -0,0 +1,185 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from .columnar_log import ColumnarLog
+
+
+class EventLog:
+    """ Compact replacement for the list Simulator.event_history, which records processed events as columns.
+
+    Rather than keeping every event object, only the timestamp, type, station id and session id of each event are
+    recorded, in a ColumnarLog. See ColumnarLog for the available retention policies.
+
+    Args:
+        max_events (int): Number of most recent events to keep in memory, or 0 to keep none. If None, all events are
+            kept. Default None.
+        path (str): Directory to which events are streamed instead of being kept in memory. Default None.
+    """
+
+    fields = [('timestamp', np.int64), ('type', object), ('station_id', object), ('session_id', object)]
+
+    def __init__(self, max_events=None, path=None):
+        self._log = ColumnarLog(self.fields, max_rows=max_events, path=path)
+
+    def __len__(self):
+        """ Return the number of retained events. """
+        return len(self._log)
+
+    @property
+    def appended(self):
+        """ Return the number of events recorded so far, including any which were not retained. (int) """
+        return self._log.appended
+
+    def append(self, event):
+        """ Record a processed event.
+
+        Args:
+            event (Event): The event.
+
+        Returns:
+            None
+        """
+        ev = getattr(event, 'ev', None)
+        if ev is not None:
+            station_id, session_id = ev.station_id, ev.session_id
+        else:
+            station_id, session_id = getattr(event, 'station_id', None), getattr(event, 'session_id', None)
+        self._log.append((event.timestamp, event.type, station_id, session_id))
+
+    def columns(self):
+        """ Return the recorded events as columns. See ColumnarLog.columns.
+
+        Returns:
+            Dict[str, np.Array]: Map from column name to its values, oldest event first.
+        """
+        return self._log.columns()
+
+    def fork(self):
+        """ Return an event log with the same events which shares them with this log. See ColumnarLog.fork.
+
+        Returns:
+            EventLog: The new log.
+        """
+        log = copy.copy(self)
+        log._log = self._log.fork()
+        return log
+
+    def as_df(self):
+        """ Return the recorded events as a pandas DataFrame with a row per event and a column per field.
+
+        Returns:
+            pd.DataFrame: The recorded events, oldest first.
+        """
+        return pd.DataFrame(self.columns(), columns=self._log.names)
+
+
+class SessionLog:
+    """ Compact replacement for the dictionary Simulator.ev_history, which summarizes finished sessions as columns.
+
+    EVs are kept while they are plugged in. When a session ends, its station id, arrival, departure, requested energy
+    and energy delivered are recorded in a ColumnarLog and the EV, including its battery, is released. See ColumnarLog
+    for the available retention policies, which apply to finished sessions.
+
+    The analysis functions which use ev_history read from both the finished sessions which are retained and the
+    sessions which are still in progress.
+
+    Args:
+        max_sessions (int): Number of most recently finished sessions to keep in memory, or 0 to keep none. If None,
+            all sessions are kept. Default None.
+        path (str): Directory to which finished sessions are streamed instead of being kept in memory. Default None.
+    """
+
+    fields = [('session_id', object), ('station_id', object), ('arrival', np.int64), ('departure', np.int64),
+               ('requested_energy', float), ('energy_delivered', float)]
+
+    def __init__(self, max_sessions=None, path=None):
+        self._log = ColumnarLog(self.fields, max_rows=max_sessions, path=path)
+        self._open = {}
+
+    def __len__(self):
+        """ Return the number of retained sessions, finished or in progress. """
+        return len(self._log) + len(self._open)
+
+    def __setitem__(self, session_id, ev):
+        """ Start tracking the session of an EV which was plugged in.
+
+        Args:
+            session_id (str): ID of the session.
+            ev (EV): The EV.
+        """
+        self._open[session_id] = ev
+
+    def __getitem__(self, session_id):
+        """ Return the EV of a session which is in progress.
+
+        Raises:
+            KeyError: Raised if no session with the given id is in progress.
+        """
+        return self._open[session_id]
+
+    def __contains__(self, session_id):
+        """ Return True if a session with the given id is in progress. """
+        return session_id in self._open
+
+    @property
+    def open_evs(self):
+        """ Return the EVs of all sessions in progress. (List[EV]) """
+        return list(self._open.values())
+
+    def close(self, session_id):
+        """ Record the summary of a finished session and stop tracking its EV.
+
+        Args:
+            session_id (str): ID of the session.
+
+        Returns:
+            None
+        """
+        ev = self._open.pop(session_id, None)
+        if ev is None:
+            return
+        self._log.append((ev.session_id, ev.station_id, ev.arrival, ev.departure, ev.requested_energy,
+                          ev.energy_delivered))
+
+    def fork(self, copy_ev=None):
+        """ Return a session log with the same sessions which shares the finished sessions with this log.
+
+        See ColumnarLog.fork. The sessions in progress are tracked separately by each log.
+
+        Args:
+            copy_ev (Callable[[EV], EV]): Function which returns the EV to track in the new log for each session in
+                progress. If None, the new log tracks the same EV objects as this log. Default None.
+
+        Returns:
+            SessionLog: The new log.
+        """
+        log = copy.copy(self)
+        log._log = self._log.fork()
+        log._open = {session_id: copy_ev(ev) if copy_ev is not None else ev for session_id, ev in self._open.items()}
+        return log
+
+    def column(self, name):
+        """ Return a field of all retained sessions, finished sessions first in the order they ended.
+
+        Args:
+            name (str): One of session_id, station_id, arrival, departure, requested_energy or energy_delivered.
+
+        Returns:
+            np.Array: Value of the field for each session.
+        """
+        finished = self._log.column(name)
+        if not self._open:
+            return finished
+        in_progress = np.array([getattr(ev, name) for ev in self._open.values()], dtype=finished.dtype)
+        return np.concatenate([finished, in_progress])
+
+    def as_df(self):
+        """ Return all retained sessions as a pandas DataFrame with a row per session and a column per field.
+
+        Returns:
+            pd.DataFrame: The retained sessions, finished sessions first.
+        """
+        names = [name for name, _ in self.fields]
+        return pd.DataFrame({name: self.column(name) for name in names}, columns=names)
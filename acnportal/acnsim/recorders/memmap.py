@@ -0,0 +1,217 @@
+import os
+
+import numpy as np
+
+from .time_series import TimeSeriesBuffer
+
+
+class MemmapTimeSeriesBuffer:
+    """ Growable 2-D buffer with one row per station and one column per period, stored in a file on disk.
+
+    Drop-in replacement for TimeSeriesBuffer for simulations whose results do not fit in memory. The contents are kept
+    in an np.memmap with one record per period, so each period is contiguous on disk and growing the buffer only
+    appends to the end of the file. Capacity is added in chunks of chunk_size periods rather than geometrically, since
+    unused capacity costs disk space rather than copies. As for TimeSeriesBuffer, columns beyond the logical width are
+    always zero.
+
+    Args:
+        path (str): Path of the file which backs the buffer. An existing file is overwritten.
+        rows (int): Number of rows (stations) in the buffer.
+        width (int): Initial logical width (periods) of the buffer. Default 0.
+        chunk_size (int): Number of periods by which the capacity is increased when the buffer is full. Also the
+            default number of periods returned at a time by iter_chunks. Default 1440.
+        dtype (np.dtype): Data type of the buffer. Default float.
+    """
+
+    def __init__(self, path, rows, width=0, chunk_size=1440, dtype=float):
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1. Got {0}'.format(chunk_size))
+        self._path = path
+        self._rows = rows
+        self._chunk_size = chunk_size
+        self._dtype = np.dtype(dtype)
+        self._width = width
+        # Create an empty file so that _open can always open the file in r+ mode.
+        open(path, 'wb').close()
+        self._data = None
+        self._open(self._chunked(width))
+
+    @classmethod
+    def from_array(cls, a, path, chunk_size=1440):
+        """ Create a buffer whose contents are a copy of the 2-D array a.
+
+        Args:
+            a (np.Array): 2-D array with one row per station and one column per period.
+            path (str): See MemmapTimeSeriesBuffer.
+            chunk_size (int): See MemmapTimeSeriesBuffer.
+
+        Returns:
+            MemmapTimeSeriesBuffer: A buffer with the same shape, dtype and contents as a.
+        """
+        a = np.asarray(a)
+        buffer = cls(path, a.shape[0], a.shape[1], chunk_size=chunk_size, dtype=a.dtype)
+        buffer.view()[:] = a
+        return buffer
+
+    @property
+    def path(self):
+        """ Return the path of the file which backs the buffer. (str) """
+        return self._path
+
+    @property
+    def width(self):
+        """ Return the logical width (number of periods) of the buffer. (int) """
+        return self._width
+
+    @property
+    def capacity(self):
+        """ Return the number of columns currently allocated. (int) """
+        return self._data.shape[0]
+
+    @property
+    def shape(self):
+        """ Return the logical shape (rows, width) of the buffer. (Tuple[int, int]) """
+        return self._rows, self._width
+
+    @property
+    def dtype(self):
+        """ Return the data type of the buffer. (np.dtype) """
+        return self._dtype
+
+    def view(self):
+        """ Return a view of the logical contents of the buffer.
+
+        The view is backed by the file, so writes to it are reflected in the buffer. The view is only valid until the
+        buffer next reallocates, so callers should not hold on to it across calls to ensure_width.
+
+        Returns:
+            np.Array: 2-D array of shape (rows, width).
+        """
+        return self._data[:self._width].T
+
+    def window(self, start, stop):
+        """ Return a view of the columns from start up to stop, which must be within the logical width.
+
+        Args:
+            start (int): First column of the window.
+            stop (int): Column after the last column of the window.
+
+        Returns:
+            np.Array: 2-D array of shape (rows, stop - start).
+        """
+        return self._data[start:stop].T
+
+    def fork(self, start):
+        """ Return an in-memory buffer with the same contents which shares the columns before start with this buffer.
+
+        The shared columns are read directly from the file, and only the columns from start onward are copied. See
+        TimeSeriesBuffer.fork.
+
+        Args:
+            start (int): Number of columns to share. At most the logical width.
+
+        Returns:
+            TimeSeriesBuffer: The new buffer.
+        """
+        return TimeSeriesBuffer._forked([self._data[:start].T], self._data[start:self._width].T.copy())
+
+    def iter_chunks(self, chunk_size=None):
+        """ Iterate over the logical contents of the buffer a block of periods at a time.
+
+        Args:
+            chunk_size (int): Maximum number of periods in each block. If None, chunk_size of the buffer is used.
+                Default None.
+
+        Yields:
+            Tuple[int, np.Array]: Index of the first period in the block and a view of the block with shape
+                (rows, periods in block). At least one, possibly empty, block is returned.
+        """
+        if chunk_size is None:
+            chunk_size = self._chunk_size
+        view = self.view()
+        for start in range(0, max(self._width, 1), chunk_size):
+            yield start, view[:, start:start + chunk_size]
+
+    def ensure_width(self, width):
+        """ Grow the logical width of the buffer to at least width, filling new columns with zeros.
+
+        Args:
+            width (int): Required logical width of the buffer.
+
+        Returns:
+            None
+        """
+        if width <= self._width:
+            return
+        if width > self.capacity:
+            self._open(self._chunked(width))
+        self._width = width
+
+    def record(self, period, values):
+        """ Record the values of all rows at period, growing the logical width if necessary.
+
+        Args:
+            period (int): Period of the values.
+            values (np.Array): Value of each row at period.
+
+        Returns:
+            None
+        """
+        self.ensure_width(period + 1)
+        self.view()[:, period] = values
+
+    def trim(self):
+        """ Release any allocated capacity beyond the logical width of the buffer, shrinking the file to match.
+
+        Reading a memory-mapped region beyond the end of a file which was truncated crashes the process, so the file is
+        not shrunk in place. Instead the logical contents are written to a new file which then replaces it. Views of
+        the buffer obtained before trim remain readable, but are backed by the replaced file, so they no longer reflect
+        changes to the buffer.
+
+        Returns:
+            None
+        """
+        if self.capacity <= self._width:
+            return
+        self.flush()
+        trimmed_path = self._path + '.trim'
+        with open(trimmed_path, 'wb') as f:
+            self._data[:self._width].tofile(f)
+        os.replace(trimmed_path, self._path)
+        self._data = None
+        self._open(self._width)
+
+    def flush(self):
+        """ Write any changes to the buffer to disk.
+
+        Returns:
+            None
+        """
+        if isinstance(self._data, np.memmap):
+            self._data.flush()
+
+    def _chunked(self, width):
+        """ Return the smallest multiple of chunk_size which is at least width. """
+        return -(-width // self._chunk_size) * self._chunk_size
+
+    def _open(self, capacity):
+        """ Resize the backing file to hold capacity periods and map it into memory.
+
+        Extending the file pads it with zeros, so new capacity does not need to be cleared.
+
+        Args:
+            capacity (int): Number of periods which the file should hold.
+
+        Returns:
+            None
+        """
+        if self._data is not None:
+            self.flush()
+            self._data = None
+        if capacity == 0 or self._rows == 0:
+            # np.memmap cannot map an empty file.
+            os.truncate(self._path, 0)
+            self._data = np.zeros((capacity, self._rows), dtype=self._dtype)
+            return
+        os.truncate(self._path, capacity * self._rows * self._dtype.itemsize)
+        self._data = np.memmap(self._path, dtype=self._dtype, mode='r+', shape=(capacity, self._rows))
@@ -0,0 +1,136 @@
+from bisect import bisect_right
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+
+class SimulationProfiler:
+    """ Accumulates the wall time spent in each phase of Simulator.run, and a histogram of scheduler latencies.
+
+    The profiler works like a stopwatch with laps: each call to lap attributes the time since the previous lap to a
+    phase, so timing a phase costs one call to perf_counter and a few additions. This makes it cheap enough to leave
+    on for long simulations. The phases of each iteration of Simulator.run are:
+        - events: Getting the events which are due from the event queue, and skipping idle periods if fast_forward
+            is set.
+        - scheduler: Running the scheduling algorithm.
+        - update_schedules: Validating the schedule and applying it to the pilot signals, including recording the
+            schedule history and calling schedule_applied hooks.
+        - update_pilots: Sending the pilot signals to the network.
+        - bookkeeping: Growing the recorded arrays and storing the charging rates, including calling iteration_end
+            hooks.
+    The time spent processing each event is additionally attributed to the type of the event, including calling the
+    hooks of the event.
+
+    Args:
+        latency_bins (List[float]): Increasing edges of the bins of the scheduler latency histogram. [s] If None,
+            three bins per decade from 1 microsecond to 1000 seconds are used. Default None.
+    """
+
+    phases = ('events', 'scheduler', 'update_schedules', 'update_pilots', 'bookkeeping')
+
+    def __init__(self, latency_bins=None):
+        if latency_bins is None:
+            latency_bins = np.logspace(-6, 3, 28)
+        self._latency_bins = [float(edge) for edge in latency_bins]
+        if len(self._latency_bins) < 2 or any(a >= b for a, b in zip(self._latency_bins, self._latency_bins[1:])):
+            raise ValueError('latency_bins must contain at least two increasing edges.')
+        self.reset()
+
+    def reset(self):
+        """ Discard all recorded times.
+
+        Returns:
+            None
+        """
+        self.times = dict.fromkeys(self.phases, 0.0)
+        self.calls = dict.fromkeys(self.phases, 0)
+        self.event_times = {}
+        self.event_calls = {}
+        self._latency_counts = [0] * (len(self._latency_bins) - 1)
+        self._mark = perf_counter()
+
+    def start(self):
+        """ Start timing the first phase from now.
+
+        Returns:
+            None
+        """
+        self._mark = perf_counter()
+
+    def lap(self, phase, count=True):
+        """ Attribute the time since the previous lap to a phase.
+
+        Args:
+            phase (str): One of phases.
+            count (bool): If False, the time is added to the phase without counting a call, for phases which are
+                timed in several parts. Default True.
+
+        Returns:
+            float: Time since the previous lap. [s]
+        """
+        now = perf_counter()
+        elapsed = now - self._mark
+        self._mark = now
+        self.times[phase] += elapsed
+        if count:
+            self.calls[phase] += 1
+        if phase == 'scheduler':
+            # Latencies outside the bins are counted in the first or last bin.
+            i = min(max(bisect_right(self._latency_bins, elapsed) - 1, 0), len(self._latency_counts) - 1)
+            self._latency_counts[i] += 1
+        return elapsed
+
+    def lap_event(self, event_type):
+        """ Attribute the time since the previous lap to processing an event.
+
+        Args:
+            event_type (str): Type of the event, e.g. Plugin.
+
+        Returns:
+            float: Time since the previous lap. [s]
+        """
+        now = perf_counter()
+        elapsed = now - self._mark
+        self._mark = now
+        self.event_times[event_type] = self.event_times.get(event_type, 0.0) + elapsed
+        self.event_calls[event_type] = self.event_calls.get(event_type, 0) + 1
+        return elapsed
+
+    @property
+    def total_time(self):
+        """ Return the total time attributed to all phases and events. [s] (float) """
+        return sum(self.times.values()) + sum(self.event_times.values())
+
+    def latency_histogram(self):
+        """ Return the histogram of scheduler latencies, in the form returned by np.histogram.
+
+        Returns:
+            Tuple[np.Array, np.Array]: Number of scheduler calls in each bin and the edges of the bins. [s]
+        """
+        return np.array(self._latency_counts), np.array(self._latency_bins)
+
+    def as_df(self):
+        """ Return the time spent in each phase as a pandas DataFrame.
+
+        Returns:
+            pd.DataFrame: DataFrame indexed by phase with columns total_time [s], calls and mean_time [s].
+        """
+        return self._summary(self.times, self.calls, list(self.phases), 'phase')
+
+    def events_as_df(self):
+        """ Return the time spent processing each type of event as a pandas DataFrame.
+
+        Returns:
+            pd.DataFrame: DataFrame indexed by event type with columns total_time [s], calls and mean_time [s].
+        """
+        return self._summary(self.event_times, self.event_calls, list(self.event_times), 'event_type')
+
+    @staticmethod
+    def _summary(times, calls, index, name):
+        """ Build a DataFrame with the total time, number of calls and mean time of each key in index. """
+        total_time = np.array([times[key] for key in index], dtype=float)
+        n_calls = np.array([calls[key] for key in index], dtype=int)
+        mean_time = np.divide(total_time, n_calls, out=np.zeros_like(total_time), where=n_calls > 0)
+        return pd.DataFrame({'total_time': total_time, 'calls': n_calls, 'mean_time': mean_time},
+                            index=pd.Index(index, name=name))
@@ -0,0 +1,248 @@
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+import numpy as np
+
+
+class ScheduleHistory:
+    """ Compact record of the schedules returned by a scheduling algorithm, keyed by the iteration of each call.
+
+    Consecutive schedules usually differ in only a few stations, so each call is stored as the difference from the
+    previous one: the stations whose schedule changed along with their new schedules, concatenated into one flat
+    array with an indptr giving the position of each, and the stations which were dropped from the schedule. The
+    stations are stored as integer codes, so each changed entry costs a few numbers rather than a list and a string.
+
+    To reconstruct a schedule without replaying every earlier call, the full schedule after every checkpoint_interval
+    calls is kept as a checkpoint. It only holds references to the stored pilot signals, so it costs one dictionary
+    entry per station. Reconstructing any schedule then replays at most checkpoint_interval calls.
+
+    Optionally only the last max_calls calls are retained. Older calls are folded into a base schedule when they are
+    dropped, so every retained call can still be reconstructed. The calls are kept in lists which are only compacted
+    once half of their entries have been dropped, so the iterations stay sorted for bisection.
+
+    ScheduleHistory supports reading like the dictionary Simulator uses when store_schedule_history is True: indexing
+    with an iteration returns the schedule in effect at that iteration, as a dictionary mapping station ids to numpy
+    arrays of pilot signals.
+
+    Args:
+        max_calls (int): Number of most recent calls to retain. If None, all calls are retained. Default None.
+        checkpoint_interval (int): Number of calls between checkpoints. Default 32.
+    """
+
+    def __init__(self, max_calls=None, checkpoint_interval=32):
+        if max_calls is not None and max_calls < 1:
+            raise ValueError('max_calls must be at least 1. Got {0}'.format(max_calls))
+        if checkpoint_interval < 1:
+            raise ValueError('checkpoint_interval must be at least 1. Got {0}'.format(checkpoint_interval))
+        self.max_calls = max_calls
+        self.checkpoint_interval = checkpoint_interval
+        # Map from station id to integer code and back.
+        self._codes = {}
+        self._station_ids = []
+        # Schedule in effect before the oldest retained call.
+        self._base = {}
+        # Schedule returned by the latest call, as reconstructed from the stored values.
+        self._last = {}
+        # Iterations of the calls, sorted, and one (changed codes, indptr, values, removed codes) tuple per call.
+        # Entries before _start have been dropped and are removed when the lists are compacted.
+        self._iterations = []
+        self._calls = []
+        self._start = 0
+        # Number of calls which have been dropped, i.e. the number of the oldest retained call counting from 0.
+        self._dropped = 0
+        # Map from the number of a call to the schedule after it, for every checkpoint_interval-th retained call.
+        self._checkpoints = {}
+
+    def __len__(self):
+        """ Return the number of retained calls. """
+        return len(self._iterations) - self._start
+
+    def __iter__(self):
+        """ Iterate over the iterations of the retained calls in increasing order. """
+        return islice(self._iterations, self._start, None)
+
+    def __contains__(self, iteration):
+        """ Return True if a call at the given iteration is retained. """
+        i = bisect_left(self._iterations, iteration, self._start)
+        return i < len(self._iterations) and self._iterations[i] == iteration
+
+    def __getitem__(self, iteration):
+        """ Return the schedule in effect at the given iteration. See schedule_at. """
+        return self.schedule_at(iteration)
+
+    def __setitem__(self, iteration, schedule):
+        """ Record a schedule given as a dictionary. See record. """
+        self.record(iteration, schedule)
+
+    def keys(self):
+        """ Return the iterations of the retained calls in increasing order. (List[int]) """
+        return self._iterations[self._start:]
+
+    def items(self):
+        """ Iterate over the iteration and reconstructed schedule of each retained call.
+
+        The schedules are reconstructed incrementally, so this is much cheaper than calling schedule_at for each call.
+
+        Yields:
+            Tuple[int, Dict[str, np.Array]]: The iteration and schedule of each retained call.
+        """
+        state = dict(self._base)
+        for iteration, call in zip(self, islice(self._calls, self._start, None)):
+            self._apply(state, call)
+            yield iteration, dict(state)
+
+    def copy(self):
+        """ Return an independent copy of the history.
+
+        The stored pilot signals are read-only, so the copy shares them with the original and only copies the
+        containers which hold them.
+
+        Returns:
+            ScheduleHistory: Copy of the history, to which calls can be recorded without affecting the original.
+        """
+        history = ScheduleHistory(self.max_calls, self.checkpoint_interval)
+        history._codes = dict(self._codes)
+        history._station_ids = list(self._station_ids)
+        history._base = dict(self._base)
+        history._last = dict(self._last)
+        history._iterations = self._iterations[self._start:]
+        history._calls = self._calls[self._start:]
+        history._dropped = self._dropped
+        # Checkpoints are never modified once taken, so they are shared as well.
+        history._checkpoints = dict(self._checkpoints)
+        return history
+
+    @property
+    def nnz(self):
+        """ Return the number of pilot signals stored for all retained calls. (int) """
+        return sum(len(values) for _, _, values, _ in islice(self._calls, self._start, None))
+
+    def record(self, iteration, schedule, station_ids=None):
+        """ Record the schedule returned at iteration.
+
+        Args:
+            iteration (int): Iteration at which the schedule was returned. Must be larger than that of every
+                previously recorded call.
+            schedule (Dict[str, List[number]], np.Array, or Tuple[np.Array, np.Array]): Schedule in one of the forms
+                which BaseAlgorithm.schedule may return.
+            station_ids (List[str]): IDs of the stations in the network, used to interpret schedules given as arrays.
+                Default None.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: Raised if iteration is not larger than that of the last recorded call, or if schedule is given
+                as an array but station_ids is None.
+        """
+        if len(self) and iteration <= self._iterations[-1]:
+            raise ValueError('Iteration {0} is not after the last recorded iteration {1}.'.format(
+                iteration, self._iterations[-1]))
+        schedule = self._as_dict(schedule, station_ids)
+
+        changed, indptr, values = [], [0], []
+        for station_id, pilots in schedule.items():
+            previous = self._last.get(station_id)
+            if previous is None or not np.array_equal(previous, pilots):
+                changed.append(self._code(station_id))
+                values.append(pilots)
+                indptr.append(indptr[-1] + len(pilots))
+        removed = [self._codes[station_id] for station_id in self._last if station_id not in schedule]
+
+        values = np.concatenate(values) if values else np.zeros(0)
+        # Reconstructed schedules share memory with the stored values, so protect them from modification.
+        values.setflags(write=False)
+        call = (np.array(changed, dtype=np.int32), np.array(indptr, dtype=np.int64), values,
+                np.array(removed, dtype=np.int32))
+        self._apply(self._last, call)
+        number = self._dropped + len(self)
+        self._iterations.append(iteration)
+        self._calls.append(call)
+        if (number + 1) % self.checkpoint_interval == 0:
+            self._checkpoints[number] = dict(self._last)
+        if self.max_calls is not None:
+            while len(self) > self.max_calls:
+                self._apply(self._base, self._calls[self._start])
+                self._checkpoints.pop(self._dropped, None)
+                self._calls[self._start] = None
+                self._start += 1
+                self._dropped += 1
+            if 2 * self._start >= len(self._iterations):
+                del self._iterations[:self._start]
+                del self._calls[:self._start]
+                self._start = 0
+
+    def schedule_at(self, iteration):
+        """ Reconstruct the schedule in effect at the given iteration, i.e. the one returned by the last call at or
+        before it. The calls since the nearest checkpoint before that call are replayed.
+
+        Args:
+            iteration (int): Iteration at or after that of the oldest retained call.
+
+        Returns:
+            Dict[str, np.Array]: Dictionary mapping station ids to the schedule of pilot signals returned for them.
+
+        Raises:
+            KeyError: Raised if iteration is before the oldest retained call.
+        """
+        end = bisect_right(self._iterations, iteration, self._start)
+        if end == self._start:
+            raise KeyError('No schedule recorded at or before iteration {0}.'.format(iteration))
+        if end == len(self._iterations):
+            return dict(self._last)
+        # Number of the call to reconstruct and of the latest checkpoint at or before it.
+        number = self._dropped + end - 1 - self._start
+        checkpoint = number - (number + 1) % self.checkpoint_interval
+        if checkpoint >= self._dropped:
+            state = dict(self._checkpoints[checkpoint])
+            begin = self._start + checkpoint + 1 - self._dropped
+        else:
+            state = dict(self._base)
+            begin = self._start
+        for call in islice(self._calls, begin, end):
+            self._apply(state, call)
+        return state
+
+    def _code(self, station_id):
+        """ Return the integer code of a station, assigning a new one if it has not been seen before. """
+        code = self._codes.get(station_id)
+        if code is None:
+            code = self._codes[station_id] = len(self._station_ids)
+            self._station_ids.append(station_id)
+        return code
+
+    def _apply(self, state, call):
+        """ Update a schedule dictionary in place with the changes of a call.
+
+        Args:
+            state (Dict[str, np.Array]): Schedule before the call.
+            call (Tuple[np.Array, np.Array, np.Array, np.Array]): Stored changes of the call.
+
+        Returns:
+            None
+        """
+        changed, indptr, values, removed = call
+        for code in removed:
+            del state[self._station_ids[code]]
+        for i, code in enumerate(changed):
+            state[self._station_ids[code]] = values[indptr[i]:indptr[i + 1]]
+
+    @staticmethod
+    def _as_dict(schedule, station_ids):
+        """ Convert a schedule in any of the forms which BaseAlgorithm.schedule may return to a dictionary of arrays.
+
+        Args:
+            schedule (Dict[str, List[number]], np.Array, or Tuple[np.Array, np.Array]): See record.
+            station_ids (List[str]): See record.
+
+        Returns:
+            Dict[str, np.Array]: Dictionary mapping station ids to their schedule of pilot signals.
+        """
+        if isinstance(schedule, dict):
+            return {station_id: np.array(pilots, dtype=float) for station_id, pilots in schedule.items()}
+        if station_ids is None:
+            raise ValueError('station_ids are required to record schedules given as arrays.')
+        if isinstance(schedule, tuple):
+            rows, matrix = schedule
+            return {station_ids[row]: np.array(pilots, dtype=float) for row, pilots in zip(rows, matrix)}
+        return {station_id: np.array(pilots, dtype=float) for station_id, pilots in zip(station_ids, schedule)}
@@ -0,0 +1,342 @@
+import numpy as np
+
+
+class SessionTimeSeries:
+    """ Compact storage of a per-station time series which is zero whenever no EV is plugged in.
+
+    Instead of a dense matrix with one row per station and one column per period, the values are stored per charging
+    session, as the period at which the session started and a contiguous array with one value per period of the
+    session. Memory therefore scales with the total time EVs are plugged in rather than with the number of stations
+    times the length of the simulation.
+
+    Sessions which have been closed are stored CSR-style: the values of all sessions are concatenated into a single
+    array, and indptr gives the position of each session in it, so the values of closed session i are
+    values[indptr[i]:indptr[i + 1]]. Sessions which are still open are kept separately until they are closed.
+
+    SessionTimeSeries supports the same reading interface as TimeSeriesBuffer, but view and iter_chunks return dense
+    copies reconstructed on demand, so writes to them are not reflected in the storage. Values are written with
+    record instead.
+
+    A time series created with fork shares the sessions closed before the fork with the time series it was forked
+    from, and only stores the sessions closed after the fork itself.
+
+    Args:
+        rows (int): Number of rows (stations) in the time series.
+        width (int): Initial logical width (periods) of the time series. Default 0.
+        dtype (np.dtype): Data type of the values. Default float.
+    """
+
+    def __init__(self, rows, width=0, dtype=float):
+        self._rows = rows
+        self._width = width
+        self._dtype = np.dtype(dtype)
+        # Sessions closed before this time series was forked, as tuples of (session ids, station indices, starts,
+        # indptr, values, count) of which only the first count sessions belong to this time series.
+        self._shared = []
+        # Closed sessions. indptr gives positions in values, so does not include the values of shared sessions.
+        self._session_ids = []
+        self._station_indices = []
+        self._starts = []
+        self._indptr = [0]
+        self._values = np.zeros(0, dtype=self._dtype)
+        # Open sessions, as a map from row to [session id, start, list of values].
+        self._open = {}
+
+    @classmethod
+    def from_array(cls, a):
+        """ Create a time series whose contents are those of the 2-D array a.
+
+        Since a does not identify charging sessions, each run of consecutive nonzero values in a row is stored as a
+        closed session with session id None.
+
+        Args:
+            a (np.Array): 2-D array with one row per station and one column per period.
+
+        Returns:
+            SessionTimeSeries: A time series with the same shape, dtype and contents as a.
+        """
+        a = np.asarray(a)
+        series = cls(a.shape[0], a.shape[1], dtype=a.dtype)
+        for row in range(a.shape[0]):
+            nonzero = np.concatenate([[False], a[row] != 0, [False]])
+            edges = np.flatnonzero(nonzero[1:] != nonzero[:-1])
+            for start, end in zip(edges[::2], edges[1::2]):
+                series._close(None, row, start, a[row, start:end])
+        return series
+
+    @property
+    def width(self):
+        """ Return the logical width (number of periods) of the time series. (int) """
+        return self._width
+
+    @property
+    def shape(self):
+        """ Return the logical shape (rows, width) of the time series. (Tuple[int, int]) """
+        return self._rows, self._width
+
+    @property
+    def dtype(self):
+        """ Return the data type of the values. (np.dtype) """
+        return self._dtype
+
+    @property
+    def nnz(self):
+        """ Return the number of values stored for all sessions, open or closed. (int) """
+        return sum(indptr[count] for _, _, _, indptr, _, count in self._layers()) + \
+            sum(len(values) for _, _, values in self._open.values())
+
+    @property
+    def session_ids(self):
+        """ Return the session id of each closed session. (List[str]) """
+        return [session_id for session_ids, _, _, _, _, count in self._layers() for session_id in session_ids[:count]]
+
+    @property
+    def station_indices(self):
+        """ Return the row (station index) of each closed session. (np.Array) """
+        return np.array([row for _, rows, _, _, _, count in self._layers() for row in rows[:count]], dtype=int)
+
+    @property
+    def starts(self):
+        """ Return the period at which each closed session started. (np.Array) """
+        return np.array([start for _, _, starts, _, _, count in self._layers() for start in starts[:count]], dtype=int)
+
+    @property
+    def indptr(self):
+        """ Return the position of the values of each closed session in values. (np.Array) """
+        indptr, offset = [0], 0
+        for _, _, _, layer_indptr, _, count in self._layers():
+            indptr.extend(offset + position for position in layer_indptr[1:count + 1])
+            offset += layer_indptr[count]
+        return np.array(indptr, dtype=int)
+
+    @property
+    def values(self):
+        """ Return the concatenated values of all closed sessions. (np.Array) """
+        if not self._shared:
+            return self._values[:self._indptr[-1]]
+        return np.concatenate([values[:indptr[count]] for _, _, _, indptr, values, count in self._layers()])
+
+    def fork(self):
+        """ Return a time series with the same contents which shares the closed sessions with this time series.
+
+        Only the open sessions are copied, so forking costs time and memory proportional to the number of open
+        sessions and their length. Sessions closed later in either time series are not seen by the other.
+
+        Returns:
+            SessionTimeSeries: The new time series.
+        """
+        series = type(self)(self._rows, self._width, dtype=self._dtype)
+        for session_ids, rows, starts, indptr, values, count in self._layers():
+            if count:
+                values = values[:indptr[count]]
+                values.setflags(write=False)
+                series._shared.append((session_ids, rows, starts, indptr, values, count))
+        series._open = {row: [session_id, start, list(values)]
+                        for row, (session_id, start, values) in self._open.items()}
+        return series
+
+    def open_session(self, row, session_id, start):
+        """ Start recording the values of a new session at row from period start onward.
+
+        If a session is already open at row it is closed at period start.
+
+        Args:
+            row (int): Row (station index) of the session.
+            session_id (str): ID of the session.
+            start (int): Period at which the session starts.
+
+        Returns:
+            None
+        """
+        if row in self._open:
+            self.close_session(row, start)
+        self._open[row] = [session_id, start, []]
+
+    def close_session(self, row, end):
+        """ Stop recording the session which is open at row. Values recorded at or after period end are discarded.
+
+        Args:
+            row (int): Row (station index) of the session.
+            end (int): Period at which the session ended.
+
+        Returns:
+            None
+        """
+        if row not in self._open:
+            return
+        session_id, start, values = self._open.pop(row)
+        self._close(session_id, row, start, np.array(values[:max(end - start, 0)], dtype=self._dtype))
+
+    def record(self, period, values):
+        """ Record the values of all open sessions at period, growing the logical width if necessary.
+
+        Args:
+            period (int): Period of the values.
+            values (np.Array): Value of each row at period. Values of rows without an open session are ignored, since
+                they are assumed to be zero.
+
+        Returns:
+            None
+        """
+        self.ensure_width(period + 1)
+        for row, (_, start, session_values) in self._open.items():
+            if period < start:
+                continue
+            if len(session_values) < period - start:
+                session_values.extend([0] * (period - start - len(session_values)))
+            session_values.append(values[row])
+
+    def ensure_width(self, width):
+        """ Grow the logical width of the time series to at least width. New periods are zero.
+
+        Args:
+            width (int): Required logical width of the time series.
+
+        Returns:
+            None
+        """
+        self._width = max(self._width, width)
+
+    def trim(self):
+        """ Release any allocated capacity beyond the values of the closed sessions.
+
+        Returns:
+            None
+        """
+        if len(self._values) > self._indptr[-1]:
+            self._values = self._values[:self._indptr[-1]].copy()
+
+    def sessions(self):
+        """ Iterate over all sessions, closed sessions first in the order in which they were closed, then open ones.
+
+        Yields:
+            Tuple[str, int, int, np.Array]: The session id, row and start period of each session, and its values with
+                one value per period from start onward.
+        """
+        for session_ids, rows, starts, indptr, values, count in self._layers():
+            for i in range(count):
+                yield session_ids[i], rows[i], starts[i], values[indptr[i]:indptr[i + 1]]
+        for row, (session_id, start, values) in self._open.items():
+            yield session_id, row, start, np.array(values, dtype=self._dtype)
+
+    def session(self, session_id):
+        """ Return the row, start period and values of a session. If several sessions have the same id, the last
+        one is returned.
+
+        Args:
+            session_id (str): ID of the session.
+
+        Returns:
+            Tuple[int, int, np.Array]: The row and start period of the session, and its values.
+
+        Raises:
+            KeyError: Raised if no session with the given id has been recorded.
+        """
+        found = None
+        for sid, row, start, values in self.sessions():
+            if sid == session_id:
+                found = (row, start, values)
+        if found is None:
+            raise KeyError('Session {0} not found.'.format(session_id))
+        return found
+
+    def row(self, row):
+        """ Return a dense copy of one row of the time series.
+
+        Args:
+            row (int): Row (station index) to return.
+
+        Returns:
+            np.Array: 1-D array with one value per period.
+        """
+        dense = np.zeros(self._width, dtype=self._dtype)
+        for _, session_row, start, values in self.sessions():
+            if session_row == row:
+                values = values[:max(self._width - start, 0)]
+                dense[start:start + len(values)] = values
+        return dense
+
+    def view(self):
+        """ Return a dense copy of the time series.
+
+        Unlike TimeSeriesBuffer.view, the result does not share memory with the time series.
+
+        Returns:
+            np.Array: 2-D array of shape (rows, width).
+        """
+        return next(self.iter_chunks())[1]
+
+    def iter_chunks(self, chunk_size=None):
+        """ Iterate over dense copies of the time series a block of periods at a time.
+
+        Args:
+            chunk_size (int): Maximum number of periods in each block. If None, the whole time series is returned as a
+                single block. Default None.
+
+        Yields:
+            Tuple[int, np.Array]: Index of the first period in the block and a dense copy of the block with shape
+                (rows, periods in block). At least one, possibly empty, block is returned.
+        """
+        if chunk_size is None:
+            chunk_size = max(self._width, 1)
+        periods, rows, values = self._flatten()
+        for begin in range(0, max(self._width, 1), chunk_size):
+            end = min(begin + chunk_size, self._width)
+            lo, hi = np.searchsorted(periods, [begin, end])
+            dense = np.zeros((self._rows, end - begin), dtype=self._dtype)
+            dense[rows[lo:hi], periods[lo:hi] - begin] = values[lo:hi]
+            yield begin, dense
+
+    def _flatten(self):
+        """ Return the period, row and value of every value stored for all sessions, sorted by period.
+
+        Returns:
+            Tuple[np.Array, np.Array, np.Array]: The period, row and value of each stored value.
+        """
+        session_rows, starts, lengths, values = [], [], [], []
+        for _, row, start, session_values in self.sessions():
+            session_rows.append(row)
+            starts.append(start)
+            lengths.append(len(session_values))
+            values.append(session_values)
+        lengths = np.array(lengths, dtype=int)
+        offsets = np.cumsum(lengths) - lengths
+        periods = np.repeat(np.array(starts, dtype=int) - offsets, lengths) + np.arange(lengths.sum())
+        rows = np.repeat(np.array(session_rows, dtype=int), lengths)
+        values = np.concatenate(values) if values else np.zeros(0, dtype=self._dtype)
+        order = np.argsort(periods, kind='stable')
+        return periods[order], rows[order], values[order]
+
+    def _layers(self):
+        """ Return the closed sessions shared with other time series followed by those of this time series.
+
+        Returns:
+            List[Tuple[list, list, list, list, np.Array, int]]: The session ids, station indices, starts, indptr and
+                values of each layer, and the number of sessions in the layer.
+        """
+        return self._shared + [(self._session_ids, self._station_indices, self._starts, self._indptr, self._values,
+                                len(self._session_ids))]
+
+    def _close(self, session_id, row, start, values):
+        """ Append the values of a session to the closed sessions.
+
+        Args:
+            session_id (str): ID of the session.
+            row (int): Row (station index) of the session.
+            start (int): Period at which the session started.
+            values (np.Array): Values of the session.
+
+        Returns:
+            None
+        """
+        nnz = self._indptr[-1]
+        if nnz + len(values) > len(self._values):
+            # Grow geometrically so that closing sessions one at a time takes constant amortized time per value.
+            new_values = np.zeros(max(nnz + len(values), 2 * len(self._values)), dtype=self._dtype)
+            new_values[:nnz] = self._values[:nnz]
+            self._values = new_values
+        self._values[nnz:nnz + len(values)] = values
+        self._session_ids.append(session_id)
+        self._station_indices.append(row)
+        self._starts.append(int(start))
+        self._indptr.append(nnz + len(values))
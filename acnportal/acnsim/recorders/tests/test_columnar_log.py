@@ -0,0 +1,92 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from acnportal.acnsim.recorders import ColumnarLog
+
+
+class TestColumnarLog(TestCase):
+    columns = [('time', np.int64), ('station', object), ('value', float)]
+    records = [(0, 'PS-001', 1.5), (1, 'PS-002', 2.5), (2, 'PS-001', 3.5), (3, None, 4.5)]
+
+    def _fill(self, log):
+        for record in self.records:
+            log.append(record)
+        return log
+
+    def test_all_in_memory(self):
+        log = self._fill(ColumnarLog(self.columns))
+        self.assertEqual(len(log), 4)
+        np.testing.assert_array_equal(log.column('time'), [0, 1, 2, 3])
+        self.assertEqual(list(log.column('station')), ['PS-001', 'PS-002', 'PS-001', None])
+        np.testing.assert_array_equal(log.column('value'), [1.5, 2.5, 3.5, 4.5])
+
+    def test_grows_past_initial_capacity(self):
+        log = ColumnarLog(self.columns)
+        for i in range(100):
+            log.append((i, str(i % 3), i / 2))
+        np.testing.assert_array_equal(log.column('time'), np.arange(100))
+        self.assertEqual(log.column('station')[-1], '0')
+
+    def test_fork(self):
+        log = self._fill(ColumnarLog(self.columns))
+        fork = log.fork()
+        fork.append((4, 'PS-002', 5.5))
+        fork.append((5, 'PS-003', 6.5))
+        log.append((4, 'PS-004', 0.5))
+        self.assertEqual(len(fork), 6)
+        np.testing.assert_array_equal(fork.column('time'), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(list(fork.column('station')), ['PS-001', 'PS-002', 'PS-001', None, 'PS-002', 'PS-003'])
+        self.assertEqual(list(log.column('station')), ['PS-001', 'PS-002', 'PS-001', None, 'PS-004'])
+        self.assertEqual(list(fork.fork().column('value')), [1.5, 2.5, 3.5, 4.5, 5.5, 6.5])
+
+    def test_fork_ring_buffer(self):
+        log = self._fill(ColumnarLog(self.columns, max_rows=3))
+        fork = log.fork()
+        fork.append((4, 'PS-002', 5.5))
+        np.testing.assert_array_equal(fork.column('time'), [2, 3, 4])
+        np.testing.assert_array_equal(log.column('time'), [1, 2, 3])
+
+    def test_fork_on_disk(self):
+        with tempfile.TemporaryDirectory() as path:
+            with self.assertRaises(ValueError):
+                ColumnarLog(self.columns, path=path).fork()
+
+    def test_ring_buffer(self):
+        log = self._fill(ColumnarLog(self.columns, max_rows=3))
+        self.assertEqual(len(log), 3)
+        self.assertEqual(log.appended, 4)
+        np.testing.assert_array_equal(log.column('time'), [1, 2, 3])
+        self.assertEqual(list(log.column('station')), ['PS-002', 'PS-001', None])
+
+    def test_none(self):
+        log = self._fill(ColumnarLog(self.columns, max_rows=0))
+        self.assertEqual(len(log), 0)
+        self.assertEqual(log.appended, 4)
+        self.assertEqual(len(log.column('station')), 0)
+
+    def test_on_disk(self):
+        with tempfile.TemporaryDirectory() as path:
+            log = ColumnarLog(self.columns, path=path, batch_size=3)
+            self._fill(log)
+            self.assertEqual(os.path.getsize(os.path.join(path, 'time.bin')), 3 * 8)
+            columns = log.columns()
+            np.testing.assert_array_equal(columns['time'], [0, 1, 2, 3])
+            self.assertEqual(list(columns['station']), ['PS-001', 'PS-002', 'PS-001', None])
+            np.testing.assert_array_equal(columns['value'], [1.5, 2.5, 3.5, 4.5])
+            self.assertEqual(os.path.getsize(os.path.join(path, 'station.bin')), 4 * 4)
+
+    def test_on_disk_forgotten_codes(self):
+        with tempfile.TemporaryDirectory() as path:
+            log = ColumnarLog(self.columns, path=path)
+            log.code_cache_size = 1
+            self._fill(log)
+            self.assertEqual(list(log.column('station')), ['PS-001', 'PS-002', 'PS-001', None])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ColumnarLog(self.columns, max_rows=-1)
+        with self.assertRaises(ValueError):
+            ColumnarLog(self.columns, max_rows=2, path='log')
@@ -0,0 +1,77 @@
+from unittest import TestCase
+
+import numpy as np
+
+from acnportal.acnsim.events import PluginEvent, UnplugEvent, RecomputeEvent
+from acnportal.acnsim.models import EV, Battery
+from acnportal.acnsim.recorders import EventLog, SessionLog
+
+
+class TestEventLog(TestCase):
+    def test_append(self):
+        log = EventLog()
+        ev = EV(0, 10, 25.0, 'PS-001', '0001', Battery(100, 0, 7.68))
+        for event in [PluginEvent(0, ev), RecomputeEvent(5), UnplugEvent(10, 'PS-001', '0001')]:
+            log.append(event)
+        df = log.as_df()
+        self.assertEqual(list(df.columns), ['timestamp', 'type', 'station_id', 'session_id'])
+        self.assertEqual(list(df['timestamp']), [0, 5, 10])
+        self.assertEqual(list(df['type']), ['Plugin', 'Recompute', 'Unplug'])
+        self.assertEqual(list(df['station_id']), ['PS-001', None, 'PS-001'])
+        self.assertEqual(list(df['session_id']), ['0001', None, '0001'])
+
+    def test_max_events(self):
+        log = EventLog(max_events=1)
+        log.append(RecomputeEvent(1))
+        log.append(RecomputeEvent(2))
+        self.assertEqual(len(log), 1)
+        self.assertEqual(log.appended, 2)
+        np.testing.assert_array_equal(log.columns()['timestamp'], [2])
+
+    def test_fork(self):
+        log = EventLog()
+        log.append(RecomputeEvent(1))
+        fork = log.fork()
+        fork.append(RecomputeEvent(2))
+        np.testing.assert_array_equal(log.columns()['timestamp'], [1])
+        np.testing.assert_array_equal(fork.columns()['timestamp'], [1, 2])
+
+
+class TestSessionLog(TestCase):
+    def setUp(self):
+        self.log = SessionLog()
+        self.ev1 = EV(0, 10, 25.0, 'PS-001', '0001', Battery(100, 0, 7.68))
+        self.ev2 = EV(5, 20, 10.0, 'PS-002', '0002', Battery(100, 0, 7.68))
+        self.log['0001'] = self.ev1
+        self.log['0002'] = self.ev2
+        self.ev1.charge(16, 240, 5)
+
+    def test_close_releases_ev(self):
+        self.log.close('0001')
+        self.assertNotIn('0001', self.log)
+        self.assertIs(self.log['0002'], self.ev2)
+        self.assertEqual(len(self.log), 2)
+        self.assertEqual(self.log.open_evs, [self.ev2])
+
+    def test_columns_include_sessions_in_progress(self):
+        self.log.close('0001')
+        self.assertEqual(list(self.log.column('session_id')), ['0001', '0002'])
+        np.testing.assert_allclose(self.log.column('energy_delivered'), [0.32, 0])
+        np.testing.assert_array_equal(self.log.column('requested_energy'), [25.0, 10.0])
+        self.assertEqual(list(self.log.as_df()['departure']), [10, 20])
+
+    def test_max_sessions(self):
+        log = SessionLog(max_sessions=0)
+        log['0001'] = self.ev1
+        log.close('0001')
+        self.assertEqual(len(log), 0)
+
+    def test_fork(self):
+        self.log.close('0001')
+        ev2_copy = EV(5, 20, 10.0, 'PS-002', '0002', Battery(100, 0, 7.68))
+        fork = self.log.fork(lambda ev: ev2_copy)
+        self.assertIs(fork['0002'], ev2_copy)
+        self.assertIs(self.log['0002'], self.ev2)
+        fork.close('0002')
+        self.assertIn('0002', self.log)
+        self.assertEqual(list(fork.column('session_id')), ['0001', '0002'])
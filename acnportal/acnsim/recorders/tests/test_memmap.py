@@ -0,0 +1,105 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from acnportal.acnsim.recorders import MemmapTimeSeriesBuffer, TimeSeriesBuffer
+
+
+class TestMemmapTimeSeriesBuffer(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'buffer.dat')
+        self.buffer = MemmapTimeSeriesBuffer(self.path, 3, 2, chunk_size=4)
+
+    def tearDown(self):
+        del self.buffer
+        self.dir.cleanup()
+
+    def test_init(self):
+        self.assertEqual(self.buffer.shape, (3, 2))
+        self.assertEqual(self.buffer.capacity, 4)
+        np.testing.assert_array_equal(self.buffer.view(), np.zeros((3, 2)))
+        self.assertEqual(os.path.getsize(self.path), 4 * 3 * 8)
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            MemmapTimeSeriesBuffer(self.path, 3, 2, chunk_size=0)
+
+    def test_ensure_width_grows_in_chunks(self):
+        self.buffer.ensure_width(4)
+        self.assertEqual(self.buffer.capacity, 4)
+        self.buffer.ensure_width(5)
+        self.assertEqual(self.buffer.width, 5)
+        self.assertEqual(self.buffer.capacity, 8)
+        self.buffer.ensure_width(13)
+        self.assertEqual(self.buffer.capacity, 16)
+
+    def test_ensure_width_smaller_is_noop(self):
+        self.buffer.ensure_width(1)
+        self.assertEqual(self.buffer.width, 2)
+
+    def test_ensure_width_preserves_contents(self):
+        self.buffer.view()[:] = [[1, 2], [3, 4], [5, 6]]
+        self.buffer.ensure_width(5)
+        np.testing.assert_array_equal(self.buffer.view(),
+                                      np.array([[1, 2, 0, 0, 0], [3, 4, 0, 0, 0], [5, 6, 0, 0, 0]]))
+
+    def test_view_is_backed_by_file(self):
+        self.buffer.view()[1, 0] = 7
+        self.buffer.flush()
+        on_disk = np.fromfile(self.path, dtype=float).reshape((-1, 3))
+        self.assertEqual(on_disk[0, 1], 7)
+
+    def test_from_array(self):
+        a = np.array([[1, 2], [3, 4]])
+        buffer = MemmapTimeSeriesBuffer.from_array(a, self.path)
+        np.testing.assert_array_equal(buffer.view(), a)
+        self.assertEqual(buffer.dtype, a.dtype)
+
+    def test_iter_chunks(self):
+        self.buffer.ensure_width(5)
+        self.buffer.view()[:] = np.arange(15).reshape((3, 5))
+        chunks = list(self.buffer.iter_chunks())
+        self.assertEqual([start for start, _ in chunks], [0, 4])
+        np.testing.assert_array_equal(np.hstack([block for _, block in chunks]), self.buffer.view())
+
+    def test_trim(self):
+        self.buffer.ensure_width(3)
+        self.buffer.view()[:, 2] = 1
+        self.buffer.trim()
+        self.assertEqual(self.buffer.capacity, 3)
+        self.assertEqual(os.path.getsize(self.path), 3 * 3 * 8)
+        np.testing.assert_array_equal(self.buffer.view()[:, 2], np.ones(3))
+
+    def test_trim_keeps_earlier_views_readable(self):
+        self.buffer.ensure_width(3)
+        view = self.buffer.view()[1:]
+        view[:, 2] = 1
+        self.buffer.trim()
+        self.assertEqual(self.buffer.capacity, 3)
+        self.assertEqual(os.path.getsize(self.path), 3 * 3 * 8)
+        self.assertFalse(os.path.exists(self.path + '.trim'))
+        np.testing.assert_array_equal(view[:, 2], np.ones(2))
+        self.buffer.view()[1:, 2] = 2
+        np.testing.assert_array_equal(view[:, 2], np.ones(2))
+        self.buffer.ensure_width(5)
+        np.testing.assert_array_equal(self.buffer.view()[:, 2:], [[0, 0, 0], [2, 0, 0], [2, 0, 0]])
+
+    def test_trim_empty(self):
+        buffer = MemmapTimeSeriesBuffer(self.path, 3)
+        buffer.trim()
+        self.assertEqual(buffer.shape, (3, 0))
+        buffer.ensure_width(2)
+        np.testing.assert_array_equal(buffer.view(), np.zeros((3, 2)))
+
+    def test_fork(self):
+        self.buffer.view()[:] = [[1, 2], [3, 4], [5, 6]]
+        fork = self.buffer.fork(1)
+        self.assertIsInstance(fork, TimeSeriesBuffer)
+        self.assertTrue(np.shares_memory(fork.window(0, 1), self.buffer.view()))
+        fork.record(2, [7, 8, 9])
+        np.testing.assert_array_equal(fork.view(), [[1, 2, 7], [3, 4, 8], [5, 6, 9]])
+        self.assertEqual(self.buffer.width, 2)
+        del fork
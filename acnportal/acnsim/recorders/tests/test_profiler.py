@@ -0,0 +1,66 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from acnportal.acnsim.recorders import SimulationProfiler
+
+
+class TestSimulationProfiler(TestCase):
+    def setUp(self):
+        self.profiler = SimulationProfiler(latency_bins=[0.1, 1, 10])
+        self.clock = patch('acnportal.acnsim.recorders.profiler.perf_counter').start()
+        self.addCleanup(patch.stopall)
+        self.clock.return_value = 0.0
+        self.profiler.start()
+
+    def tick(self, t):
+        self.clock.return_value = t
+
+    def test_lap(self):
+        self.tick(1.0)
+        self.assertEqual(self.profiler.lap('events'), 1.0)
+        self.tick(3.0)
+        self.profiler.lap('bookkeeping', count=False)
+        self.tick(3.5)
+        self.profiler.lap('bookkeeping')
+        self.assertEqual(self.profiler.times['events'], 1.0)
+        self.assertEqual(self.profiler.times['bookkeeping'], 2.5)
+        self.assertEqual(self.profiler.calls['bookkeeping'], 1)
+        self.assertEqual(self.profiler.total_time, 3.5)
+        df = self.profiler.as_df()
+        self.assertEqual(list(df.index), list(SimulationProfiler.phases))
+        self.assertEqual(df.loc['bookkeeping', 'mean_time'], 2.5)
+        self.assertEqual(df.loc['scheduler', 'mean_time'], 0)
+
+    def test_lap_event(self):
+        for t, event_type in [(1.0, 'Plugin'), (1.5, 'Unplug'), (3.5, 'Plugin')]:
+            self.tick(t)
+            self.profiler.lap_event(event_type)
+        df = self.profiler.events_as_df()
+        self.assertEqual(list(df.index), ['Plugin', 'Unplug'])
+        self.assertEqual(list(df['calls']), [2, 1])
+        self.assertEqual(list(df['total_time']), [3.0, 0.5])
+
+    def test_latency_histogram(self):
+        for t in [0.01, 0.5, 0.8, 5.0, 100.0]:
+            self.profiler.start()
+            self.tick(self.clock.return_value + t)
+            self.profiler.lap('scheduler')
+        counts, edges = self.profiler.latency_histogram()
+        np.testing.assert_array_equal(counts, [3, 2])
+        np.testing.assert_array_equal(edges, [0.1, 1, 10])
+        self.assertEqual(self.profiler.calls['scheduler'], 5)
+
+    def test_reset(self):
+        self.tick(1.0)
+        self.profiler.lap('scheduler')
+        self.profiler.lap_event('Plugin')
+        self.profiler.reset()
+        self.assertEqual(self.profiler.total_time, 0)
+        self.assertEqual(self.profiler.event_calls, {})
+        self.assertEqual(self.profiler.latency_histogram()[0].sum(), 0)
+
+    def test_invalid_bins(self):
+        with self.assertRaises(ValueError):
+            SimulationProfiler(latency_bins=[1, 1])
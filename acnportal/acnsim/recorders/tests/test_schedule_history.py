@@ -0,0 +1,132 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from acnportal.acnsim.recorders import ScheduleHistory
+
+
+class TestScheduleHistory(TestCase):
+    def setUp(self):
+        self.schedules = {
+            0: {'PS-001': [32, 16], 'PS-002': [8, 8]},
+            1: {'PS-001': [32, 16], 'PS-002': [16, 8]},
+            3: {'PS-001': [32, 16], 'PS-003': [0, 4]},
+            4: {'PS-001': [24, 24], 'PS-003': [0, 4]},
+        }
+        self.history = ScheduleHistory()
+        for iteration, schedule in self.schedules.items():
+            self.history.record(iteration, schedule)
+
+    def assertScheduleEqual(self, actual, expected):
+        self.assertEqual(set(actual), set(expected))
+        for station_id in expected:
+            np.testing.assert_array_equal(actual[station_id], expected[station_id])
+
+    def test_reconstruct(self):
+        for iteration, schedule in self.schedules.items():
+            self.assertScheduleEqual(self.history[iteration], schedule)
+
+    def test_items(self):
+        self.assertEqual(self.history.keys(), [0, 1, 3, 4])
+        for iteration, schedule in self.history.items():
+            self.assertScheduleEqual(schedule, self.schedules[iteration])
+
+    def test_only_changes_stored(self):
+        # 4 pilots at iteration 0, then PS-002 at 1, PS-003 at 3 and PS-001 at 4.
+        self.assertEqual(self.history.nnz, 10)
+
+    def test_iteration_between_calls(self):
+        self.assertNotIn(2, self.history)
+        self.assertScheduleEqual(self.history[2], self.schedules[1])
+        self.assertScheduleEqual(self.history[10], self.schedules[4])
+
+    def test_iteration_before_first_call(self):
+        history = ScheduleHistory()
+        history.record(3, {'PS-001': [1]})
+        with self.assertRaises(KeyError):
+            _ = history[2]
+        with self.assertRaises(KeyError):
+            _ = ScheduleHistory()[0]
+
+    def test_record_out_of_order(self):
+        with self.assertRaises(ValueError):
+            self.history.record(4, {})
+
+    def test_ring_buffer(self):
+        history = ScheduleHistory(max_calls=2)
+        for iteration, schedule in self.schedules.items():
+            history[iteration] = schedule
+        self.assertEqual(len(history), 2)
+        self.assertEqual(list(history), [3, 4])
+        self.assertScheduleEqual(history[3], self.schedules[3])
+        self.assertScheduleEqual(history[4], self.schedules[4])
+        self.assertNotIn(0, history)
+        with self.assertRaises(KeyError):
+            _ = history[2]
+
+    def test_ring_buffer_long(self):
+        history = ScheduleHistory(max_calls=3)
+        for iteration in range(0, 40, 2):
+            history.record(iteration, {'PS-001': [iteration], 'PS-{0:03d}'.format(iteration): [1]})
+        self.assertEqual(history.keys(), [34, 36, 38])
+        self.assertEqual(history.nnz, 6)
+        self.assertScheduleEqual(history[37], {'PS-001': [36], 'PS-036': [1]})
+        self.assertEqual(history.copy().keys(), [34, 36, 38])
+        with self.assertRaises(KeyError):
+            _ = history[33]
+
+    def test_invalid_max_calls(self):
+        with self.assertRaises(ValueError):
+            ScheduleHistory(max_calls=0)
+        with self.assertRaises(ValueError):
+            ScheduleHistory(checkpoint_interval=0)
+
+    def test_checkpoints(self):
+        rng = np.random.RandomState(0)
+        schedules = {}
+        for iteration in range(0, 120, 3):
+            schedules[iteration] = {'PS-{0:03d}'.format(i): rng.randint(0, 3, 2) for i in range(6) if rng.rand() < 0.7}
+        for max_calls in (None, 1, 7, 50):
+            for checkpoint_interval in (1, 4, 32):
+                with self.subTest(max_calls=max_calls, checkpoint_interval=checkpoint_interval):
+                    history = ScheduleHistory(max_calls, checkpoint_interval)
+                    for iteration, schedule in schedules.items():
+                        history[iteration] = schedule
+                    copy = history.copy()
+                    for iteration in history:
+                        for h in (history, copy):
+                            self.assertScheduleEqual(h[iteration], schedules[iteration])
+                            self.assertScheduleEqual(h[iteration + 1], schedules[iteration])
+
+    def test_lookup_replays_from_checkpoint(self):
+        history = ScheduleHistory(checkpoint_interval=8)
+        for iteration in range(100):
+            history.record(iteration, {'PS-001': [iteration]})
+        with patch.object(history, '_apply', wraps=history._apply) as apply:
+            for iteration in range(99):
+                self.assertScheduleEqual(history[iteration], {'PS-001': [iteration]})
+        self.assertLessEqual(apply.call_count, 99 * 8)
+
+    def test_array_schedules(self):
+        history = ScheduleHistory()
+        station_ids = ['PS-001', 'PS-002', 'PS-003']
+        history.record(0, np.array([[1, 2], [3, 4], [5, 6]]), station_ids)
+        history.record(1, (np.array([2]), np.array([[7, 8]])), station_ids)
+        self.assertScheduleEqual(history[0], {'PS-001': [1, 2], 'PS-002': [3, 4], 'PS-003': [5, 6]})
+        self.assertScheduleEqual(history[1], {'PS-003': [7, 8]})
+        with self.assertRaises(ValueError):
+            history.record(2, np.array([[1], [2], [3]]))
+
+    def test_reconstructed_schedule_read_only(self):
+        with self.assertRaises(ValueError):
+            self.history[0]['PS-001'][0] = 0
+
+    def test_copy(self):
+        copy = self.history.copy()
+        copy.record(5, {'PS-004': [1]})
+        self.history.record(6, {'PS-001': [24, 24]})
+        self.assertEqual(copy.keys(), [0, 1, 3, 4, 5])
+        self.assertEqual(self.history.keys(), [0, 1, 3, 4, 6])
+        self.assertScheduleEqual(copy[5], {'PS-004': [1]})
+        self.assertScheduleEqual(copy[4], self.schedules[4])
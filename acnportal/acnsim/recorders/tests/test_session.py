@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+import numpy as np
+
+from acnportal.acnsim.recorders import SessionTimeSeries
+
+
+class TestSessionTimeSeries(TestCase):
+    def setUp(self):
+        self.series = SessionTimeSeries(3)
+        self.series.open_session(0, 'A', 1)
+        self.series.open_session(2, 'B', 2)
+        for period in range(5):
+            self.series.record(period, np.array([period + 1, 10, 20 + period]))
+        self.series.close_session(0, 4)
+
+    def test_shape(self):
+        self.assertEqual(self.series.shape, (3, 5))
+
+    def test_closed_sessions_csr(self):
+        self.assertEqual(self.series.session_ids, ['A'])
+        np.testing.assert_array_equal(self.series.station_indices, [0])
+        np.testing.assert_array_equal(self.series.starts, [1])
+        np.testing.assert_array_equal(self.series.indptr, [0, 3])
+        np.testing.assert_array_equal(self.series.values, [2, 3, 4])
+        self.assertEqual(self.series.nnz, 6)
+
+    def test_session(self):
+        row, start, values = self.series.session('B')
+        self.assertEqual((row, start), (2, 2))
+        np.testing.assert_array_equal(values, [22, 23, 24])
+        with self.assertRaises(KeyError):
+            self.series.session('C')
+
+    def test_view(self):
+        np.testing.assert_array_equal(self.series.view(),
+                                      np.array([[0, 2, 3, 4, 0], [0, 0, 0, 0, 0], [0, 0, 22, 23, 24]]))
+
+    def test_row(self):
+        np.testing.assert_array_equal(self.series.row(2), [0, 0, 22, 23, 24])
+
+    def test_iter_chunks(self):
+        chunks = list(self.series.iter_chunks(2))
+        self.assertEqual([start for start, _ in chunks], [0, 2, 4])
+        np.testing.assert_array_equal(np.hstack([block for _, block in chunks]), self.series.view())
+
+    def test_close_discards_values_after_end(self):
+        self.series.close_session(2, 3)
+        np.testing.assert_array_equal(self.series.row(2), [0, 0, 22, 0, 0])
+
+    def test_open_session_closes_previous(self):
+        self.series.open_session(2, 'C', 4)
+        self.series.record(5, np.array([0, 0, 7]))
+        self.assertEqual(self.series.session_ids, ['A', 'B'])
+        np.testing.assert_array_equal(self.series.row(2), [0, 0, 22, 23, 0, 7])
+
+    def test_from_array(self):
+        a = np.array([[0, 1, 2, 0, 3], [0, 0, 0, 0, 0]])
+        series = SessionTimeSeries.from_array(a)
+        np.testing.assert_array_equal(series.view(), a)
+        np.testing.assert_array_equal(series.starts, [1, 4])
+        self.assertEqual(series.session_ids, [None, None])
+
+    def test_fork(self):
+        fork = self.series.fork()
+        self.assertIs(fork._shared[0][4].base, self.series.values.base)
+        fork.record(5, np.array([0, 0, 30]))
+        fork.close_session(2, 6)
+        fork.open_session(1, 'C', 6)
+        fork.record(6, np.array([0, 5, 0]))
+        self.series.close_session(2, 5)
+        self.assertEqual(fork.session_ids, ['A', 'B'])
+        np.testing.assert_array_equal(fork.station_indices, [0, 2])
+        np.testing.assert_array_equal(fork.starts, [1, 2])
+        np.testing.assert_array_equal(fork.indptr, [0, 3, 7])
+        np.testing.assert_array_equal(fork.values, [2, 3, 4, 22, 23, 24, 30])
+        self.assertEqual(fork.nnz, 8)
+        np.testing.assert_array_equal(fork.row(1), [0, 0, 0, 0, 0, 0, 5])
+        np.testing.assert_array_equal(self.series.values, [2, 3, 4, 22, 23, 24])
+        np.testing.assert_array_equal(self.series.fork().view(), self.series.view())
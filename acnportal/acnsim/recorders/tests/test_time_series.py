@@ -0,0 +1,96 @@
+from unittest import TestCase
+
+import numpy as np
+
+from acnportal.acnsim.recorders import TimeSeriesBuffer
+
+
+class TestTimeSeriesBuffer(TestCase):
+    def setUp(self):
+        self.buffer = TimeSeriesBuffer(3, 2)
+
+    def test_init(self):
+        self.assertEqual(self.buffer.shape, (3, 2))
+        np.testing.assert_array_equal(self.buffer.view(), np.zeros((3, 2)))
+
+    def test_invalid_growth_factor(self):
+        with self.assertRaises(ValueError):
+            TimeSeriesBuffer(3, 2, growth_factor=1)
+
+    def test_ensure_width_grows_geometrically(self):
+        self.buffer.ensure_width(3)
+        self.assertEqual(self.buffer.width, 3)
+        self.assertEqual(self.buffer.capacity, 4)
+        self.buffer.ensure_width(4)
+        self.assertEqual(self.buffer.capacity, 4)
+        self.buffer.ensure_width(20)
+        self.assertEqual(self.buffer.capacity, 20)
+
+    def test_ensure_width_smaller_is_noop(self):
+        self.buffer.ensure_width(1)
+        self.assertEqual(self.buffer.width, 2)
+
+    def test_ensure_width_preserves_contents(self):
+        self.buffer.view()[:] = [[1, 2], [3, 4], [5, 6]]
+        self.buffer.ensure_width(5)
+        np.testing.assert_array_equal(self.buffer.view(),
+                                      np.array([[1, 2, 0, 0, 0], [3, 4, 0, 0, 0], [5, 6, 0, 0, 0]]))
+
+    def test_view_shares_memory(self):
+        self.buffer.ensure_width(3)
+        self.buffer.view()[1, 2] = 7
+        self.assertEqual(self.buffer.view()[1, 2], 7)
+
+    def test_from_array(self):
+        a = np.array([[1, 2], [3, 4]])
+        buffer = TimeSeriesBuffer.from_array(a)
+        np.testing.assert_array_equal(buffer.view(), a)
+        self.assertIsNot(buffer.view().base, a)
+
+    def test_trim(self):
+        self.buffer.ensure_width(3)
+        self.buffer.trim()
+        self.assertEqual(self.buffer.capacity, 3)
+        self.assertEqual(self.buffer.shape, (3, 3))
+
+    def test_iter_chunks(self):
+        self.buffer.ensure_width(5)
+        self.buffer.view()[:] = np.arange(15).reshape((3, 5))
+        chunks = list(self.buffer.iter_chunks(2))
+        self.assertEqual([start for start, _ in chunks], [0, 2, 4])
+        np.testing.assert_array_equal(np.hstack([block for _, block in chunks]), self.buffer.view())
+
+    def test_iter_chunks_default_single_block(self):
+        chunks = list(self.buffer.iter_chunks())
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0][0], 0)
+        self.assertEqual(chunks[0][1].shape, (3, 2))
+
+    def test_window(self):
+        self.buffer.view()[:] = [[1, 2], [3, 4], [5, 6]]
+        self.buffer.window(1, 2)[:, 0] = 7
+        np.testing.assert_array_equal(self.buffer.view()[:, 1], [7, 7, 7])
+
+    def test_fork_shares_columns_before_start(self):
+        self.buffer.ensure_width(4)
+        self.buffer.view()[:] = np.arange(12).reshape((3, 4))
+        fork = self.buffer.fork(3)
+        self.assertEqual(fork.shape, (3, 4))
+        self.assertTrue(np.shares_memory(fork.window(0, 3), self.buffer.view()))
+        self.assertFalse(fork.window(0, 3).flags.writeable)
+        fork.record(3, [20, 21, 22])
+        fork.record(4, [30, 31, 32])
+        np.testing.assert_array_equal(self.buffer.view()[:, 3], [3, 7, 11])
+        chunks = list(fork.iter_chunks(2))
+        np.testing.assert_array_equal(np.hstack([block for _, block in chunks]),
+                                      np.hstack([np.arange(12).reshape((3, 4))[:, :3], [[20, 30], [21, 31], [22, 32]]]))
+        self.assertTrue(np.shares_memory(fork.window(0, 2), self.buffer.view()))
+
+    def test_fork_of_fork(self):
+        self.buffer.view()[:] = [[1, 2], [3, 4], [5, 6]]
+        fork = self.buffer.fork(1).fork(2)
+        self.buffer.view()[:, 1] = 0
+        np.testing.assert_array_equal(fork.view(), [[1, 2], [3, 4], [5, 6]])
+        fork.record(0, [8, 8, 8])
+        np.testing.assert_array_equal(fork.view()[:, 0], [8, 8, 8])
+        np.testing.assert_array_equal(self.buffer.view()[:, 0], [1, 3, 5])
@@ -0,0 +1,235 @@
+import numpy as np
+
+
+class TimeSeriesBuffer:
+    """ Growable 2-D buffer with one row per station and one column per period.
+
+    The buffer separates its logical width (the number of periods recorded so far) from its allocated capacity.
+    When the width must grow past the capacity, the capacity is increased geometrically so that extending the buffer
+    one period at a time only does constant amortized work per period. Columns beyond the logical width are always
+    zero, so growing the width exposes zero-filled columns just like reallocating a larger zero matrix would.
+
+    A buffer created with fork shares the columns before the fork point with the buffer it was forked from, as
+    read-only views, and only holds the later columns itself. view copies the shared columns into the buffer, while
+    window, iter_chunks and record do not, so a forked simulation only pays for the columns it writes.
+
+    Args:
+        rows (int): Number of rows (stations) in the buffer.
+        width (int): Initial logical width (periods) of the buffer. Default 0.
+        growth_factor (float): Factor by which the capacity is multiplied when the buffer is full. Default 2.
+        dtype (np.dtype): Data type of the buffer. Default float.
+    """
+
+    def __init__(self, rows, width=0, growth_factor=2, dtype=float):
+        if growth_factor <= 1:
+            raise ValueError('growth_factor must be greater than 1. Got {0}'.format(growth_factor))
+        self._growth_factor = growth_factor
+        self._width = width
+        # Read-only views of the columns shared with the buffer this one was forked from, and their total width.
+        self._shared = []
+        self._offset = 0
+        # Columns from _offset onward.
+        self._data = np.zeros((rows, width), dtype=dtype)
+
+    @classmethod
+    def from_array(cls, a, growth_factor=2):
+        """ Create a buffer whose contents are a copy of the 2-D array a.
+
+        Args:
+            a (np.Array): 2-D array with one row per station and one column per period.
+            growth_factor (float): See TimeSeriesBuffer.
+
+        Returns:
+            TimeSeriesBuffer: A buffer with the same shape, dtype and contents as a.
+        """
+        a = np.asarray(a)
+        buffer = cls(a.shape[0], a.shape[1], growth_factor=growth_factor, dtype=a.dtype)
+        buffer._data[:] = a
+        return buffer
+
+    @classmethod
+    def _forked(cls, shared, own, growth_factor=2):
+        """ Create a buffer whose first columns are shared with another buffer. See fork.
+
+        Args:
+            shared (List[np.Array]): Blocks of consecutive columns to share, in order.
+            own (np.Array): Later columns, which the new buffer takes ownership of.
+            growth_factor (float): See TimeSeriesBuffer.
+
+        Returns:
+            TimeSeriesBuffer: A buffer whose contents are the shared columns followed by own.
+        """
+        buffer = cls(own.shape[0], growth_factor=growth_factor, dtype=own.dtype)
+        for block in shared:
+            if block.shape[1]:
+                block = block.view()
+                block.setflags(write=False)
+                buffer._shared.append(block)
+                buffer._offset += block.shape[1]
+        buffer._data = own
+        buffer._width = buffer._offset + own.shape[1]
+        return buffer
+
+    @property
+    def width(self):
+        """ Return the logical width (number of periods) of the buffer. (int) """
+        return self._width
+
+    @property
+    def capacity(self):
+        """ Return the number of columns currently allocated, including shared columns. (int) """
+        return self._offset + self._data.shape[1]
+
+    @property
+    def shape(self):
+        """ Return the logical shape (rows, width) of the buffer. (Tuple[int, int]) """
+        return self._data.shape[0], self._width
+
+    @property
+    def dtype(self):
+        """ Return the data type of the buffer. (np.dtype) """
+        return self._data.dtype
+
+    def view(self):
+        """ Return a view of the logical contents of the buffer.
+
+        The view shares memory with the buffer, so writes to it are reflected in the buffer. The view is only valid
+        until the buffer next reallocates, so callers should not hold on to it across calls to ensure_width. Any
+        columns shared with the buffer this one was forked from are first copied into the buffer.
+
+        Returns:
+            np.Array: 2-D array of shape (rows, width).
+        """
+        self._unshare()
+        return self._data[:, :self._width]
+
+    def window(self, start, stop):
+        """ Return a view of the columns from start up to stop, which must be within the logical width.
+
+        Unlike view, this does not copy shared columns into the buffer unless the window includes both shared and
+        own columns. A window of shared columns is read-only.
+
+        Args:
+            start (int): First column of the window.
+            stop (int): Column after the last column of the window.
+
+        Returns:
+            np.Array: 2-D array of shape (rows, stop - start).
+        """
+        if start >= self._offset:
+            return self._data[:, start - self._offset:stop - self._offset]
+        blocks = self._blocks(start, stop)
+        if len(blocks) == 1:
+            return blocks[0]
+        self._unshare()
+        return self._data[:, start:stop]
+
+    def fork(self, start):
+        """ Return a buffer with the same contents which shares the columns before start with this buffer.
+
+        Only the columns from start onward are copied, so forking costs time and memory proportional to the columns
+        after start. The shared columns are read-only in the new buffer, but writes to them through this buffer are
+        visible in both.
+
+        Args:
+            start (int): Number of columns to share. At most the logical width.
+
+        Returns:
+            TimeSeriesBuffer: The new buffer.
+        """
+        own = np.zeros((self._data.shape[0], self._width - start), dtype=self._data.dtype)
+        position = 0
+        for block in self._blocks(start, self._width):
+            own[:, position:position + block.shape[1]] = block
+            position += block.shape[1]
+        return self._forked(self._blocks(0, start), own, self._growth_factor)
+
+    def iter_chunks(self, chunk_size=None):
+        """ Iterate over the logical contents of the buffer a block of periods at a time.
+
+        Args:
+            chunk_size (int): Maximum number of periods in each block. If None, the whole buffer is returned as a
+                single block. Default None.
+
+        Yields:
+            Tuple[int, np.Array]: Index of the first period in the block and a view of the block with shape
+                (rows, periods in block). At least one, possibly empty, block is returned.
+        """
+        if chunk_size is None:
+            yield 0, self.view()
+            return
+        for start in range(0, max(self._width, 1), chunk_size):
+            stop = min(start + chunk_size, self._width)
+            blocks = self._blocks(start, stop)
+            # Blocks which include several shared arrays are copied rather than copying all shared columns.
+            yield start, blocks[0] if len(blocks) == 1 else np.concatenate(blocks, axis=1)
+
+    def ensure_width(self, width):
+        """ Grow the logical width of the buffer to at least width, filling new columns with zeros.
+
+        Args:
+            width (int): Required logical width of the buffer.
+
+        Returns:
+            None
+        """
+        if width <= self._width:
+            return
+        if width > self.capacity:
+            own_width = self._width - self._offset
+            new_capacity = max(width - self._offset, int(self._data.shape[1] * self._growth_factor))
+            new_data = np.zeros((self._data.shape[0], new_capacity), dtype=self._data.dtype)
+            new_data[:, :own_width] = self._data[:, :own_width]
+            self._data = new_data
+        self._width = width
+
+    def record(self, period, values):
+        """ Record the values of all rows at period, growing the logical width if necessary.
+
+        Args:
+            period (int): Period of the values.
+            values (np.Array): Value of each row at period.
+
+        Returns:
+            None
+        """
+        self.ensure_width(period + 1)
+        if period < self._offset:
+            self._unshare()
+        self.window(period, period + 1)[:, 0] = values
+
+    def trim(self):
+        """ Release any allocated capacity beyond the logical width of the buffer.
+
+        Returns:
+            None
+        """
+        if self.capacity > self._width:
+            self._data = self._data[:, :self._width - self._offset].copy()
+
+    def _blocks(self, start, stop):
+        """ Return views of the shared and own columns from start up to stop, in order.
+
+        Returns:
+            List[np.Array]: At least one block, whose columns together are those from start up to stop.
+        """
+        blocks = []
+        begin = 0
+        for block in self._shared + [self._data]:
+            end = begin + block.shape[1]
+            if start < end and begin < stop:
+                blocks.append(block[:, max(start - begin, 0):stop - begin])
+            begin = end
+        return blocks or [self._data[:, :0]]
+
+    def _unshare(self):
+        """ Copy the shared columns into the buffer, so that it no longer shares memory with another buffer. """
+        if not self._shared:
+            return
+        data = np.zeros((self._data.shape[0], self.capacity), dtype=self._data.dtype)
+        for start, block in zip(np.cumsum([0] + [block.shape[1] for block in self._shared]), self._shared):
+            data[:, start:start + block.shape[1]] = block
+        data[:, self._offset:] = self._data
+        self._data = data
+        self._shared = []
+        self._offset = 0
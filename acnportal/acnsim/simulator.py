@@ -1,11 +1,32 @@
 import copy
+import os
 from datetime import datetime
 import pandas as pd
 import numpy as np
 import warnings
 
 from .events import UnplugEvent
+from .models import EVView
 from .interface import Interface, InvalidScheduleError
+from .recorders import TimeSeriesBuffer, MemmapTimeSeriesBuffer, SessionTimeSeries, ScheduleHistory, EventLog, \
+    SessionLog, SimulationProfiler
+
+# Fields of the structured array returned by Simulator.get_active_ev_array.
+ACTIVE_EV_DTYPE = np.dtype([
+    ('station_id', object),
+    ('session_id', object),
+    ('station_index', int),
+    ('arrival', float),
+    ('departure', float),
+    ('estimated_departure', float),
+    ('remaining_demand', float),
+    ('max_pilot', float),
+    ('min_pilot', float),
+    ('voltage', float),
+])
+
+# Names of the hooks which can be registered with Simulator.add_hook.
+HOOKS = ('plugin', 'unplug', 'recompute', 'schedule_applied', 'iteration_end')
 
 
 class Simulator:
@@ -22,42 +43,280 @@ class Simulator:
         start (datetime): Date and time of the first period of the simulation.
         period (int): Length of each time interval in the simulation in minutes. Default: 1
         signals (Dict[str, ...]):
-        store_schedule_history (bool): If True, store the scheduler output each time it is run. Note this can use lots
-            of memory for long simulations.
+        store_schedule_history (bool or ScheduleHistory): If True, store the scheduler output each time it is run in
+            the dictionary schedule_history. Note this can use lots of memory for long simulations. If a
+            ScheduleHistory, store only the changes between consecutive outputs in it instead, optionally keeping only
+            the most recent calls. Default False.
+        verbose (bool): If True, print each event as it is processed. Implemented as a hook, see add_hook.
+            Default True.
+        event_queue_type (type): EventQueue-like class to use for the simulation, e.g. CalendarEventQueue. If events
+            is not already of this type, its events are moved into a new queue of this type. If None, events is used
+            as given. Default None.
+        fast_forward (bool): If True, jump directly to the next event whenever no EV is plugged into the network
+            instead of stepping through each idle period. The scheduler is not called during skipped periods, so
+            results are identical to a normal run as long as the scheduler returns an empty schedule when there are no
+            active EVs, as all included algorithms do. Skipped periods do not call iteration_end hooks and are not
+            counted by the profiler, which attributes the time spent skipping them to the events phase. Default False.
+        snapshot_evs (bool): If True, the read-only EV views given to the scheduler hold a snapshot of each EV's state
+            taken when they are first requested in an iteration. If False, they read from the live EV objects.
+            Default False.
+        results_dir (str): If given, pilot_signals and charging_rates are stored in memory-mapped files named
+            pilot_signals.dat and charging_rates.dat in this directory instead of in memory, so that long simulations
+            of large networks do not need to hold them in RAM. The directory is created if it does not exist and
+            existing result files in it are overwritten. Default None.
+        results_chunk_size (int): Number of periods by which the memory-mapped result files grow at a time when
+            results_dir is given. Default 1440.
+        session_charging_rates (bool): If True, charging_rates are stored per charging session in a SessionTimeSeries
+            instead of as a dense matrix, so their memory scales with the total time EVs are plugged in rather than
+            with the number of EVSEs times the length of the simulation. charging_rates then returns a dense copy
+            reconstructed on demand, and results_dir only applies to pilot_signals. Default False.
+        dtype (np.dtype): Floating point type in which pilot_signals and charging_rates are stored, e.g. np.float32 to
+            halve their memory use. If None, the dtype of the network is used. See ChargingNetwork. Default None.
+        event_history (list-like): Container to which each processed event is appended, available as event_history.
+            Pass an EventLog to keep only a compact record of each event, optionally only for the most recent events
+            or streamed to disk. Default None, in which case every event is kept in a list.
+        ev_history (dict-like): Container in which each EV is stored by session id when it is plugged in, available
+            as ev_history. Pass a SessionLog to keep only a summary of each finished session and release its EV,
+            optionally only for the most recent sessions or streamed to disk. Default None, in which case every EV is
+            kept in a dictionary.
+        profile (bool or SimulationProfiler): If True, time each phase of run and each processed event in a
+            SimulationProfiler, available as profiler. A SimulationProfiler may be passed to customize it or to
+            accumulate the times of several simulations. Default False, in which case profiler is None.
     """
 
     def __init__(self, network, scheduler, events, start, period=1, signals=None,
-                 store_schedule_history=False, verbose=True):
+                 store_schedule_history=False, verbose=True, event_queue_type=None, fast_forward=False,
+                 snapshot_evs=False, results_dir=None, results_chunk_size=1440, session_charging_rates=False,
+                 dtype=None, event_history=None, ev_history=None, profile=False):
         self.network = network
         self.scheduler = scheduler
         self.scheduler.register_interface(Interface(self))
+        if event_queue_type is not None and not isinstance(events, event_queue_type):
+            last_timestamp = events.get_last_timestamp()
+            events = event_queue_type(events.get_current_events(last_timestamp) if last_timestamp is not None else [])
         self.event_queue = events
         self.start = start
         self.period = period
         self.max_recompute = scheduler.max_recompute
         self.signals = signals
+        self._hooks = {name: [] for name in HOOKS}
         self.verbose = verbose
+        self.fast_forward = fast_forward
+        self.snapshot_evs = snapshot_evs
+        self.results_dir = results_dir
+        self.results_chunk_size = results_chunk_size
+        self.session_charging_rates = session_charging_rates
+        self.dtype = np.dtype(dtype) if dtype is not None else network.dtype
+        if results_dir is not None:
+            os.makedirs(results_dir, exist_ok=True)
 
         # Information storage
-        self.pilot_signals = np.zeros((len(self.network.station_ids), self.event_queue.get_last_timestamp() + 1))
-        self.charging_rates = np.zeros((len(self.network.station_ids), self.event_queue.get_last_timestamp() + 1))
+        self._pilot_signals = self._new_buffer('pilot_signals', self.event_queue.get_last_timestamp() + 1)
+        self._charging_rates = self._new_buffer('charging_rates', self.event_queue.get_last_timestamp() + 1,
+                                                session=session_charging_rates)
         self.peak = 0
-        self.ev_history = {}
-        self.event_history = []
-        if store_schedule_history:
+        self.ev_history = ev_history if ev_history is not None else {}
+        self.event_history = event_history if event_history is not None else []
+        if isinstance(store_schedule_history, ScheduleHistory):
+            self.schedule_history = store_schedule_history
+        elif store_schedule_history:
             self.schedule_history = {}
         else:
             self.schedule_history = None
+        if isinstance(profile, SimulationProfiler):
+            self.profiler = profile
+        elif profile:
+            self.profiler = SimulationProfiler()
+        else:
+            self.profiler = None
 
         # Local Variables
         self._iteration = 0
         self._resolve = False
         self._last_schedule_update = 0
+        self._active_ev_views = None
+        self._active_ev_array = None
 
     @property
     def iteration(self):
         return self._iteration
 
+    @property
+    def verbose(self):
+        """ Return True if events are printed as they are processed. (bool) """
+        return _print_event in self._hooks['plugin']
+
+    @verbose.setter
+    def verbose(self, value):
+        for name in ('plugin', 'unplug', 'recompute'):
+            if value and _print_event not in self._hooks[name]:
+                self.add_hook(name, _print_event)
+            elif not value and _print_event in self._hooks[name]:
+                self.remove_hook(name, _print_event)
+
+    def add_hook(self, name, callback):
+        """ Register a callback to be called when something happens during the simulation.
+
+        Each callback is called as callback(simulator, payload) with the simulator and a payload which depends on the
+        hook:
+            - plugin, unplug, recompute: The event being processed, after the simulator has acted on it.
+            - schedule_applied: The schedule returned by the scheduler, after it has been applied to pilot_signals.
+            - iteration_end: The iteration which just ended, after its charging rates have been recorded.
+
+        Callbacks of the same hook are called in the order they were registered. Hooks without callbacks cost nothing,
+        so callbacks are the preferred way to observe a simulation, e.g. for logging or progress reporting.
+
+        Args:
+            name (str): Name of the hook, one of HOOKS.
+            callback (Callable[[Simulator, object], None]): Function to call.
+
+        Returns:
+            Callable[[Simulator, object], None]: The callback, so that this can be used as a decorator factory.
+
+        Raises:
+            ValueError: Raised if name is not the name of a hook.
+        """
+        self._hook_list(name).append(callback)
+        return callback
+
+    def remove_hook(self, name, callback):
+        """ Unregister a callback registered with add_hook.
+
+        Args:
+            name (str): Name of the hook, one of HOOKS.
+            callback (Callable[[Simulator, object], None]): Function to unregister.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: Raised if name is not the name of a hook or callback is not registered with it.
+        """
+        hooks = self._hook_list(name)
+        if callback not in hooks:
+            raise ValueError('Callback is not registered with hook {0}.'.format(name))
+        hooks.remove(callback)
+
+    def _hook_list(self, name):
+        """ Return the list of callbacks of a hook, raising ValueError if there is no hook with the given name. """
+        if name not in self._hooks:
+            raise ValueError('Unknown hook {0}. Hooks are {1}.'.format(name, ', '.join(HOOKS)))
+        return self._hooks[name]
+
+    def _notify(self, name, payload):
+        """ Call each callback of a hook with payload. """
+        for callback in self._hooks[name]:
+            callback(self, payload)
+
+    @property
+    def pilot_signals(self):
+        """ Return the pilot signals sent to each EVSE, with a row per EVSE and a column per period.
+
+        Returns:
+            np.Array: View of the recorded pilot signals. [A]
+        """
+        return self._pilot_signals.view()
+
+    @pilot_signals.setter
+    def pilot_signals(self, value):
+        self._pilot_signals = self._new_buffer('pilot_signals', array=value)
+
+    def pilot_signals_at(self, iteration):
+        """ Return the pilot signal sent to each EVSE in one period.
+
+        Unlike indexing pilot_signals, this does not copy the pilot signals which a snapshot shares with the simulator
+        it was taken from.
+
+        Args:
+            iteration (int): Period of the pilot signals.
+
+        Returns:
+            np.Array: View of the pilot signals in the period, with one entry per EVSE. [A]
+        """
+        return self._pilot_signals.window(iteration, iteration + 1)[:, 0]
+
+    @property
+    def charging_rates(self):
+        """ Return the actual charging rate of each EVSE, with a row per EVSE and a column per period.
+
+        If session_charging_rates is True, this is a dense copy of the charging rates rather than a view.
+
+        Returns:
+            np.Array: View of the recorded charging rates. [A]
+        """
+        return self._charging_rates.view()
+
+    @charging_rates.setter
+    def charging_rates(self, value):
+        self._charging_rates = self._new_buffer('charging_rates', array=value, session=self.session_charging_rates)
+
+    def _new_buffer(self, name, width=0, array=None, session=False):
+        """ Create the buffer which stores a recorded time series, on disk if results_dir is set.
+
+        Args:
+            name (str): Name of the time series, used as the name of its file in results_dir.
+            width (int): Initial number of periods in the buffer. Ignored if array is given. Default 0.
+            array (np.Array): If given, 2-D array with the initial contents of the buffer. Default None.
+            session (bool): If True, store the time series per charging session in memory. Default False.
+
+        Returns:
+            TimeSeriesBuffer, MemmapTimeSeriesBuffer or SessionTimeSeries: The new buffer.
+        """
+        if session:
+            if array is not None:
+                return SessionTimeSeries.from_array(array)
+            return SessionTimeSeries(len(self.network.station_ids), width, dtype=self.dtype)
+        if self.results_dir is None:
+            if array is not None:
+                return TimeSeriesBuffer.from_array(array)
+            return TimeSeriesBuffer(len(self.network.station_ids), width, dtype=self.dtype)
+        path = os.path.join(self.results_dir, '{0}.dat'.format(name))
+        if array is not None:
+            return MemmapTimeSeriesBuffer.from_array(array, path, chunk_size=self.results_chunk_size)
+        return MemmapTimeSeriesBuffer(path, len(self.network.station_ids), width, chunk_size=self.results_chunk_size,
+                                      dtype=self.dtype)
+
+    def _copy_buffer(self, name, buffer):
+        """ Create a buffer in results_dir with the contents of another buffer, copying them a block at a time.
+
+        Args:
+            name (str): See _new_buffer.
+            buffer (TimeSeriesBuffer or MemmapTimeSeriesBuffer): Buffer to copy.
+
+        Returns:
+            MemmapTimeSeriesBuffer: The new buffer.
+        """
+        new_buffer = self._new_buffer(name, buffer.width)
+        for start, chunk in buffer.iter_chunks(self.results_chunk_size):
+            new_buffer.window(start, start + chunk.shape[1])[:] = chunk
+        return new_buffer
+
+    def iter_pilot_signals(self, chunk_size=None):
+        """ Iterate over the pilot signals a block of periods at a time.
+
+        Args:
+            chunk_size (int): Maximum number of periods in each block. If None, all periods are returned in a single
+                block when stored in memory, and results_chunk_size periods at a time when stored in results_dir.
+                Default None.
+
+        Yields:
+            Tuple[int, np.Array]: Index of the first period in the block and a view of the pilot signals in the block,
+                with a row per EVSE and a column per period. [A]
+        """
+        return self._pilot_signals.iter_chunks(chunk_size)
+
+    def iter_charging_rates(self, chunk_size=None):
+        """ Iterate over the charging rates a block of periods at a time.
+
+        Args:
+            chunk_size (int): See iter_pilot_signals.
+
+        Yields:
+            Tuple[int, np.Array]: Index of the first period in the block and a view of the charging rates in the block,
+                with a row per EVSE and a column per period. [A]
+        """
+        return self._charging_rates.iter_chunks(chunk_size)
+
     def run(self):
         """ Run the simulation until the event queue is empty.
 
@@ -71,41 +330,353 @@ class Simulator:
         Returns:
             None
         """
-        while not self.event_queue.empty():
-            current_events = self.event_queue.get_current_events(self._iteration)
-            for e in current_events:
-                self.event_history.append(e)
-                self._process_event(e)
-            if self._resolve or \
-                    self.max_recompute is not None and \
-                    self._iteration - self._last_schedule_update >= self.max_recompute:
-                new_schedule = self.scheduler.run()
-                self._update_schedules(new_schedule)
-                if self.schedule_history is not None:
-                    self.schedule_history[self._iteration] = new_schedule
-                self._last_schedule_update = self._iteration
-                self._resolve = False
-            if self.event_queue.get_last_timestamp() is not None:
-                width_increase = max(self.event_queue.get_last_timestamp() + 1, self._iteration + 1)
-            else:
-                width_increase = self._iteration + 1
-            self.pilot_signals = _increase_width(self.pilot_signals, width_increase)
-            self.charging_rates = _increase_width(self.charging_rates, width_increase)
-            self.network.update_pilots(self.pilot_signals, self._iteration, self.period)
-            self._store_actual_charging_rates()
-            self._iteration = self._iteration + 1
-
-    def get_active_evs(self):
+        self.run_until(None)
+
+    def run_until(self, iteration):
+        """ Run the simulation until it reaches the given iteration or the event queue is empty.
+
+        The simulation can be inspected and modified, e.g. by adding events to event_queue, after this returns, and
+        then continued with any of run, run_until, run_for or step. Running a simulation in several parts gives the
+        same results as running it at once.
+
+        Args:
+            iteration (int): Iteration at which to stop, i.e. the value of the iteration property when this returns
+                unless the event queue empties first. If None, run until the event queue is empty.
+
+        Returns:
+            None
+        """
+        if self.profiler is not None:
+            self.profiler.start()
+        while not self.event_queue.empty() and (iteration is None or self._iteration < iteration):
+            self._run_iteration(iteration)
+        if self.event_queue.empty():
+            # Release the spare capacity kept for amortized growth now that the simulation is finished.
+            self._pilot_signals.trim()
+            self._charging_rates.trim()
+        for buffer in (self._pilot_signals, self._charging_rates):
+            if isinstance(buffer, MemmapTimeSeriesBuffer):
+                buffer.flush()
+
+    def run_for(self, n):
+        """ Run the simulation for n iterations or until the event queue is empty. See run_until.
+
+        Args:
+            n (int): Number of iterations to run.
+
+        Returns:
+            None
+        """
+        self.run_until(self._iteration + n)
+
+    def step(self):
+        """ Run a single iteration of the simulation. See run_until.
+
+        Returns:
+            bool: True if an iteration was run, False if the simulation was already finished.
+        """
+        if self.event_queue.empty():
+            return False
+        self.run_until(self._iteration + 1)
+        return True
+
+    def _run_iteration(self, until):
+        """ Run one iteration of the simulation. See run.
+
+        Args:
+            until (int): Iteration at which the caller stops, so that fast_forward does not skip past it. May be None.
+
+        Returns:
+            None
+        """
+        profiler = self.profiler
+        if self.fast_forward:
+            self._skip_idle_periods(until)
+            if until is not None and self._iteration >= until:
+                return
+        current_events = self.event_queue.get_current_events(self._iteration)
+        if profiler is not None:
+            profiler.lap('events')
+        for e in current_events:
+            self.event_history.append(e)
+            self._process_event(e)
+            if profiler is not None:
+                profiler.lap_event(e.type)
+        if self._resolve or \
+                self.max_recompute is not None and \
+                self._iteration - self._last_schedule_update >= self.max_recompute:
+            new_schedule = self.scheduler.run()
+            if profiler is not None:
+                profiler.lap('scheduler')
+            self._update_schedules(new_schedule)
+            if self._hooks['schedule_applied']:
+                self._notify('schedule_applied', new_schedule)
+            if isinstance(self.schedule_history, ScheduleHistory):
+                self.schedule_history.record(self._iteration, new_schedule, self.network.station_ids)
+            elif self.schedule_history is not None:
+                self.schedule_history[self._iteration] = new_schedule
+            self._last_schedule_update = self._iteration
+            self._resolve = False
+            if profiler is not None:
+                profiler.lap('update_schedules')
+        if self.event_queue.get_last_timestamp() is not None:
+            width_increase = max(self.event_queue.get_last_timestamp() + 1, self._iteration + 1)
+        else:
+            width_increase = self._iteration + 1
+        self._pilot_signals.ensure_width(width_increase)
+        self._charging_rates.ensure_width(width_increase)
+        if profiler is not None:
+            profiler.lap('bookkeeping', count=False)
+        self.network.update_pilots(self._pilot_signals.window(self._iteration, self._iteration + 1), 0, self.period)
+        if profiler is not None:
+            profiler.lap('update_pilots')
+        self._store_actual_charging_rates()
+        if self._hooks['iteration_end']:
+            self._notify('iteration_end', self._iteration)
+        self._iteration = self._iteration + 1
+        self._active_ev_views = None
+        self._active_ev_array = None
+        if profiler is not None:
+            profiler.lap('bookkeeping')
+
+    def _skip_idle_periods(self, until=None):
+        """ Advance the simulation to the next event if no EV is plugged in and no event is due.
+
+        Skipped periods have no charging, so their columns in charging_rates are left at zero. Periodic scheduler calls
+        which would have happened during the skipped periods are accounted for in the time of the last schedule update,
+        so recomputes after the jump happen at the same iterations as in a normal run. No hooks are called for the
+        skipped periods.
+
+        Args:
+            until (int): If given, do not advance past this iteration. Default None.
+
+        Returns:
+            None
+        """
+        next_timestamp = self.event_queue.get_next_timestamp()
+        if self._resolve or next_timestamp is None or next_timestamp <= self._iteration:
+            return
+        if until is not None:
+            next_timestamp = min(next_timestamp, until)
+        if any(evse.ev is not None for evse in self.network._EVSEs.values()):
+            return
+
+        if self.max_recompute is not None:
+            first_recompute = max(self._iteration, self._last_schedule_update + self.max_recompute)
+            if first_recompute < next_timestamp:
+                self._last_schedule_update = first_recompute + \
+                    (next_timestamp - 1 - first_recompute) // self.max_recompute * self.max_recompute
+
+        width = max(self.event_queue.get_last_timestamp() + 1, next_timestamp)
+        self._pilot_signals.ensure_width(width)
+        # Charging rates are only recorded up to the current iteration, so the skipped periods are already zero.
+        self._charging_rates.ensure_width(width)
+        # With no EVs attached this only updates the pilot of each EVSE to its value in the last skipped period.
+        self.network.update_pilots(self._pilot_signals.window(next_timestamp - 1, next_timestamp), 0, self.period)
+        self._iteration = next_timestamp
+
+    def snapshot(self, results_dir=None):
+        """ Return an independent copy of the simulation in its current state.
+
+        The copy includes the network with its EVs and their batteries, the event queue, the scheduler, the recorded
+        results and all counters, so running it continues the simulation from the current iteration exactly as
+        running this simulator would, without affecting this simulator. Use fork to continue from a snapshot with a
+        different scheduling algorithm.
+
+        Only the live state is copied: the network with the EVs which are plugged in, the event queue, the scheduler
+        and the counters. The results recorded before the current iteration are shared with this simulator rather than
+        copied, since a simulator never modifies them once recorded: pilot signals and charging rates kept in memory,
+        an EventLog or SessionLog, and the schedule history. Pilot signals and charging rates are only copied if the
+        copy stores them in results_dir. An event_history list or ev_history dict is copied, but shares the events and
+        EVs of sessions which have finished. signals and registered hooks are shared as well.
+
+        Modifying recorded results of past iterations in place, e.g. through the pilot_signals view, after taking a
+        snapshot may therefore also modify them in the snapshot. The shared results are read-only in the snapshot.
+
+        Args:
+            results_dir (str): Directory in which the copy stores pilot signals and charging rates as memory-mapped
+                files. If None, they are kept in memory, even if this simulator uses a results_dir. Default None.
+
+        Returns:
+            Simulator: Copy of this simulator.
+
+        Raises:
+            ValueError: Raised if event_history or ev_history is streamed to disk, since the copy cannot share its
+                files, or if results_dir is the results_dir of this simulator.
+        """
+        return self._copy(None, results_dir)
+
+    def fork(self, scheduler=None, results_dir=None):
+        """ Return a copy of the simulation in its current state which continues with a different scheduler.
+
+        See snapshot for what is copied. The new scheduler is registered with the copy and is run at the first
+        iteration of the copy, replacing the remainder of the schedule computed by the current scheduler. Repeated
+        forks of a snapshot can be used to evaluate several algorithms from the same state.
+
+        Args:
+            scheduler (BaseAlgorithm): Scheduling algorithm of the copy. It must not be used by another simulator. If
+                None, a copy of the current scheduler is used, as in snapshot. Default None.
+            results_dir (str): See snapshot.
+
+        Returns:
+            Simulator: Copy of this simulator with the given scheduler.
+
+        Raises:
+            ValueError: See snapshot.
+        """
+        return self._copy(scheduler, results_dir)
+
+    def _copy(self, scheduler, results_dir):
+        """ Implement snapshot and fork. See fork for the arguments. """
+        for history in (self.event_history, self.ev_history):
+            if isinstance(history, (EventLog, SessionLog)) and history._log.path is not None:
+                raise ValueError('Cannot copy a simulator whose event_history or ev_history is streamed to disk.')
+        if results_dir is not None and self.results_dir is not None and \
+                os.path.abspath(results_dir) == os.path.abspath(self.results_dir):
+            raise ValueError('The copy cannot store its results in the results_dir of this simulator.')
+        shared = ('scheduler', 'signals', '_hooks', '_pilot_signals', '_charging_rates', 'schedule_history',
+                  'event_history', 'ev_history', '_active_ev_views', '_active_ev_array')
+        sim = type(self).__new__(type(self))
+        # Map this simulator to the copy so that references to it, e.g. from the scheduler's interface, are redirected.
+        memo = {id(self): sim}
+        sim.__dict__.update(copy.deepcopy({key: value for key, value in self.__dict__.items() if key not in shared},
+                                          memo))
+        sim.signals = self.signals
+        sim._hooks = {name: list(callbacks) for name, callbacks in self._hooks.items()}
+        sim._active_ev_views = None
+        sim._active_ev_array = None
+
+        # Only EVs which are plugged in have been copied with the network. Events and sessions of EVs which have left
+        # refer to objects which are no longer modified, so they are shared.
+        def copy_ev(ev):
+            return copy.deepcopy(ev, memo) if id(ev) in memo else ev
+
+        if isinstance(self.event_history, EventLog):
+            sim.event_history = self.event_history.fork()
+        elif isinstance(self.event_history, list):
+            sim.event_history = [copy.deepcopy(event, memo) if id(getattr(event, 'ev', None)) in memo else event
+                                 for event in self.event_history]
+        else:
+            sim.event_history = copy.deepcopy(self.event_history, memo)
+        if isinstance(self.ev_history, SessionLog):
+            sim.ev_history = self.ev_history.fork(copy_ev)
+        elif isinstance(self.ev_history, dict):
+            sim.ev_history = {session_id: copy_ev(ev) for session_id, ev in self.ev_history.items()}
+        else:
+            sim.ev_history = copy.deepcopy(self.ev_history, memo)
+
+        sim.results_dir = results_dir
+        if results_dir is not None:
+            os.makedirs(results_dir, exist_ok=True)
+            # Each simulator writes to its own files, so the recorded results are copied into the new files.
+            sim._pilot_signals = sim._copy_buffer('pilot_signals', self._pilot_signals)
+        else:
+            sim._pilot_signals = self._pilot_signals.fork(self._iteration)
+        if isinstance(self._charging_rates, SessionTimeSeries):
+            sim._charging_rates = self._charging_rates.fork()
+        elif results_dir is not None:
+            sim._charging_rates = sim._copy_buffer('charging_rates', self._charging_rates)
+        else:
+            sim._charging_rates = self._charging_rates.fork(self._iteration)
+        if isinstance(self.schedule_history, ScheduleHistory):
+            sim.schedule_history = self.schedule_history.copy()
+        elif self.schedule_history is not None:
+            sim.schedule_history = dict(self.schedule_history)
+        else:
+            sim.schedule_history = None
+
+        if scheduler is None:
+            sim.scheduler = copy.deepcopy(self.scheduler, memo)
+        else:
+            sim.scheduler = scheduler
+            sim.scheduler.register_interface(Interface(sim))
+            sim.max_recompute = scheduler.max_recompute
+            sim._resolve = True
+        return sim
+
+    def get_active_evs(self, deepcopy=None):
         """ Return all EVs which are plugged in and not fully charged at the current time.
 
         Wrapper for self.network.active_evs. See its documentation for more details.
 
+        By default the EVs are returned as read-only EVView objects, which are built once per iteration and do not copy
+        the EVs or their batteries. Deep copies are only made if requested, either through the deepcopy argument or by
+        setting deepcopy_evs on the scheduler.
+
+        Args:
+            deepcopy (bool): If True, return deep copies of the active EVs instead of read-only views. If None, use
+                the deepcopy_evs attribute of the scheduler. Default None.
+
+        Returns:
+            List[EVView]: List of all EVs which are plugged in but not fully charged at the current time.
+
+        """
+        if deepcopy is None:
+            deepcopy = getattr(self.scheduler, 'deepcopy_evs', False)
+        if deepcopy:
+            return copy.deepcopy(self.network.active_evs)
+        if self._active_ev_views is None:
+            self._active_ev_views = [EVView(ev, snapshot=self.snapshot_evs) for ev in self.network.active_evs]
+        return list(self._active_ev_views)
+
+    def get_active_ev_array(self):
+        """ Return the state of all active EVs as a structured array, built once per iteration.
+
+        Each record describes one EV in the order of get_active_evs. The fields are given by ACTIVE_EV_DTYPE:
+            - station_id, session_id: IDs of the EV's station and charging session.
+            - station_index: Index of the EV's station in network.station_ids.
+            - arrival, departure, estimated_departure: Times of the EV's session. [periods]
+            - remaining_demand: Energy still requested by the EV. [A*periods]
+            - max_pilot, min_pilot: Maximum and minimum pilot signal of the EV's station. [A]
+            - voltage: Voltage of the EV's station. [V]
+
+        The array is read-only and shared by all callers during an iteration.
+
         Returns:
-            List[EV]: List of all EVs which are plugged in but not fully charged at the current time.
+            np.ndarray: Structured array with one record per active EV.
+        """
+        if self._active_ev_array is None:
+            evs = self.network.active_evs
+            index = np.array([self.network.station_index(ev.station_id) for ev in evs], dtype=int)
+            voltages = self.network._voltages[index]
+            state = np.zeros(len(evs), dtype=ACTIVE_EV_DTYPE)
+            state['station_id'] = [ev.station_id for ev in evs]
+            state['session_id'] = [ev.session_id for ev in evs]
+            state['station_index'] = index
+            state['arrival'] = [ev.arrival for ev in evs]
+            state['departure'] = [ev.departure for ev in evs]
+            state['estimated_departure'] = [ev.estimated_departure for ev in evs]
+            remaining_demand = np.array([ev.remaining_demand for ev in evs], dtype=float)
+            state['remaining_demand'] = remaining_demand * 1000 / voltages * 60 / self.period
+            state['max_pilot'] = self.network.max_rates[index]
+            state['min_pilot'] = self.network.min_rates[index]
+            state['voltage'] = voltages
+            state.setflags(write=False)
+            self._active_ev_array = state
+        return self._active_ev_array
+
+    def get_active_ev_positions(self, evs):
+        """ Return the position in get_active_ev_array of each of the given EVs, if it describes all of them.
+
+        The array only describes the read-only views returned by get_active_evs during the current iteration. Any other
+        EV objects, such as deep copies which may have been modified, are not matched even if their ids are.
+
+        Args:
+            evs (List[EV]): EVs to look up, e.g. a filtered or reordered list of the views returned by get_active_evs.
 
+        Returns:
+            np.Array: Position of each EV in the array, or None if any EV is not one of the current views.
         """
-        evs = copy.deepcopy(self.network.active_evs)
-        return evs
+        views = self._active_ev_views
+        if views is None:
+            return None
+        if len(evs) == len(views) and all(ev is view for ev, view in zip(evs, views)):
+            return np.arange(len(views))
+        position = {id(view): i for i, view in enumerate(views)}
+        positions = [position.get(id(ev)) for ev in evs]
+        if any(i is None for i in positions):
+            return None
+        return np.array(positions, dtype=int)
 
     def _process_event(self, event):
         """ Process an event and take appropriate actions.
@@ -116,39 +687,98 @@ class Simulator:
         Returns:
             None
         """
+        self._active_ev_views = None
+        self._active_ev_array = None
         if event.type == 'Plugin':
-            self._print('Plugin Event...')
             self.network.plugin(event.ev, event.ev.station_id)
+            if self.session_charging_rates:
+                self._charging_rates.open_session(self.network.station_index(event.ev.station_id),
+                                                  event.ev.session_id, self._iteration)
             self.ev_history[event.ev.session_id] = event.ev
             self.event_queue.add_event(UnplugEvent(event.ev.departure, event.ev.station_id, event.ev.session_id))
             self._resolve = True
             self._last_schedule_update = event.timestamp
+            if self._hooks['plugin']:
+                self._notify('plugin', event)
         elif event.type == 'Unplug':
-            self._print('Unplug Event...')
             self.network.unplug(event.station_id)
+            if isinstance(self.ev_history, SessionLog):
+                self.ev_history.close(event.session_id)
+            if self.session_charging_rates:
+                self._charging_rates.close_session(self.network.station_index(event.station_id), self._iteration)
             self._resolve = True
             self._last_schedule_update = event.timestamp
+            if self._hooks['unplug']:
+                self._notify('unplug', event)
         elif event.type == 'Recompute':
-            self._print('Recompute Event...')
             self._resolve = True
+            if self._hooks['recompute']:
+                self._notify('recompute', event)
 
     def _update_schedules(self, new_schedule):
         """ Extend the current self.pilot_signals with the new pilot signal schedule.
 
         Args:
-            new_schedule (Dict[str, List[number]]): Dictionary mappding station ids to a schedule of pilot signals.
+            new_schedule (Dict[str, List[number]], np.Array, or Tuple[np.Array, np.Array]): Schedule of pilot signals
+                in one of the forms which BaseAlgorithm.schedule may return: a dictionary mapping station ids to a
+                schedule of pilot signals, a matrix with a row per station in the order of network.station_ids, or a
+                pair of an array of station indices and a matrix with the schedule of each of those stations.
 
         Returns:
             None
 
         Raises:
-            KeyError: Raised when station_id is in the new_schedule but not registered in the Network.
+            KeyError: Raised when a station in the new_schedule is not registered in the Network.
+            InvalidScheduleError: Raised when the schedules are not all the same length, the schedule matrix does not
+                have the expected number of rows, or a station index is repeated.
         """
-        if len(new_schedule) == 0:
+        if isinstance(new_schedule, dict):
+            schedule = self._dict_schedule_matrix(new_schedule)
+        else:
+            schedule = self._array_schedule_matrix(new_schedule)
+        if schedule is None:
             return
+        schedule_matrix, rows, station_ids = schedule
+        schedule_length = schedule_matrix.shape[1]
+
+        report = self.network.feasibility_report(schedule_matrix, station_ids=station_ids)
+        if not report.feasible:
+            warnings.warn(
+                f"Invalid schedule provided at iteration {self._iteration}. "
+                f"Max violation is {report.max_violation} A on {report.max_violation_constraint} "
+                f"at time index {report.max_violation_time}.",
+                UserWarning)
+        if self._iteration + schedule_length > self._pilot_signals.width:
+            # We've reached the end of pilot_signals, so extend it to fit the new schedule
+            last_timestamp = self.event_queue.get_last_timestamp()
+            self._pilot_signals.ensure_width(max(last_timestamp + 1 if last_timestamp is not None else 0,
+                                                 self._iteration + schedule_length))
+        pilot_signals = self._pilot_signals.window(self._iteration, self._iteration + schedule_length)
+        if rows is None:
+            pilot_signals[:] = schedule_matrix
+        else:
+            pilot_signals[:] = 0
+            pilot_signals[rows] = schedule_matrix
+
+    def _dict_schedule_matrix(self, new_schedule):
+        """ Convert a schedule dictionary into a schedule matrix.
+
+        Schedules usually only include stations with an EV plugged in, in which case only the rows of those stations
+        are built and checked, so the cost scales with the number of EVs rather than the number of EVSEs.
+
+        Args:
+            new_schedule (Dict[str, List[number]]): Dictionary mapping station ids to a schedule of pilot signals.
+
+        Returns:
+            Tuple[np.Array, np.Array, List[str]]: The schedule matrix, the index in network.station_ids of each of its
+                rows (None if it has a row for every station), and the station id of each of its rows. None if the
+                schedule is empty.
+        """
+        if len(new_schedule) == 0:
+            return None
 
         for station_id in new_schedule:
-            if station_id not in self.network.station_ids:
+            if station_id not in self.network._EVSEs:
                 raise KeyError('Station {0} in schedule but not found in network.'.format(station_id))
 
         schedule_lengths = set(len(x) for x in new_schedule.values())
@@ -156,72 +786,104 @@ class Simulator:
             raise InvalidScheduleError('All schedules should have the same length.')
         schedule_length = schedule_lengths.pop()
 
-        schedule_matrix = np.array([new_schedule[evse_id] if evse_id in new_schedule else [0] * schedule_length for evse_id in self.network.station_ids])
-        if not self.network.is_feasible(schedule_matrix):
-            aggregate_currents = self.network.constraint_current(schedule_matrix)
-            diff_vec = np.abs(aggregate_currents) - np.tile(self.network.magnitudes + self.network.violation_tolerance, (schedule_length, 1)).T
-            max_idx = np.unravel_index(np.argmax(diff_vec), diff_vec.shape)
-            max_diff = diff_vec[max_idx]
-            max_timeidx = max_idx[1]
-            max_constraint = self.network.constraint_index[max_idx[0]]
-            warnings.warn(
-                f"Invalid schedule provided at iteration {self._iteration}. "
-                f"Max violation is {max_diff} A on {max_constraint} "
-                f"at time index {max_timeidx}.",
-                UserWarning)
-        if self._iteration + schedule_length <= self.pilot_signals.shape[1]:
-            self.pilot_signals[:, self._iteration:(self._iteration + schedule_length)] = schedule_matrix
+        plugged_in_views = self.network._plugged_in_views()
+        if new_schedule.keys() <= set(plugged_in_views['ids']):
+            station_ids, rows = plugged_in_views['ids'], plugged_in_views['index']
         else:
-            # We've reached the end of pilot_signals, so double pilot_signal array width
-            self.pilot_signals = _increase_width(self.pilot_signals,
-                max(self.event_queue.get_last_timestamp() + 1, self._iteration + schedule_length))
-            self.pilot_signals[:, self._iteration:(self._iteration + schedule_length)] = schedule_matrix
+            station_ids, rows = self.network.station_ids, None
+        schedule_matrix = np.array([new_schedule[evse_id] if evse_id in new_schedule else [0] * schedule_length for evse_id in station_ids])
+        return schedule_matrix, rows, station_ids
+
+    def _array_schedule_matrix(self, new_schedule):
+        """ Validate a schedule given as a matrix or as a pair of station indices and a matrix.
+
+        Args:
+            new_schedule (np.Array or Tuple[np.Array, np.Array]): Matrix with a row per station in the order of
+                network.station_ids, or a pair of an array of station indices and a matrix with a row per index.
+
+        Returns:
+            Tuple[np.Array, np.Array, List[str]]: See _dict_schedule_matrix.
+        """
+        station_ids = self.network.station_ids
+        if isinstance(new_schedule, tuple):
+            rows, schedule_matrix = new_schedule
+            rows = np.asarray(rows, dtype=int)
+            schedule_matrix = np.asarray(schedule_matrix)
+            if schedule_matrix.ndim != 2 or schedule_matrix.shape[0] != len(rows):
+                raise InvalidScheduleError('Schedule matrix should have one row per station index.')
+            if len(rows) == 0 or schedule_matrix.shape[1] == 0:
+                return None
+            invalid = (rows < 0) | (rows >= len(station_ids))
+            if np.any(invalid):
+                raise KeyError('Station index {0} in schedule but not found in network.'.format(rows[invalid][0]))
+            plugged_in_views = self.network._plugged_in_views()
+            if np.array_equal(rows, plugged_in_views['index']):
+                return schedule_matrix, rows, plugged_in_views['ids']
+            # Repeated stations would be checked as separate loads but overwrite each other in pilot_signals.
+            if len(np.unique(rows)) != len(rows):
+                raise InvalidScheduleError('Station indices in schedule should be unique.')
+            return schedule_matrix, rows, [station_ids[i] for i in rows]
+
+        schedule_matrix = np.asarray(new_schedule)
+        if schedule_matrix.ndim != 2 or schedule_matrix.shape[0] != len(station_ids):
+            raise InvalidScheduleError('Schedule matrix should have one row per station in the network.')
+        if schedule_matrix.shape[1] == 0:
+            return None
+        return schedule_matrix, None, station_ids
 
     def _store_actual_charging_rates(self):
         """ Store actual charging rates from the network in the simulator for later analysis."""
         current_rates = self.network.current_charging_rates
         agg = np.sum(current_rates)
-        if self.iteration < self.charging_rates.shape[1]:
-            self.charging_rates[:, self.iteration] = current_rates.T
-        else:
-            self.charging_rates = _increase_width(self.charging_rates, self.event_queue.get_last_timestamp() + 1)
-            self.charging_rates[:, self._iteration] = current_rates.T
+        self._charging_rates.record(self._iteration, current_rates.T)
         self.peak = max(self.peak, agg)
 
-    def _print(self, s):
-        if self.verbose:
-            print(s)
-
-    def charging_rates_as_df(self):
+    def charging_rates_as_df(self, chunk_size=None):
         """ Return the charging rates as a pandas DataFrame, with EVSE id as columns
         and iteration as index.
+
+        Args:
+            chunk_size (int): If given, return an iterator over DataFrames of at most chunk_size iterations each
+                instead of a single DataFrame, so that results stored in results_dir can be processed without loading
+                them into memory. Default None.
         """
+        if chunk_size is not None:
+            return self._iter_df(self.iter_charging_rates(chunk_size))
         return pd.DataFrame(data=self.charging_rates.T, columns=self.network.station_ids)
 
-    def pilot_signals_as_df(self):
-        """ Return the pilot signals as a pandas DataFrame """
+    def pilot_signals_as_df(self, chunk_size=None):
+        """ Return the pilot signals as a pandas DataFrame
+
+        Args:
+            chunk_size (int): See charging_rates_as_df.
+        """
+        if chunk_size is not None:
+            return self._iter_df(self.iter_pilot_signals(chunk_size))
         return pd.DataFrame(data=self.pilot_signals.T, columns=self.network.station_ids)
 
+    def _iter_df(self, chunks):
+        """ Convert blocks of a recorded time series into DataFrames with EVSE id as columns and iteration as index.
+
+        Args:
+            chunks (Iterator[Tuple[int, np.Array]]): Blocks as returned by iter_charging_rates or iter_pilot_signals.
+
+        Yields:
+            pd.DataFrame: DataFrame of each block.
+        """
+        for start, block in chunks:
+            yield pd.DataFrame(data=block.T, columns=self.network.station_ids,
+                               index=pd.RangeIndex(start, start + block.shape[1]))
+
     def index_of_evse(self, station_id):
         """ Return the numerical index of the EVSE given by station_id in the (ordered) dictionary
         of EVSEs.
         """
-        if station_id not in self.network.station_ids:
+        try:
+            return self.network.station_index(station_id)
+        except KeyError:
             raise KeyError("EVSE {0} not found in network.".format(station_id))
-        return self.network.station_ids.index(station_id)
 
-def _increase_width(a, target_width):
-    """ Returns a new 2-D numpy array with target_width number of columns, with the contents
-    of a up to the first a.shape[1] columns and 0's thereafter.
 
-    Args:
-        a (numpy.Array): 2-D numpy array to be expanded.
-        target_width (int): desired number of columns; must be greater than number of columns in a
-    Returns:
-        numpy.Array
-    """
-    if target_width <= a.shape[1]:
-        return a
-    new_matrix = np.zeros((a.shape[0], target_width))
-    new_matrix[:, :a.shape[1]] = a
-    return new_matrix
+def _print_event(simulator, event):
+    """ Hook which prints an event as it is processed, registered by Simulator when verbose is True. """
+    print('{0} Event...'.format(event.type))
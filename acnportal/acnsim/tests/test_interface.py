@@ -2,7 +2,7 @@ from unittest import TestCase
 from unittest.mock import Mock, create_autospec, patch
 
 from acnportal.acnsim import Simulator, Interface, InvalidScheduleError
-from acnportal.acnsim.network import ChargingNetwork
+from acnportal.acnsim.network import ChargingNetwork, Current
 from acnportal.acnsim.models import EV, EVSE
 
 import numpy as np
@@ -27,6 +27,15 @@ class TestInterface(TestCase):
         _ = self.interface.active_evs()
         self.simulator.get_active_evs.assert_called_once()
 
+    def test_active_ev_array(self):
+        _ = self.interface.active_ev_array
+        self.simulator.get_active_ev_array.assert_called_once()
+
+    def test_active_ev_positions(self):
+        evs = [Mock()]
+        _ = self.interface.active_ev_positions(evs)
+        self.simulator.get_active_ev_positions.assert_called_once_with(evs)
+
     def test_last_applied_pilot_signals_low_iteration(self):
         self.simulator.iteration = 1
         self.assertEqual(self.interface.last_applied_pilot_signals, {})
@@ -37,6 +46,11 @@ class TestInterface(TestCase):
             (True, [0, float('inf')])
         )
 
+    def test_station_index(self):
+        self.assertEqual(self.interface.station_index('PS-002'), 2)
+        with self.assertRaises(KeyError):
+            self.interface.station_index('PS-004')
+
     def test_evse_voltage(self):
         self.assertEqual(self.interface.evse_voltage('PS-002'), 240)
 
@@ -71,3 +85,26 @@ class TestInterface(TestCase):
         self.assertEqual(network_is_feasible_args[0][1], True)
         self.assertEqual(network_is_feasible_args[0][2], 1e-3)
         self.assertEqual(network_is_feasible_args[0][3], 1e-5)
+
+    def test_feasibility_report(self):
+        self.network.add_constraint(Current(['PS-001', 'PS-002']), 5, name='pair')
+        report = self.interface.feasibility_report({'PS-001': [1, 2], 'PS-002': [4, 5]})
+        self.assertEqual(report.slack.shape, (1, 2))
+        self.assertEqual(report.feasible, self.interface.is_feasible({'PS-001': [1, 2], 'PS-002': [4, 5]}))
+        self.assertEqual(report.max_violation_constraint, 'pair')
+        self.assertEqual(report.max_violation_time, 1)
+
+    def test_feasibility_report_unequal_schedules(self):
+        with self.assertRaises(InvalidScheduleError):
+            self.interface.feasibility_report({'PS-001': [1, 2], 'PS-002': [3, 4, 5]})
+
+    def test_feasibility_oracle(self):
+        oracle = self.interface.feasibility_oracle({'PS-001': [1, 2], 'PS-002': [4, 5]})
+        self.assertEqual(oracle.rate('PS-001', 1), 2)
+        self.assertEqual(oracle.rate('PS-003', 0), 0)
+        self.assertEqual(oracle.rate('PS-002', 0), 4)
+        self.assertTrue(oracle.is_feasible())
+
+    def test_feasibility_oracle_unequal_schedules(self):
+        with self.assertRaises(InvalidScheduleError):
+            self.interface.feasibility_oracle({'PS-001': [1, 2], 'PS-002': [3, 4, 5]})
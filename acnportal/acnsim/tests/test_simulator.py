@@ -1,15 +1,20 @@
+import os
+import tempfile
 from unittest import TestCase
-from unittest.mock import Mock, create_autospec
+from unittest.mock import Mock, create_autospec, patch
 
 import numpy as np
 import pandas as pd
 
-from acnportal.acnsim import Simulator
+from acnportal.acnsim import Simulator, InvalidScheduleError, aggregate_current, proportion_of_energy_delivered, \
+    proportion_of_demands_met
 from acnportal.acnsim.network import ChargingNetwork, Current
-from acnportal.algorithms import BaseAlgorithm
-from acnportal.acnsim.events import EventQueue, Event
+from acnportal.algorithms import BaseAlgorithm, UncontrolledCharging
+from acnportal.acnsim.events import EventQueue, CalendarEventQueue, Event, PluginEvent
 from datetime import datetime
-from acnportal.acnsim.models import EVSE
+from acnportal.acnsim.models import EVSE, EV, EVView, Battery
+from acnportal.acnsim.recorders import SessionTimeSeries, ScheduleHistory, EventLog, SessionLog, \
+    MemmapTimeSeriesBuffer, SimulationProfiler
 
 
 class TestSimulator(TestCase):
@@ -35,6 +40,70 @@ class TestSimulator(TestCase):
         np.testing.assert_allclose(self.simulator.charging_rates,
             np.zeros((len(self.simulator.network.station_ids), self.simulator.event_queue.get_last_timestamp() + 1)))
 
+    def test_event_queue_type(self):
+        scheduler = create_autospec(BaseAlgorithm)
+        scheduler.max_recompute = None
+        simulator = Simulator(self.simulator.network, scheduler, EventQueue([Event(1), Event(4)]), Mock(datetime),
+                              event_queue_type=CalendarEventQueue)
+        self.assertIsInstance(simulator.event_queue, CalendarEventQueue)
+        self.assertEqual(len(simulator.event_queue), 2)
+        self.assertEqual(simulator.event_queue.get_last_timestamp(), 4)
+
+    def test_get_active_evs_views(self):
+        ev = EV(0, 10, 25.0, 'PS-001', '0001', Battery(100, 0, 7.68))
+        self.simulator.network.plugin(ev, 'PS-001')
+        self.simulator.scheduler.deepcopy_evs = False
+        active_evs = self.simulator.get_active_evs()
+        self.assertEqual(len(active_evs), 1)
+        self.assertIsInstance(active_evs[0], EVView)
+        self.assertEqual(active_evs[0].session_id, '0001')
+
+    def test_get_active_evs_deepcopy(self):
+        ev = EV(0, 10, 25.0, 'PS-001', '0001', Battery(100, 0, 7.68))
+        self.simulator.network.plugin(ev, 'PS-001')
+        self.simulator.scheduler.deepcopy_evs = True
+        active_evs = self.simulator.get_active_evs()
+        self.assertIsInstance(active_evs[0], EV)
+        self.assertIsNot(active_evs[0], ev)
+        self.assertIsInstance(self.simulator.get_active_evs(deepcopy=False)[0], EVView)
+
+    def test_get_active_ev_array(self):
+        ev = EV(0, 10, 25.0, 'PS-002', '0001', Battery(100, 0, 7.68), estimated_departure=8)
+        self.simulator.network.plugin(ev, 'PS-002')
+        state = self.simulator.get_active_ev_array()
+        self.assertEqual(len(state), 1)
+        self.assertEqual(state['station_id'][0], 'PS-002')
+        self.assertEqual(state['session_id'][0], '0001')
+        self.assertEqual(state['station_index'][0], 1)
+        self.assertEqual(state['arrival'][0], 0)
+        self.assertEqual(state['departure'][0], 10)
+        self.assertEqual(state['estimated_departure'][0], 8)
+        self.assertAlmostEqual(state['remaining_demand'][0], 25.0 * 1000 / 240 * 60)
+        self.assertEqual(state['max_pilot'][0], 32)
+        self.assertEqual(state['min_pilot'][0], 0)
+        self.assertEqual(state['voltage'][0], 240)
+        self.assertFalse(state.flags.writeable)
+
+    def test_get_active_ev_array_cached_until_event(self):
+        self.simulator.network.plugin(EV(0, 10, 25.0, 'PS-001', '0001', Battery(100, 0, 7.68)), 'PS-001')
+        state = self.simulator.get_active_ev_array()
+        self.assertIs(self.simulator.get_active_ev_array(), state)
+        self.simulator._process_event(PluginEvent(1, EV(1, 10, 5.0, 'PS-003', '0002', Battery(100, 0, 7.68))))
+        state = self.simulator.get_active_ev_array()
+        self.assertEqual(list(state['session_id']), ['0001', '0002'])
+        self.assertEqual(list(state['station_index']), [0, 2])
+
+    def test_get_active_ev_positions(self):
+        self.simulator.network.plugin(EV(0, 10, 25.0, 'PS-001', '0001', Battery(100, 0, 7.68)), 'PS-001')
+        self.simulator.network.plugin(EV(0, 10, 5.0, 'PS-003', '0002', Battery(100, 0, 7.68)), 'PS-003')
+        views = self.simulator.get_active_evs()
+        np.testing.assert_array_equal(self.simulator.get_active_ev_positions(views), [0, 1])
+        np.testing.assert_array_equal(self.simulator.get_active_ev_positions(views[::-1]), [1, 0])
+        np.testing.assert_array_equal(self.simulator.get_active_ev_positions(views[1:]), [1])
+        copies = self.simulator.get_active_evs(deepcopy=True)
+        self.assertIsNone(self.simulator.get_active_ev_positions(copies))
+        self.assertIsNone(self.simulator.get_active_ev_positions(views[:1] + copies[1:]))
+
     def test_update_schedules_not_in_network(self):
         new_schedule = {'PS-001' : [24, 16], 'PS-004' : [16, 24]}
         with self.assertRaises(KeyError):
@@ -45,6 +114,38 @@ class TestSimulator(TestCase):
         self.simulator._update_schedules(new_schedule)
         np.testing.assert_allclose(self.simulator.pilot_signals[:, :2], np.array([[24, 16], [16, 24], [0, 0]]))
 
+    def test_update_schedules_matrix(self):
+        self.simulator.pilot_signals[:, :2] = 8
+        self.simulator._update_schedules(np.array([[24, 16], [16, 24], [0, 8]]))
+        np.testing.assert_allclose(self.simulator.pilot_signals[:, :2], np.array([[24, 16], [16, 24], [0, 8]]))
+
+    def test_update_schedules_matrix_wrong_shape(self):
+        with self.assertRaises(InvalidScheduleError):
+            self.simulator._update_schedules(np.array([[24, 16], [16, 24]]))
+
+    def test_update_schedules_index_pair(self):
+        self.simulator.pilot_signals[:, :2] = 8
+        self.simulator._update_schedules((np.array([2, 0]), np.array([[24, 16], [16, 24]])))
+        np.testing.assert_allclose(self.simulator.pilot_signals[:, :2], np.array([[16, 24], [0, 0], [24, 16]]))
+
+    def test_update_schedules_index_pair_plugged_in(self):
+        self.simulator.network.plugin(EV(0, 10, 25.0, 'PS-002', '0001', Battery(100, 0, 7.68)), 'PS-002')
+        self.simulator._update_schedules((np.array([1]), np.array([[32, 16, 8]])))
+        np.testing.assert_allclose(self.simulator.pilot_signals[:, :3], np.array([[0, 0, 0], [32, 16, 8], [0, 0, 0]]))
+
+    def test_update_schedules_index_pair_not_in_network(self):
+        with self.assertRaises(KeyError):
+            self.simulator._update_schedules((np.array([0, 3]), np.array([[24, 16], [16, 24]])))
+
+    def test_update_schedules_index_pair_wrong_shape(self):
+        with self.assertRaises(InvalidScheduleError):
+            self.simulator._update_schedules((np.array([0, 1]), np.array([24, 16])))
+
+    def test_update_schedules_index_pair_duplicate_index(self):
+        with self.assertRaises(InvalidScheduleError):
+            self.simulator._update_schedules((np.array([0, 0]), np.array([[24, 16], [16, 24]])))
+        np.testing.assert_array_equal(self.simulator.pilot_signals[:, :2], 0)
+
     def test_index_of_evse_error(self):
         with self.assertRaises(KeyError):
             _ = self.simulator.index_of_evse('PS-004')
@@ -97,3 +198,317 @@ class TestSimulatorWarnings(TestCase):
                 r'Invalid schedule provided at iteration 0. '
                 r'Max violation is 2.9999\d+? A on _const_1 at time index 2.'):
             simulator._update_schedules(bad_schedule)
+
+
+# Arrival, departure, requested energy, station id and session id of the EVs of two_station_simulator. With SPARSE_EVS
+# no EV is plugged in for long stretches, which fast_forward skips.
+OVERLAPPING_EVS = [(2, 10, 3, 'PS-001', 'A'), (5, 30, 10, 'PS-002', 'B')]
+SPARSE_EVS = [(2, 10, 3, 'PS-001', 'A'), (50, 60, 3, 'PS-002', 'B'), (100, 110, 30, 'PS-001', 'C')]
+
+
+def two_station_simulator(evs=OVERLAPPING_EVS, max_recompute=1, **kwargs):
+    """ Return a simulator of two 32 A stations which charges evs uncontrolled. kwargs are passed to Simulator. """
+    network = ChargingNetwork()
+    network.register_evse(EVSE('PS-001', max_rate=32), 240, 0)
+    network.register_evse(EVSE('PS-002', max_rate=32), 240, 0)
+    evs = [EV(arrival, departure, energy, station_id, session_id, Battery(10, 0, 7))
+           for arrival, departure, energy, station_id, session_id in evs]
+    scheduler = UncontrolledCharging()
+    scheduler.max_recompute = max_recompute
+    return Simulator(network, scheduler, EventQueue([PluginEvent(ev.arrival, ev) for ev in evs]), Mock(datetime),
+                     period=5, verbose=False, **kwargs)
+
+
+class TestSimulatorFastForward(TestCase):
+    def _run(self, fast_forward, ends=None):
+        simulator = two_station_simulator(SPARSE_EVS, max_recompute=3, fast_forward=fast_forward, profile=True)
+        simulator.scheduler.run = Mock(wraps=simulator.scheduler.run)
+        if ends is not None:
+            simulator.add_hook('iteration_end', lambda sim, iteration: ends.append(iteration))
+        simulator.run()
+        return simulator
+
+    def test_fast_forward_matches_normal_run(self):
+        normal = self._run(False)
+        fast = self._run(True)
+        np.testing.assert_array_equal(fast.pilot_signals, normal.pilot_signals)
+        np.testing.assert_array_equal(fast.charging_rates, normal.charging_rates)
+        self.assertEqual(fast.iteration, normal.iteration)
+        self.assertEqual(fast.peak, normal.peak)
+        self.assertEqual(fast._last_schedule_update, normal._last_schedule_update)
+        self.assertLess(fast.scheduler.run.call_count, normal.scheduler.run.call_count)
+
+    def test_skipped_periods_not_reported(self):
+        normal_ends, fast_ends = [], []
+        normal = self._run(False, normal_ends)
+        fast = self._run(True, fast_ends)
+        self.assertEqual(normal_ends, list(range(normal.iteration)))
+        # Iterations while an EV is plugged in, plus those at which the events are processed.
+        self.assertEqual(fast_ends, list(range(2, 11)) + list(range(50, 61)) + list(range(100, fast.iteration)))
+        self.assertEqual(fast.profiler.calls['update_pilots'], len(fast_ends))
+        self.assertEqual(normal.profiler.calls['update_pilots'], normal.iteration)
+
+
+class TestSimulatorStorage(TestCase):
+    def _run(self, **kwargs):
+        simulator = two_station_simulator(results_chunk_size=4, **kwargs)
+        simulator.run()
+        return simulator
+
+    def test_results_dir_matches_in_memory(self):
+        with tempfile.TemporaryDirectory() as results_dir:
+            on_disk = self._run(results_dir=results_dir)
+            in_memory = self._run()
+            self.assertTrue(os.path.exists(os.path.join(results_dir, 'pilot_signals.dat')))
+            self.assertTrue(os.path.exists(os.path.join(results_dir, 'charging_rates.dat')))
+            np.testing.assert_array_equal(on_disk.pilot_signals, in_memory.pilot_signals)
+            np.testing.assert_array_equal(on_disk.charging_rates, in_memory.charging_rates)
+            np.testing.assert_allclose(aggregate_current(on_disk), aggregate_current(in_memory))
+            del on_disk
+
+    def test_as_df_chunked(self):
+        simulator = self._run()
+        chunks = list(simulator.charging_rates_as_df(chunk_size=4))
+        self.assertEqual(len(chunks[0]), 4)
+        pd.testing.assert_frame_equal(pd.concat(chunks), simulator.charging_rates_as_df())
+        pd.testing.assert_frame_equal(pd.concat(simulator.pilot_signals_as_df(chunk_size=4)),
+                                      simulator.pilot_signals_as_df())
+
+    def test_session_charging_rates_match_dense(self):
+        sessions = self._run(session_charging_rates=True)
+        dense = self._run()
+        self.assertIsInstance(sessions._charging_rates, SessionTimeSeries)
+        np.testing.assert_array_equal(sessions.charging_rates, dense.charging_rates)
+        np.testing.assert_array_equal(aggregate_current(sessions), aggregate_current(dense))
+        self.assertEqual(sessions._charging_rates.session_ids, ['A', 'B'])
+        row, start, rates = sessions._charging_rates.session('B')
+        self.assertEqual((row, start), (1, 5))
+        np.testing.assert_array_equal(rates, dense.charging_rates[1, 5:30])
+
+    def test_dtype(self):
+        single = self._run(dtype=np.float32)
+        double = self._run()
+        self.assertEqual(single.pilot_signals.dtype, np.float32)
+        self.assertEqual(single.charging_rates.dtype, np.float32)
+        self.assertEqual(aggregate_current(single).dtype, np.float32)
+        np.testing.assert_allclose(single.charging_rates, double.charging_rates, rtol=1e-6)
+
+    def test_compressed_schedule_history(self):
+        compressed = self._run(store_schedule_history=ScheduleHistory())
+        full = self._run(store_schedule_history=True)
+        self.assertIsInstance(compressed.schedule_history, ScheduleHistory)
+        self.assertEqual(compressed.schedule_history.keys(), list(full.schedule_history.keys()))
+        for iteration, schedule in full.schedule_history.items():
+            reconstructed = compressed.schedule_history[iteration]
+            self.assertEqual(set(reconstructed), set(schedule))
+            for station_id in schedule:
+                np.testing.assert_array_equal(reconstructed[station_id], schedule[station_id])
+
+    def test_history_logs(self):
+        logged = self._run(event_history=EventLog(), ev_history=SessionLog())
+        full = self._run()
+        events = logged.event_history.as_df()
+        self.assertEqual(list(events['type']), [e.type for e in full.event_history])
+        self.assertEqual(list(events['timestamp']), [e.timestamp for e in full.event_history])
+        self.assertEqual(logged.ev_history.open_evs, [])
+        self.assertEqual(list(logged.ev_history.column('session_id')), ['A', 'B'])
+        self.assertAlmostEqual(proportion_of_energy_delivered(logged), proportion_of_energy_delivered(full))
+        self.assertEqual(proportion_of_demands_met(logged), proportion_of_demands_met(full))
+
+    def test_profile(self):
+        simulator = self._run(profile=True)
+        profiler = simulator.profiler
+        self.assertIsInstance(profiler, SimulationProfiler)
+        self.assertIsNone(self._run().profiler)
+        self.assertEqual(profiler.calls['update_pilots'], simulator.iteration)
+        self.assertEqual(profiler.calls['bookkeeping'], simulator.iteration)
+        self.assertEqual(profiler.calls['scheduler'], profiler.calls['update_schedules'])
+        self.assertEqual(profiler.latency_histogram()[0].sum(), profiler.calls['scheduler'])
+        self.assertEqual(profiler.event_calls, {'Plugin': 2, 'Unplug': 2})
+        np.testing.assert_array_equal(simulator.pilot_signals, self._run().pilot_signals)
+
+
+class TestSimulatorHooks(TestCase):
+    def setUp(self):
+        self.simulator = two_station_simulator(max_recompute=None)
+
+    def test_hooks_called_in_order(self):
+        calls = []
+        for name in ('plugin', 'unplug', 'schedule_applied'):
+            self.simulator.add_hook(name, lambda sim, payload, name=name: calls.append((name, sim.iteration)))
+        self.simulator.run()
+        self.assertEqual(calls, [('plugin', 2), ('schedule_applied', 2), ('plugin', 5), ('schedule_applied', 5),
+                                 ('unplug', 10), ('schedule_applied', 10), ('unplug', 30), ('schedule_applied', 30)])
+
+    def test_hook_payloads(self):
+        plugins, ends = [], []
+        self.simulator.add_hook('plugin', lambda sim, event: plugins.append(event.ev.session_id))
+        self.simulator.add_hook('iteration_end', lambda sim, iteration: ends.append(iteration))
+        schedule_hook = self.simulator.add_hook('schedule_applied', Mock())
+        self.simulator.run()
+        self.assertEqual(plugins, ['A', 'B'])
+        self.assertEqual(ends, list(range(self.simulator.iteration)))
+        sim, schedule = schedule_hook.call_args[0]
+        self.assertIs(sim, self.simulator)
+        self.assertEqual(set(schedule), set())
+
+    def test_remove_hook(self):
+        callback = self.simulator.add_hook('iteration_end', Mock())
+        self.simulator.remove_hook('iteration_end', callback)
+        self.simulator.run()
+        callback.assert_not_called()
+        with self.assertRaises(ValueError):
+            self.simulator.remove_hook('iteration_end', callback)
+
+    def test_unknown_hook(self):
+        with self.assertRaises(ValueError):
+            self.simulator.add_hook('unknown', Mock())
+
+    def test_verbose(self):
+        self.assertFalse(self.simulator.verbose)
+        self.assertEqual(self.simulator._hooks['plugin'], [])
+        self.simulator.verbose = True
+        self.assertTrue(self.simulator.verbose)
+        with patch('builtins.print') as mock_print:
+            self.simulator.run()
+        self.assertEqual([c[0][0] for c in mock_print.call_args_list],
+                         ['Plugin Event...', 'Plugin Event...', 'Unplug Event...', 'Unplug Event...'])
+        self.simulator.verbose = False
+        self.assertEqual(self.simulator._hooks['unplug'], [])
+
+
+class TestSimulatorSnapshot(TestCase):
+    def setUp(self):
+        self.simulator = two_station_simulator(store_schedule_history=True)
+
+    def test_snapshot_matches_original(self):
+        snapshot = self.simulator.snapshot()
+        self.simulator.run()
+        self.assertEqual(snapshot.iteration, 0)
+        self.assertEqual(snapshot.ev_history, {})
+        snapshot.run()
+        np.testing.assert_array_equal(snapshot.pilot_signals, self.simulator.pilot_signals)
+        np.testing.assert_array_equal(snapshot.charging_rates, self.simulator.charging_rates)
+        self.assertEqual(list(snapshot.schedule_history), list(self.simulator.schedule_history))
+        self.assertIs(snapshot.scheduler.interface._simulator, snapshot)
+        self.assertIs(self.simulator.scheduler.interface._simulator, self.simulator)
+        self.assertIsNot(snapshot.ev_history['A'], self.simulator.ev_history['A'])
+        self.assertIs(snapshot.ev_history['A'], snapshot.event_history[0].ev)
+
+    def test_fork_with_scheduler(self):
+        scheduler = create_autospec(BaseAlgorithm)
+        scheduler.max_recompute = None
+        scheduler.run.return_value = {'PS-001': [8], 'PS-002': [8]}
+        fork = self.simulator.fork(scheduler)
+        self.assertIs(fork.scheduler, scheduler)
+        scheduler.register_interface.assert_called_once()
+        self.assertIs(scheduler.register_interface.call_args[0][0]._simulator, fork)
+        fork.run()
+        self.simulator.run()
+        self.assertEqual(fork.pilot_signals[0, 2], 8)
+        self.assertEqual(self.simulator.pilot_signals[0, 2], 32)
+        self.assertLess(fork.ev_history['A'].energy_delivered, self.simulator.ev_history['A'].energy_delivered)
+
+    def test_snapshot_shares_recorded_results(self):
+        self.simulator.run_until(12)
+        snapshot = self.simulator.snapshot()
+        self.assertTrue(np.shares_memory(snapshot._pilot_signals.window(0, 12), self.simulator.pilot_signals))
+        self.assertTrue(np.shares_memory(snapshot._charging_rates.window(0, 12), self.simulator.charging_rates))
+        self.assertIs(snapshot.ev_history['A'], self.simulator.ev_history['A'])
+        self.assertIsNot(snapshot.ev_history['B'], self.simulator.ev_history['B'])
+        self.assertIs(snapshot.event_history[0], self.simulator.event_history[0])
+        self.assertIs(snapshot.event_history[1].ev, snapshot.ev_history['B'])
+        snapshot.run()
+        self.simulator.run()
+        np.testing.assert_array_equal(snapshot.pilot_signals, self.simulator.pilot_signals)
+        np.testing.assert_array_equal(snapshot.charging_rates, self.simulator.charging_rates)
+        self.assertEqual(snapshot.ev_history['B'].energy_delivered, self.simulator.ev_history['B'].energy_delivered)
+
+    def test_snapshot_forks_logs(self):
+        self.simulator.event_history = EventLog()
+        self.simulator.ev_history = SessionLog()
+        self.simulator.run_until(12)
+        snapshot = self.simulator.snapshot()
+        self.assertIsNot(snapshot.ev_history['B'], self.simulator.ev_history['B'])
+        snapshot.run()
+        self.simulator.run()
+        self.assertEqual(snapshot.event_history.as_df().to_dict(), self.simulator.event_history.as_df().to_dict())
+        self.assertEqual(snapshot.ev_history.as_df().to_dict(), self.simulator.ev_history.as_df().to_dict())
+
+    def test_snapshot_results_dir(self):
+        with tempfile.TemporaryDirectory() as results_dir:
+            snapshot = self.simulator.snapshot(results_dir=results_dir)
+            self.assertIsInstance(snapshot._pilot_signals, MemmapTimeSeriesBuffer)
+            with self.assertRaises(ValueError):
+                snapshot.snapshot(results_dir=results_dir)
+            del snapshot
+
+    def test_snapshot_disk_log(self):
+        with tempfile.TemporaryDirectory() as path:
+            self.simulator.event_history = EventLog(path=path)
+            with self.assertRaises(ValueError):
+                self.simulator.snapshot()
+
+
+class TestSimulatorStepping(TestCase):
+    def _simulator(self, **kwargs):
+        return two_station_simulator(SPARSE_EVS, max_recompute=3, **kwargs)
+
+    def assertSimulatorsEqual(self, actual, expected):
+        np.testing.assert_array_equal(actual.pilot_signals, expected.pilot_signals)
+        np.testing.assert_array_equal(actual.charging_rates, expected.charging_rates)
+        self.assertEqual(actual.iteration, expected.iteration)
+        self.assertEqual(actual._last_schedule_update, expected._last_schedule_update)
+
+    def test_run_until(self):
+        for fast_forward in (False, True):
+            with self.subTest(fast_forward=fast_forward):
+                expected = self._simulator(fast_forward=fast_forward)
+                expected.run()
+                simulator = self._simulator(fast_forward=fast_forward)
+                for iteration in (1, 5, 30, 75, 101):
+                    simulator.run_until(iteration)
+                    self.assertEqual(simulator.iteration, iteration)
+                simulator.run()
+                self.assertSimulatorsEqual(simulator, expected)
+                simulator.run_until(1000)
+                self.assertEqual(simulator.iteration, expected.iteration)
+
+    def test_run_for(self):
+        expected = self._simulator()
+        expected.run()
+        simulator = self._simulator()
+        simulator.run_for(40)
+        self.assertEqual(simulator.iteration, 40)
+        simulator.run_for(1000)
+        self.assertSimulatorsEqual(simulator, expected)
+
+    def test_step(self):
+        expected = self._simulator(fast_forward=True)
+        expected.run()
+        simulator = self._simulator(fast_forward=True)
+        steps = 0
+        while simulator.step():
+            steps += 1
+        self.assertEqual(steps, expected.iteration)
+        self.assertFalse(simulator.step())
+        self.assertSimulatorsEqual(simulator, expected)
+
+    def test_inject_event(self):
+        simulator = self._simulator()
+        simulator.run_until(20)
+        simulator.event_queue.add_event(PluginEvent(25, EV(25, 35, 3, 'PS-002', 'D', Battery(10, 0, 7))))
+        simulator.run()
+        self.assertIn('D', simulator.ev_history)
+        self.assertGreater(simulator.charging_rates[1, 25], 0)
+
+    def test_snapshot_mid_run(self):
+        expected = self._simulator()
+        expected.run()
+        simulator = self._simulator()
+        simulator.run_until(55)
+        snapshot = simulator.snapshot()
+        simulator.run()
+        snapshot.run()
+        self.assertSimulatorsEqual(snapshot, expected)
+        self.assertSimulatorsEqual(simulator, expected)
@@ -6,11 +6,14 @@ class BaseAlgorithm:
     Attributes:
         max_recompute (int): Maximum number of periods between calling the scheduling algorithm even if no events occur.
             If None, the scheduling algorithm is only called when an event occurs. Default: None.
+        deepcopy_evs (bool): If True, the algorithm receives deep copies of the active EVs which it may modify. If
+            False, it receives read-only views of the active EVs, which are much cheaper to create. Default: False.
     """
 
     def __init__(self):
         self._interface = None
         self.max_recompute = None
+        self.deepcopy_evs = False
 
     @property
     def interface(self):
@@ -50,7 +53,8 @@ class BaseAlgorithm:
 
         This method returns a schedule of charging rates for each
         Args:
-            active_evs (List[EV]): List of EV objects which are currently ready to be charged and not finished charging.
+            active_evs (List[EVView]): List of EVs which are currently ready to be charged and not finished charging.
+                These are read-only views unless deepcopy_evs is True.
 
         Returns:
             Dict[str, List[float]]: Dictionary mapping a station_id to a list of charging rates. Each charging rate is
@@ -60,6 +64,12 @@ class BaseAlgorithm:
                 length of each list should be 1. If this is the case, make sure to also set the maximum resolve period
                 to be 1 period so that the algorithm will be called each period. An alternative is to repeat the
                 charging rate a number of times equal to the max recompute period.
+
+                Instead of a dictionary, the schedule may also be returned as an np.Array with a row per station, in
+                the order of interface.get_constraints().evse_index, and a column per period, or as a pair of an
+                np.Array of unique station indices (see interface.station_index) and an np.Array with the schedule of
+                each of those stations as its rows. Stations which are not included are given a charging rate of 0.
+                These forms are copied into the simulator's pilot signals without converting them to a dictionary.
         """
         raise NotImplementedError
 
@@ -1,5 +1,4 @@
 from collections import deque
-from copy import copy
 
 import numpy as np
 from .base_algorithm import BaseAlgorithm
@@ -41,16 +40,20 @@ class SortedSchedulingAlgo(BaseAlgorithm):
         """
         ev_queue = self._sort_fn(active_evs, self.interface)
         schedule = {ev.station_id: [0] for ev in active_evs}
+        oracle = self.interface.feasibility_oracle(schedule)
         for ev in ev_queue:
             continuous, allowable_rates = self.interface.allowable_pilot_signals(ev.station_id)
             if continuous:
-                charging_rate = self.max_feasible_rate(ev.station_id, allowable_rates[-1], schedule, eps=0.01)
+                charging_rate = self.max_feasible_rate(ev.station_id, allowable_rates[-1], schedule, eps=0.01,
+                                                       oracle=oracle)
             else:
-                charging_rate = self.discrete_max_feasible_rate(ev.station_id, allowable_rates, schedule)
+                charging_rate = self.discrete_max_feasible_rate(ev.station_id, allowable_rates, schedule,
+                                                                oracle=oracle)
             schedule[ev.station_id][0] = charging_rate
+            oracle.set_rate(ev.station_id, charging_rate)
         return schedule
 
-    def max_feasible_rate(self, station_id, ub, schedule, time=0, eps=0.01):
+    def max_feasible_rate(self, station_id, ub, schedule, time=0, eps=0.01, oracle=None):
         """ Return the maximum feasible rate less than ub subject to the environment's constraints.
 
         If schedule contains non-zero elements at the given time, these are treated as fixed allocations and this
@@ -63,27 +66,42 @@ class SortedSchedulingAlgo(BaseAlgorithm):
                 charging rates.
             time (int): Time interval for which the max rate should be calculated.
             eps (float): Accuracy to which the max rate should be calculated. (When the binary search is terminated.)
+            oracle (FeasibilityOracle): Oracle holding the same fixed allocations as schedule. If None, a new oracle
+                is created from schedule. Default None.
 
         Returns:
             float: maximum feasible rate less than ub subject to the environment's constraints. [A]
         """
-        def bisection(_station_id, _lb, _ub, _schedule):
-            """ Use the bisection method to find the maximum feasible charging rate for the EV. """
-            mid = (_ub + _lb) / 2
-            new_schedule = copy(_schedule)
-            new_schedule[_station_id][time] = mid
-            if (_ub - _lb) <= eps:
-                return _lb
-            elif self.interface.is_feasible(new_schedule, time):
-                return bisection(_station_id, mid, _ub, new_schedule)
+        if oracle is None:
+            oracle = self.interface.feasibility_oracle(schedule)
+        if not oracle.is_feasible():
+            self._raise_infeasible(schedule)
+
+        # Use the bisection method to find the maximum feasible charging rate for the EV.
+        lb = 0
+        while (ub - lb) > eps:
+            mid = (ub + lb) / 2
+            if oracle.is_feasible_with(station_id, mid, time):
+                lb = mid
             else:
-                return bisection(_station_id, _lb, mid, new_schedule)
+                ub = mid
+        return lb
 
-        if not self.interface.is_feasible(schedule):
-            raise ValueError('The initial schedule is not feasible.')
-        return bisection(station_id, 0, ub, schedule)
+    def _raise_infeasible(self, schedule):
+        """ Raise a ValueError describing the largest constraint violation of an infeasible initial schedule.
 
-    def discrete_max_feasible_rate(self, station_id, allowable_rates, schedule, time=0):
+        Args:
+            schedule (Dict[str, List[float]]): Dictionary mapping a station_id to a list of already fixed
+                charging rates.
+
+        Raises:
+            ValueError: Always raised.
+        """
+        report = self.interface.feasibility_report(schedule)
+        raise ValueError('The initial schedule is not feasible. Max violation is {0} A on {1} at time index {2}.'
+                         .format(report.max_violation, report.max_violation_constraint, report.max_violation_time))
+
+    def discrete_max_feasible_rate(self, station_id, allowable_rates, schedule, time=0, oracle=None):
         """ Return the maximum feasible allowable rate subject to the environment's constraints.
 
         If schedule contains non-zero elements at the given time, these are treated as fixed allocations and this
@@ -95,23 +113,20 @@ class SortedSchedulingAlgo(BaseAlgorithm):
             schedule (Dict[str, List[float]]): Dictionary mapping a station_id to a list of already fixed
                 charging rates.
             time (int): Time interval for which the max rate should be calculated.
+            oracle (FeasibilityOracle): Oracle holding the same fixed allocations as schedule. If None, a new oracle
+                is created from schedule. Default None.
 
         Returns:
             float: maximum feasible rate less than ub subject to the environment's constraints. [A]
         """
-        if not self.interface.is_feasible(schedule):
-            raise ValueError('The initial schedule is not feasible.')
-        new_schedule = copy(schedule)
-        feasible_idx = len(allowable_rates) - 1
-        new_schedule[station_id][time] = allowable_rates[feasible_idx]
-        while not self.interface.is_feasible(new_schedule):
-            feasible_idx -= 1
-            if feasible_idx < 0:
-                new_schedule[station_id][time] = 0
-                break
-            else:
-                new_schedule[station_id][time] = allowable_rates[feasible_idx]
-        return new_schedule[station_id][time]
+        if oracle is None:
+            oracle = self.interface.feasibility_oracle(schedule)
+        if not oracle.is_feasible():
+            self._raise_infeasible(schedule)
+        for rate in reversed(allowable_rates):
+            if oracle.is_feasible_with(station_id, rate, time):
+                return rate
+        return 0
 
 
 class RoundRobin(SortedSchedulingAlgo):
@@ -149,6 +164,7 @@ class RoundRobin(SortedSchedulingAlgo):
 
         ev_queue = deque(self._sort_fn(active_evs, self.interface))
         schedule = {ev.station_id: [0] for ev in active_evs}
+        oracle = self.interface.feasibility_oracle(schedule)
         rate_idx_map = {ev.station_id: 0 for ev in active_evs}
         allowable_rates = {}
         for ev in ev_queue:
@@ -160,12 +176,12 @@ class RoundRobin(SortedSchedulingAlgo):
         while len(ev_queue) > 0:
             ev = ev_queue.popleft()
             if rate_idx_map[ev.station_id] < len(allowable_rates[ev.station_id]) - 1:
-                schedule[ev.station_id][0] = allowable_rates[ev.station_id][rate_idx_map[ev.station_id] + 1]
-                if self.interface.is_feasible(schedule):
+                new_rate = allowable_rates[ev.station_id][rate_idx_map[ev.station_id] + 1]
+                if oracle.is_feasible_with(ev.station_id, new_rate):
+                    schedule[ev.station_id][0] = new_rate
+                    oracle.set_rate(ev.station_id, new_rate)
                     rate_idx_map[ev.station_id] += 1
                     ev_queue.append(ev)
-                else:
-                    schedule[ev.station_id][0] = allowable_rates[ev.station_id][rate_idx_map[ev.station_id]]
         return schedule
 
 
@@ -234,7 +250,10 @@ def least_laxity_first(evs, iface):
               (iface.remaining_amp_periods(ev) / iface.max_pilot_signal(ev.station_id))
         return lax
 
-    return sorted(evs, key=lambda x: laxity(x))
+    def laxities(state):
+        return (state['departure'] - iface.current_time) - state['remaining_demand'] / state['max_pilot']
+
+    return _sort_by_keys(evs, _active_ev_keys(evs, iface, laxities, laxity))
 
 
 def largest_remaining_processing_time(evs, iface):
@@ -261,6 +280,45 @@ def largest_remaining_processing_time(evs, iface):
         rpt = (iface.remaining_amp_periods(ev) / iface.max_pilot_signal(ev.station_id))
         return rpt
 
-    return sorted(evs, key=lambda x: remaining_processing_time(x), reverse=True)
+    def remaining_processing_times(state):
+        return state['remaining_demand'] / state['max_pilot']
+
+    return _sort_by_keys(evs, _active_ev_keys(evs, iface, remaining_processing_times, remaining_processing_time),
+                         reverse=True)
+
+
+def _active_ev_keys(evs, iface, keys_fn, key_fn):
+    """ Compute the sort key of each EV, from active_ev_array if it describes all of them.
+
+    Args:
+        evs (List[EV]): List of EVs to be sorted.
+        iface (Interface): Interface object.
+        keys_fn (Callable[np.ndarray, np.Array]): Function which computes the sort key of each record of
+            Interface.active_ev_array at once.
+        key_fn (Callable[EV, float]): Function which computes the sort key of a single EV, used if active_ev_array
+            does not describe evs, e.g. because they are copies.
+
+    Returns:
+        List[float]: Sort key of each EV in evs.
+    """
+    positions = iface.active_ev_positions(evs)
+    if positions is None:
+        return [key_fn(ev) for ev in evs]
+    return list(keys_fn(iface.active_ev_array)[positions])
+
+
+def _sort_by_keys(evs, keys, reverse=False):
+    """ Sort EVs by the given keys. Like sorted, the sort is stable.
+
+    Args:
+        evs (List[EV]): List of EVs to be sorted.
+        keys (List[float]): Sort key of each EV in evs.
+        reverse (bool): If True, sort in decreasing order. Default False.
+
+    Returns:
+        List[EV]: List of EVs sorted by key.
+    """
+    order = sorted(range(len(evs)), key=keys.__getitem__, reverse=reverse)
+    return [evs[i] for i in order]
 
 
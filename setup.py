@@ -25,5 +25,8 @@ setuptools.setup(
         'matplotlib',
         'requests',
         'pytz'
-    ]
+    ],
+    extras_require={
+        'sparse': ['scipy']
+    }
 )